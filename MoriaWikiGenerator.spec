@@ -22,6 +22,9 @@ a = Analysis(
     ],
     # Include generator modules as hidden imports so they get compiled in
     hiddenimports=[
+        'build_graph',
+        'cancellation',
+        'datajson_cache',
         'generate_armor_wiki',
         'generate_brews_wiki',
         'generate_constructions_wiki',
@@ -34,6 +37,10 @@ a = Analysis(
         'generate_tools_wiki',
         'generate_tradegoods_wiki',
         'generate_weapons_wiki',
+        'generator_metrics',
+        'input_ledger',
+        'model_export',
+        'wiki_paths',
     ],
     hookspath=[],
     hooksconfig={},
@@ -58,7 +65,8 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    # UPX-packed binaries must be unpacked on every launch, slowing cold start
+    upx=False,
     upx_exclude=[],
     runtime_tmpdir=None,
     console=False,  # No console window - GUI only
@@ -0,0 +1,261 @@
+"""Make-style build graph from the game's data tables to the wiki pages.
+
+Each generator is a build target. Its prerequisites are the data tables it
+reads (GENERATOR_INPUTS), every string table, its unlock override files and
+its code: its own source and the helper modules it imports. Cross-reference
+depends on the page folders of the generators it reads instead. After a
+build, BuildState stores a signature of every prerequisite and of each
+generator's page folder in <output>\\build_state.json, and plan_build()
+lists what is out of date:
+
+    state = BuildState()
+    plan = plan_build(gen_types, state)  # {gen_type: [reasons]}
+    ...run the generators in plan...
+    state.record(generators that succeeded or were already up to date)
+    state.save()
+
+A generator is out of date when it has never been built, its source
+changed, a prerequisite changed, appeared or disappeared, or its pages were
+changed or removed outside a build. Cross-reference is out of date when a
+generator it reads is rebuilt or had its pages changed. A file whose
+modification time or size changed is hashed and compared with the hash from
+the last build, so a re-import that writes identical tables runs nothing.
+
+Within a generator that runs, its InputLedger rewrites only the pages whose
+inputs changed. page_inputs() combines both records to show what a single
+page was built from and which table keys (override entries, strings, other
+entities) its template read.
+"""
+
+import hashlib
+import json
+import os
+
+import generator_runner
+import input_ledger
+import wiki_paths
+
+
+BUILD_STATE_FILE_NAME = "build_state.json"
+BUILD_STATE_VERSION = 1
+
+
+def get_build_state_path():
+    """Return the build state file under the current output folder."""
+    return os.path.join(wiki_paths.get_output_dir(), BUILD_STATE_FILE_NAME)
+
+
+def get_page_dir(gen_type):
+    """Return the folder a generator writes its wiki pages to."""
+    return os.path.join(wiki_paths.get_output_dir(), "wiki", gen_type)
+
+
+def get_prerequisites(gen_type):
+    """Return the input files a generator reads, excluding its own source.
+
+    Cross-reference reads the other generators' pages, which are tracked as
+    folders by BuildState rather than listed here.
+    """
+    if gen_type == "crossreference":
+        return []
+    data_dir = wiki_paths.get_data_dir()
+    files = [os.path.join(data_dir, *key.split("/")) for key in generator_runner.GENERATOR_INPUTS.get(gen_type, ())]
+
+    strings_dir = os.path.join(data_dir, "StringTables")
+    try:
+        names = sorted(name for name in os.listdir(strings_dir) if name.endswith(".json"))
+    except OSError:
+        names = []
+    files.extend(os.path.join(strings_dir, name) for name in names)
+
+    files.extend(generator_runner.get_override_files(gen_type))
+    return files
+
+
+def _file_hash(path):
+    """Return the SHA-1 hex digest of a file's contents."""
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def folder_signature(folder):
+    """Return a digest of the names, times and sizes of the .wiki files in a folder, or None."""
+    try:
+        entries = sorted(
+            (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+            for entry in os.scandir(folder) if entry.name.endswith(".wiki")
+        )
+    except OSError:
+        return None
+    return input_ledger.digest(entries)
+
+
+class BuildState:
+    """Signatures of every generator's prerequisites and pages from its last build."""
+
+    def __init__(self, state_path=None):
+        self.state_path = state_path or get_build_state_path()
+        self.targets = {}  # {gen_type: {"code", "files", "pages", "reads"}}
+        self._signatures = {}  # {path: [mtime_ns, size, sha1]} computed in this process
+        self.load()
+
+    def load(self):
+        """Load the last build's signatures; a missing or old file means nothing was built."""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == BUILD_STATE_VERSION:
+            self.targets = data.get("targets", {})
+
+    def save(self):
+        """Write the signatures atomically."""
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        data = {"version": BUILD_STATE_VERSION, "targets": self.targets}
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.state_path)
+
+    def _recorded_signature(self, path):
+        """Return a signature of path from any generator's record, or None."""
+        for target in self.targets.values():
+            signature = target.get("files", {}).get(path)
+            if signature:
+                return signature
+        return None
+
+    def signature(self, path):
+        """Return [mtime_ns, size, sha1] of a file, or None if it does not exist.
+
+        The file is only hashed when its time or size differs from the last
+        build, as a data table shared by several generators is hashed once.
+        """
+        if path in self._signatures:
+            return self._signatures[path]
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        recorded = self._recorded_signature(path)
+        if recorded and recorded[:2] == [stat.st_mtime_ns, stat.st_size]:
+            signature = recorded
+        else:
+            try:
+                signature = [stat.st_mtime_ns, stat.st_size, _file_hash(path)]
+            except OSError:
+                return None
+        self._signatures[path] = signature
+        return signature
+
+    def changes(self, gen_type):
+        """Return why a generator is out of date by its own inputs, or [] if it is current."""
+        target = self.targets.get(gen_type)
+        if target is None:
+            return ["never built"]
+        if target.get("code") != input_ledger.code_fingerprint(generator_runner.get_generator_script(gen_type)):
+            return ["generator or helper module code changed"]
+
+        reasons = []
+        recorded = target.get("files", {})
+        current = [path for path in get_prerequisites(gen_type) if os.path.exists(path)]
+        for path in current:
+            signature = self.signature(path)
+            if path not in recorded:
+                reasons.append(f"{_display_path(path)} added")
+            elif signature is None or signature[2] != recorded[path][2]:
+                reasons.append(f"{_display_path(path)} changed")
+        reasons.extend(f"{_display_path(path)} removed" for path in recorded if path not in current)
+
+        for dependency, signature in target.get("reads", {}).items():
+            if folder_signature(get_page_dir(dependency)) != signature:
+                reasons.append(f"{dependency} pages changed")
+        if gen_type != "crossreference" and folder_signature(get_page_dir(gen_type)) != target.get("pages"):
+            reasons.append("pages changed or removed outside a build")
+        return reasons
+
+    def record(self, gen_types):
+        """Record the current signatures of generators that are now up to date.
+
+        Call once every generator of the build has finished, so the page
+        folders include the sections cross-reference added.
+        """
+        for gen_type in gen_types:
+            target = {
+                "code": input_ledger.code_fingerprint(generator_runner.get_generator_script(gen_type)),
+                "files": {},
+            }
+            for path in get_prerequisites(gen_type):
+                signature = self.signature(path)
+                if signature:
+                    target["files"][path] = signature
+            if gen_type == "crossreference":
+                target["reads"] = {
+                    dependency: folder_signature(get_page_dir(dependency))
+                    for dependency in generator_runner.GENERATOR_DEPENDENCIES.get(gen_type, ())
+                }
+            else:
+                target["pages"] = folder_signature(get_page_dir(gen_type))
+            self.targets[gen_type] = target
+
+
+def _display_path(path):
+    """Return a data table path relative to the data folder, or a file name, for messages."""
+    try:
+        relative = os.path.relpath(path, wiki_paths.get_data_dir())
+    except ValueError:
+        relative = ".."  # Different drive
+    if relative.startswith(".."):
+        return os.path.basename(path)
+    return relative.replace("\\", "/")
+
+
+def plan_build(gen_types, state):
+    """Return {gen_type: [reasons]} for the generators in gen_types that need to run.
+
+    Generators are listed in the order of gen_types. A generator that depends
+    on one being rebuilt is rebuilt after it, even if its own inputs are current.
+    """
+    plan = {}
+    for gen_type in gen_types:
+        reasons = state.changes(gen_type)
+        if reasons:
+            plan[gen_type] = reasons
+    for gen_type in gen_types:
+        rebuilt = [dependency for dependency in generator_runner.GENERATOR_DEPENDENCIES.get(gen_type, ())
+                   if dependency in plan]
+        if rebuilt and gen_type not in plan:
+            plan[gen_type] = [f"{', '.join(rebuilt)} rebuilt"]
+    return {gen_type: plan[gen_type] for gen_type in gen_types if gen_type in plan}
+
+
+def page_inputs(gen_type, title):
+    """Return what a page was built from, or None if its generator has no record of it.
+
+    Only the tables a generator tracks are recorded per page; the rest of a
+    page's model comes from the generator's data tables, which every page of
+    the generator depends on.
+
+    Returns:
+        dict: {"files": [files or folders this page read entries of],
+        "reads": {table: {"source": file or folder, "keys": keys read or "*"}},
+        "generator_files": [input files of the whole generator]}
+    """
+    ledger = input_ledger.load_ledger(gen_type)
+    entry = ledger.get("pages", {}).get(title)
+    if entry is None:
+        return None
+    sources = ledger.get("sources", {})
+    reads = {
+        table: {"source": sources.get(table), "keys": keys}
+        for table, keys in entry.get("reads", {}).items()
+    }
+    return {
+        "files": sorted({read["source"] for read in reads.values() if read["source"]}),
+        "reads": reads,
+        "generator_files": get_prerequisites(gen_type),
+    }
@@ -0,0 +1,162 @@
+"""Cooperative cancellation of generator runs and game file imports.
+
+The UI creates a CancellationToken for each job and makes it the active token.
+Worker loops call token.check() between items, and child processes started
+for the job are registered with the token.
+
+Generators call check_cancelled() once per entity:
+
+- Embedded in the frozen app, they run in the UI process, so the active token
+  is checked directly and OperationCancelled is raised.
+- Run as child processes, they are told about the token through the
+  MORIA_CANCEL_FILE environment variable. Cancelling creates that file, and
+  the generator exits with CANCELLED_EXIT_CODE at the next entity boundary.
+
+Either way, a generator stops between entities, never in the middle of writing
+a page. A generator process that has not exited within CANCEL_GRACE_SECONDS is
+terminated. External tools such as retoc and UAssetGUI cannot check the file,
+so they are terminated straight away.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+
+CANCEL_FILE_ENV = "MORIA_CANCEL_FILE"
+CANCELLED_EXIT_CODE = 3
+
+# Seconds a child process gets to stop on its own before it is terminated
+CANCEL_GRACE_SECONDS = 5.0
+
+# Minimum seconds between checks of the cancel file in a child process
+CANCEL_FILE_CHECK_INTERVAL = 0.1
+
+
+class OperationCancelled(Exception):
+    """Raised when a job is cancelled."""
+
+
+class CancellationToken:
+    """Cancellation flag for one job, shared by its threads and child processes."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._processes = {}  # {process: cooperative}
+        self._lock = threading.Lock()
+        fd, self.cancel_file = tempfile.mkstemp(prefix="moria_cancel_", suffix=".flag")
+        os.close(fd)
+        os.remove(self.cancel_file)  # The file's existence is the signal
+
+    @property
+    def cancelled(self):
+        """True once cancel() has been called."""
+        return self._event.is_set()
+
+    def check(self):
+        """Raise OperationCancelled if the job has been cancelled."""
+        if self._event.is_set():
+            raise OperationCancelled()
+
+    def cancel(self):
+        """Cancel the job: signal child processes, then terminate any that do not stop."""
+        if self._event.is_set():
+            return
+        self._event.set()
+        try:
+            with open(self.cancel_file, 'w'):
+                pass
+        except OSError:
+            pass
+
+        with self._lock:
+            processes = list(self._processes.items())
+        cooperative = []
+        for process, checks_cancel_file in processes:
+            if checks_cancel_file:
+                cooperative.append(process)
+            else:
+                process.terminate()
+        if cooperative:
+            threading.Thread(target=self._terminate_after_grace, args=(cooperative,), daemon=True).start()
+
+    def _terminate_after_grace(self, processes):
+        """Give child processes time to stop on their own, then terminate them."""
+        deadline = time.monotonic() + CANCEL_GRACE_SECONDS
+        for process in processes:
+            try:
+                process.wait(max(0, deadline - time.monotonic()))
+            except Exception:
+                process.terminate()
+
+    def child_env(self):
+        """Return an environment for child processes that lets them see cancellation."""
+        return dict(os.environ, **{CANCEL_FILE_ENV: self.cancel_file})
+
+    def register_process(self, process, cooperative=True):
+        """Track a child process so cancel() can stop it.
+
+        Args:
+            process: subprocess.Popen of the child
+            cooperative: True if the child checks the cancel file and should get
+                CANCEL_GRACE_SECONDS to stop on its own
+        """
+        with self._lock:
+            self._processes[process] = cooperative
+        if self._event.is_set():
+            # Cancelled before the process started; stop it straight away
+            process.terminate()
+
+    def unregister_process(self, process):
+        """Stop tracking a child process once it has exited."""
+        with self._lock:
+            self._processes.pop(process, None)
+
+    def close(self):
+        """Remove the cancel file."""
+        try:
+            os.remove(self.cancel_file)
+        except OSError:
+            pass
+
+
+_active_token = None
+_last_file_check = 0.0
+
+
+def set_active_token(token):
+    """Make token the one checked by embedded generators and child process runners."""
+    global _active_token
+    _active_token = token
+
+
+def get_active_token():
+    """Return the active token, or None outside a cancellable job."""
+    return _active_token
+
+
+def check_cancelled():
+    """Stop the calling generator if its job has been cancelled.
+
+    Raises OperationCancelled when running inside the UI process; exits with
+    CANCELLED_EXIT_CODE when running as a child process.
+    """
+    global _last_file_check
+    token = _active_token
+    if token is not None:
+        token.check()
+        return
+
+    cancel_file = os.environ.get(CANCEL_FILE_ENV)
+    if not cancel_file:
+        return
+    now = time.monotonic()
+    if now - _last_file_check < CANCEL_FILE_CHECK_INTERVAL:
+        return
+    _last_file_check = now
+    if os.path.exists(cancel_file):
+        print("\nCancelled")
+        sys.stdout.flush()
+        sys.exit(CANCELLED_EXIT_CODE)
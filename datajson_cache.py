@@ -0,0 +1,126 @@
+"""Compact cache of converted UAssetGUI DataTable/StringTable JSON files.
+
+UAssetGUI JSON carries the full NameMap, import/export headers and verbose
+type strings, so DT_Items.json is many times larger than the data the
+generators actually read. This module keeps a pruned copy of each file next to
+it (DT_Items.json -> DT_Items.cache) holding only the "Imports" list and the
+"$type"/"Table" fields of each export, serialized with marshal.
+
+The pruned document keeps the same shape as the original JSON, so the existing
+loaders in the generator scripts read it unchanged.
+"""
+
+import json
+import marshal
+import os
+import sys
+import threading
+
+
+CACHE_EXTENSION = ".cache"
+CACHE_FORMAT_VERSION = 1
+
+# Export fields the generators read; everything else is dropped
+EXPORT_KEYS = ("$type", "Table")
+
+
+def get_cache_path(json_path):
+    """Return the cache file path for a JSON file."""
+    base, _ = os.path.splitext(json_path)
+    return base + CACHE_EXTENSION
+
+
+def prune_document(data):
+    """Strip a UAssetGUI JSON document down to the fields the generators use."""
+    exports = []
+    for export in data.get("Exports", []):
+        if isinstance(export, dict):
+            exports.append({key: export[key] for key in EXPORT_KEYS if key in export})
+    return {
+        "Imports": data.get("Imports", []),
+        "Exports": exports,
+    }
+
+
+def _source_signature(json_path):
+    """Return (mtime_ns, size) identifying the current contents of a JSON file."""
+    stat = os.stat(json_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_cache(cache_path, signature):
+    """Read a cache file, returning None if it is missing, stale or unreadable."""
+    try:
+        with open(cache_path, 'rb') as f:
+            header = marshal.load(f)
+            if header != (CACHE_FORMAT_VERSION, tuple(sys.version_info[:2]), signature):
+                return None
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def write_cache(json_path, data=None):
+    """Write the pruned cache for a JSON file and return the pruned document.
+
+    If data is given it must be the parsed contents of json_path.
+    """
+    signature = _source_signature(json_path)
+    if data is None:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    document = prune_document(data)
+
+    cache_path = get_cache_path(json_path)
+    # Generators may rebuild the same cache concurrently, so use a unique temp file
+    temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            marshal.dump((CACHE_FORMAT_VERSION, tuple(sys.version_info[:2]), signature), f)
+            marshal.dump(document, f)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        # A read-only data directory should not stop generation
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return document
+
+
+def load_json(json_path):
+    """Load a UAssetGUI JSON file through its cache, rebuilding the cache if stale."""
+    document = _read_cache(get_cache_path(json_path), _source_signature(json_path))
+    if document is None:
+        document = write_cache(json_path)
+    return document
+
+
+def build_caches(data_dir, log_callback=None):
+    """Write caches for every JSON file under data_dir.
+
+    Returns:
+        tuple: (cached_count, json_bytes, cache_bytes)
+    """
+    cached_count = 0
+    json_bytes = 0
+    cache_bytes = 0
+
+    for root_dir, dirs, files in os.walk(data_dir):
+        for filename in files:
+            if not filename.endswith(".json"):
+                continue
+            json_path = os.path.join(root_dir, filename)
+            try:
+                write_cache(json_path)
+            except (OSError, ValueError) as e:
+                if log_callback:
+                    log_callback(f"  Could not cache {filename}: {e}")
+                continue
+
+            cache_path = get_cache_path(json_path)
+            if os.path.exists(cache_path):
+                cached_count += 1
+                json_bytes += os.path.getsize(json_path)
+                cache_bytes += os.path.getsize(cache_path)
+
+    return cached_count, json_bytes, cache_bytes
@@ -1,10 +1,16 @@
-import json
 import os
 import re
 
+from cancellation import check_cancelled
+from datajson_cache import load_json
+import generator_metrics
+from input_ledger import InputLedger
+from model_export import open_model_exporter
+import wiki_paths
+
 # Paths - Updated for new datajson structure
-OUTPUT_BASE = os.path.join(os.environ.get("APPDATA", ""), "MoriaWikiGenerator", "output")
-SOURCE_DIR = os.path.join(OUTPUT_BASE, "datajson", "Moria", "Content", "Tech", "Data")
+OUTPUT_BASE = wiki_paths.get_output_dir()
+SOURCE_DIR = wiki_paths.get_data_dir()
 STRINGS_DIR = os.path.join(SOURCE_DIR, "StringTables")
 ARMOR_FILE = os.path.join(SOURCE_DIR, "Items", "DT_Armor.json")
 RECIPES_FILE = os.path.join(SOURCE_DIR, "Items", "DT_ItemRecipes.json")
@@ -147,8 +153,7 @@ def is_tinted_armor_variant(display_name):
 
 def load_string_table(filepath):
     """Load a single string table file and return a key->value dictionary."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     string_map = {}
     # Navigate to Exports[0].Table.Value which contains the string pairs
@@ -183,8 +188,7 @@ def load_all_string_tables(strings_dir):
 
 def load_armor_data(filepath):
     """Load DT_Armor.json and return the list of armor entries."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     armor_list = []
     exports = data.get("Exports", [])
@@ -199,8 +203,7 @@ def load_armor_data(filepath):
 
 def load_recipe_data(filepath):
     """Load DT_ItemRecipes.json and return a dictionary keyed by result item handle."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     recipe_map = {}
     exports = data.get("Exports", [])
@@ -772,46 +775,71 @@ def sanitize_filename(name):
 
 
 def main():
+    generator_metrics.begin("armor")
+
     # Create output directory
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     # Load data
-    print("Loading all string tables...")
-    string_map = load_all_string_tables(STRINGS_DIR)
-    print(f"Loaded {len(string_map)} total strings")
+    with generator_metrics.phase("strings"):
+        print("Loading all string tables...")
+        string_map = load_all_string_tables(STRINGS_DIR)
+        print(f"Loaded {len(string_map)} total strings")
 
-    print("Loading armor data...")
-    armor_list = load_armor_data(ARMOR_FILE)
-    print(f"Loaded {len(armor_list)} armor entries")
+    with generator_metrics.phase("load"):
+        print("Loading armor data...")
+        armor_list = load_armor_data(ARMOR_FILE)
+        print(f"Loaded {len(armor_list)} armor entries")
 
-    print("Loading recipe data...")
-    recipe_map = load_recipe_data(RECIPES_FILE)
-    print(f"Loaded {len(recipe_map)} recipes")
+        print("Loading recipe data...")
+        recipe_map = load_recipe_data(RECIPES_FILE)
+        print(f"Loaded {len(recipe_map)} recipes")
+
+    # Export models for structured data consumers, if enabled
+    exporter = open_model_exporter("armor")
+    ledger = InputLedger("armor", __file__)
 
     # Process each armor entry
     count = 0
 
     for armor_entry in armor_list:
-        model = extract_armor_model(armor_entry, string_map, recipe_map)
+        check_cancelled()
+        with generator_metrics.phase("build"):
+            model = extract_armor_model(armor_entry, string_map, recipe_map)
 
         # Skip items without a display name
         if not model.get("DisplayName"):
             continue
 
-        # Generate wiki template
-        wiki_content = generate_wiki_template(model)
+        generator_metrics.count("entities")
+        with generator_metrics.phase("export"):
+            exporter.add(model["DisplayName"], model)
 
-        # Write to file using DisplayName as filename
+        # Write to file using DisplayName as filename, unless its inputs are unchanged
         filename = sanitize_filename(model["DisplayName"]) + ".wiki"
         filepath = os.path.join(OUTPUT_DIR, filename)
+        if ledger.is_current(filename[:-5], model, filepath):
+            continue
+
+        # Generate wiki template
+        with generator_metrics.phase("render"):
+            wiki_content = generate_wiki_template(model)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(wiki_content)
+        with generator_metrics.phase("write"):
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(wiki_content)
+            generator_metrics.count("files")
+        ledger.record()
 
         count += 1
         print(f"Generated: {filename}")
 
-    print(f"\nDone! Generated {count} wiki templates in {OUTPUT_DIR}")
+    with generator_metrics.phase("export"):
+        exporter.close()
+    ledger.save()
+
+    print(f"\nDone! Generated {count} wiki templates in {OUTPUT_DIR} ({ledger.unchanged} unchanged)")
+    generator_metrics.end()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,15 @@
-import json
 import os
 
+from cancellation import check_cancelled
+from datajson_cache import load_json
+import generator_metrics
+from input_ledger import InputLedger
+from model_export import export_models
+import wiki_paths
+
 # Paths - Updated for new datajson structure
-OUTPUT_BASE = os.path.join(os.environ.get("APPDATA", ""), "MoriaWikiGenerator", "output")
-SOURCE_DIR = os.path.join(OUTPUT_BASE, "datajson", "Moria", "Content", "Tech", "Data")
+OUTPUT_BASE = wiki_paths.get_output_dir()
+SOURCE_DIR = wiki_paths.get_data_dir()
 STRINGS_DIR = os.path.join(SOURCE_DIR, "StringTables")
 BREWS_FILE = os.path.join(SOURCE_DIR, "Items", "DT_Brews.json")
 RECIPES_FILE = os.path.join(SOURCE_DIR, "Items", "DT_ItemRecipes.json")
@@ -56,34 +62,32 @@ def load_all_string_tables(strings_dir):
         if filename.endswith('.json'):
             filepath = os.path.join(strings_dir, filename)
             print(f"  Loading {filename}...")
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-                # Parse UAssetAPI string table format
-                exports = data.get("Exports", [])
-                file_string_count = 0
-
-                for export in exports:
-                    table = export.get("Table", {})
-                    if table and isinstance(table, dict):
-                        # The table has a 'Value' which is a list of [key, value] pairs
-                        entries = table.get("Value", [])
-                        if isinstance(entries, list):
-                            for entry in entries:
-                                if isinstance(entry, list) and len(entry) == 2:
-                                    key, value = entry
-                                    string_map[key] = value
-                                    file_string_count += 1
-
-                print(f"    Found {file_string_count} strings")
+            data = load_json(filepath)
+
+            # Parse UAssetAPI string table format
+            exports = data.get("Exports", [])
+            file_string_count = 0
+
+            for export in exports:
+                table = export.get("Table", {})
+                if table and isinstance(table, dict):
+                    # The table has a 'Value' which is a list of [key, value] pairs
+                    entries = table.get("Value", [])
+                    if isinstance(entries, list):
+                        for entry in entries:
+                            if isinstance(entry, list) and len(entry) == 2:
+                                key, value = entry
+                                string_map[key] = value
+                                file_string_count += 1
+
+            print(f"    Found {file_string_count} strings")
 
     return string_map
 
 
 def load_brews_data(filepath):
     """Load DT_Brews.json and return a list of brew entries."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     brews_list = []
     exports = data.get("Exports", [])
@@ -98,8 +102,7 @@ def load_brews_data(filepath):
 
 def load_recipes_data(filepath):
     """Load DT_ItemRecipes.json and return a dict of recipe data by item name."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     recipes_dict = {}
     exports = data.get("Exports", [])
@@ -167,8 +170,7 @@ def load_recipes_data(filepath):
 
 def load_threshold_effects_data(filepath):
     """Load DT_ThresholdEffects.json and return a dict of effect durations."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     effects_dict = {}
     exports = data.get("Exports", [])
@@ -667,6 +669,7 @@ def process_brews(brews_data, string_map, recipes_dict, threshold_effects, impor
     brew_models = []
 
     for brew_entry in brews_data:
+        check_cancelled()
         brew_name = brew_entry.get("Name", "")
 
         # Get properties
@@ -759,60 +762,78 @@ def sanitize_filename(filename):
 
 
 def write_wiki_files(brew_models, output_dir, string_map):
-    """Write wiki files for all brews."""
+    """Write wiki files for all brews whose inputs changed since the last run."""
     os.makedirs(output_dir, exist_ok=True)
+    ledger = InputLedger("brews", __file__)
+    string_map = ledger.track("strings", string_map, STRINGS_DIR)
 
     print(f"\nWriting wiki files to {output_dir}...")
     for brew_model in brew_models:
         display_name = sanitize_filename(brew_model['DisplayName'])
         filename = f"{display_name}.wiki"
         filepath = os.path.join(output_dir, filename)
+        if ledger.is_current(display_name, brew_model, filepath):
+            continue
 
-        wiki_content = generate_wiki_template(brew_model, string_map)
+        with generator_metrics.phase("render"):
+            wiki_content = generate_wiki_template(brew_model, string_map)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(wiki_content)
+        with generator_metrics.phase("write"):
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(wiki_content)
+            generator_metrics.count("files")
+        ledger.record()
 
-    print(f"  Wrote {len(brew_models)} wiki files")
+    ledger.save()
+    print(f"  Wrote {ledger.written} wiki files, {ledger.unchanged} unchanged")
 
 
 def main():
+    generator_metrics.begin("brews")
     print("Loading data...")
 
     # Load string tables
-    print("Loading string tables...")
-    string_map = load_all_string_tables(STRINGS_DIR)
-    print(f"  Total strings: {len(string_map)}")
+    with generator_metrics.phase("strings"):
+        print("Loading string tables...")
+        string_map = load_all_string_tables(STRINGS_DIR)
+        print(f"  Total strings: {len(string_map)}")
 
     # Load recipes data
-    print("Loading recipes data...")
-    recipes_dict = load_recipes_data(RECIPES_FILE)
-    print(f"  Total recipes: {len(recipes_dict)}")
+    with generator_metrics.phase("load"):
+        print("Loading recipes data...")
+        recipes_dict = load_recipes_data(RECIPES_FILE)
+        print(f"  Total recipes: {len(recipes_dict)}")
 
-    # Load threshold effects data
-    print("Loading threshold effects data...")
-    threshold_effects = load_threshold_effects_data(THRESHOLD_EFFECTS_FILE)
-    print(f"  Total threshold effects: {len(threshold_effects)}")
+        # Load threshold effects data
+        print("Loading threshold effects data...")
+        threshold_effects = load_threshold_effects_data(THRESHOLD_EFFECTS_FILE)
+        print(f"  Total threshold effects: {len(threshold_effects)}")
 
-    # Load brews data
-    print("Loading brews data...")
-    with open(BREWS_FILE, 'r', encoding='utf-8') as f:
-        brews_json = json.load(f)
+        # Load brews data
+        print("Loading brews data...")
+        brews_json = load_json(BREWS_FILE)
 
-    # Extract imports for effect lookups
-    imports = brews_json.get("Imports", [])
-    print(f"  Total imports: {len(imports)}")
+        # Extract imports for effect lookups
+        imports = brews_json.get("Imports", [])
+        print(f"  Total imports: {len(imports)}")
 
-    brews_data = load_brews_data(BREWS_FILE)
-    print(f"  Total brews: {len(brews_data)}")
+        brews_data = load_brews_data(BREWS_FILE)
+        print(f"  Total brews: {len(brews_data)}")
 
     # Process brews
-    brew_models = process_brews(brews_data, string_map, recipes_dict, threshold_effects, imports)
+    with generator_metrics.phase("build"):
+        brew_models = process_brews(brews_data, string_map, recipes_dict, threshold_effects, imports)
+        generator_metrics.count("entities", len(brew_models))
+
+    # Export models for structured data consumers, if enabled
+    with generator_metrics.phase("export"):
+        export_models("brews", brew_models)
 
     # Write wiki files
     write_wiki_files(brew_models, OUTPUT_DIR, string_map)
 
     print("\nDone!")
+    generator_metrics.end()
 
 
 if __name__ == "__main__":
@@ -1,13 +1,21 @@
 import json
 import os
 
+from cancellation import check_cancelled
+from datajson_cache import load_json
+import generator_metrics
+from input_ledger import InputLedger
+from model_export import export_models
+import wiki_paths
+
 # Paths - Updated for new datajson structure
-OUTPUT_BASE = os.path.join(os.environ.get("APPDATA", ""), "MoriaWikiGenerator", "output")
-SOURCE_DIR = os.path.join(OUTPUT_BASE, "datajson", "Moria", "Content", "Tech", "Data")
+OUTPUT_BASE = wiki_paths.get_output_dir()
+SOURCE_DIR = wiki_paths.get_data_dir()
 STRINGS_DIR = os.path.join(SOURCE_DIR, "StringTables")
 CONSTRUCTIONS_FILE = os.path.join(SOURCE_DIR, "Building", "DT_Constructions.json")
 RECIPES_FILE = os.path.join(SOURCE_DIR, "Building", "DT_ConstructionRecipes.json")
 ENTITLEMENTS_FILE = os.path.join(SOURCE_DIR, "DT_Entitlements.json")
+ITEMS_FILE = os.path.join(SOURCE_DIR, "Items", "DT_Items.json")
 UNLOCK_OVERRIDES_FILE = "construction_unlock_overrides.json"
 OUTPUT_DIR = os.path.join(OUTPUT_BASE, "wiki", "constructions")
 
@@ -87,8 +95,7 @@ def load_entitlements(filepath):
     Returns:
         dict: Maps construction internal name -> DLC short name (e.g., "Beorn", "OrcHunter")
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     construction_to_dlc = {}
 
@@ -166,26 +173,25 @@ def load_all_string_tables(strings_dir):
         if filename.endswith('.json'):
             filepath = os.path.join(strings_dir, filename)
             print(f"  Loading {filename}...")
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-                # Parse UAssetAPI string table format
-                exports = data.get("Exports", [])
-                file_string_count = 0
-
-                for export in exports:
-                    table = export.get("Table", {})
-                    if table and isinstance(table, dict):
-                        # The table has a 'Value' which is a list of [key, value] pairs
-                        entries = table.get("Value", [])
-                        if isinstance(entries, list):
-                            for entry in entries:
-                                if isinstance(entry, list) and len(entry) == 2:
-                                    key, value = entry
-                                    string_map[key] = value
-                                    file_string_count += 1
-
-                print(f"    Found {file_string_count} strings")
+            data = load_json(filepath)
+
+            # Parse UAssetAPI string table format
+            exports = data.get("Exports", [])
+            file_string_count = 0
+
+            for export in exports:
+                table = export.get("Table", {})
+                if table and isinstance(table, dict):
+                    # The table has a 'Value' which is a list of [key, value] pairs
+                    entries = table.get("Value", [])
+                    if isinstance(entries, list):
+                        for entry in entries:
+                            if isinstance(entry, list) and len(entry) == 2:
+                                key, value = entry
+                                string_map[key] = value
+                                file_string_count += 1
+
+            print(f"    Found {file_string_count} strings")
 
     return string_map
 
@@ -259,8 +265,7 @@ def detect_dlc_from_path(actor_path):
 
 def load_constructions_data(filepath):
     """Load DT_Constructions.json and return list of construction entries."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     constructions = []
     exports = data.get("Exports", [])
@@ -280,8 +285,7 @@ def load_recipes_data(filepath):
     Maps construction names to their recipes. Handles cases where recipe name differs
     from the construction it builds (e.g., Beorn_Roof_* recipes build BP_Beorn_RoofTile_*).
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     recipes_dict = {}
     exports = data.get("Exports", [])
@@ -605,8 +609,7 @@ def analyze_construction(construction, recipe, string_map, dlc_map):
 
 def load_items_data(filepath):
     """Load DT_Items.json to get item display names."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     items_map = {}
     exports = data.get("Exports", [])
@@ -952,7 +955,7 @@ def sanitize_filename(filename):
 
 
 def write_wiki_files(construction_models, output_dir, items_map, string_map, unlock_overrides, all_constructions_map=None):
-    """Write wiki files for all constructions."""
+    """Write wiki files for all constructions whose inputs changed since the last run."""
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
 
@@ -960,23 +963,38 @@ def write_wiki_files(construction_models, output_dir, items_map, string_map, unl
     if all_constructions_map is None:
         all_constructions_map = {model["InternalName"]: model for model in construction_models}
 
+    # Templates look up other entities, strings and overrides; record what each page reads
+    ledger = InputLedger("constructions", __file__)
+    items_map = ledger.track("items", items_map, ITEMS_FILE)
+    all_constructions_map = ledger.track("constructions", all_constructions_map, CONSTRUCTIONS_FILE)
+    string_map = ledger.track("strings", string_map, STRINGS_DIR)
+    unlock_overrides = ledger.track("overrides", unlock_overrides, UNLOCK_OVERRIDES_FILE)
+
     print(f"\nWriting wiki files to {output_dir}...")
     for model in construction_models:
         display_name = model.get("DisplayName")
         if not display_name:
             continue
 
-        # Generate wiki content using complete constructions map
-        wiki_content = generate_wiki_template(model, items_map, all_constructions_map, string_map, unlock_overrides)
-
-        # Write to file
+        # Skip pages whose inputs are unchanged
         filename = sanitize_filename(display_name) + ".wiki"
         filepath = os.path.join(output_dir, filename)
+        if ledger.is_current(filename[:-5], model, filepath):
+            continue
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(wiki_content)
+        # Generate wiki content using complete constructions map
+        with generator_metrics.phase("render"):
+            wiki_content = generate_wiki_template(model, items_map, all_constructions_map, string_map, unlock_overrides)
 
-    print(f"  Wrote {len(construction_models)} wiki files")
+        # Write to file
+        with generator_metrics.phase("write"):
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(wiki_content)
+            generator_metrics.count("files")
+        ledger.record()
+
+    ledger.save()
+    print(f"  Wrote {ledger.written} wiki files, {ledger.unchanged} unchanged")
 
 
 
@@ -1001,6 +1019,7 @@ def process_constructions(constructions, recipes, string_map, dlc_map):
 
     # First pass: Build complete map of all constructions
     for construction in constructions:
+        check_cancelled()
         name = construction.get("Name", "")
         # Try exact case first, then lowercase for case-insensitive match
         recipe = recipes.get(name) or recipes.get(name.lower())
@@ -1080,46 +1099,56 @@ def process_constructions(constructions, recipes, string_map, dlc_map):
 
 def main():
     """Main entry point."""
+    generator_metrics.begin("constructions")
+
     # Load string tables
-    print("Loading string tables...")
-    string_map = load_all_string_tables(STRINGS_DIR)
-    print(f"  Total strings: {len(string_map)}")
+    with generator_metrics.phase("strings"):
+        print("Loading string tables...")
+        string_map = load_all_string_tables(STRINGS_DIR)
+        print(f"  Total strings: {len(string_map)}")
 
     # Load items data for material lookups
-    print("Loading items data...")
-    items_file = os.path.join(SOURCE_DIR, "Items", "DT_Items.json")
-    items_map = load_items_data(items_file)
-    print(f"  Total items: {len(items_map)}")
-
-    # Load constructions
-    print("Loading constructions...")
-    constructions = load_constructions_data(CONSTRUCTIONS_FILE)
-    print(f"  Total constructions: {len(constructions)}")
-
-    # Load recipes
-    print("Loading recipes...")
-    recipes = load_recipes_data(RECIPES_FILE)
-    print(f"  Total recipes: {len(recipes)}")
-
-    # Load DLC entitlements
-    print("Loading DLC entitlements...")
-    dlc_map = load_entitlements(ENTITLEMENTS_FILE)
-    print(f"  Total DLC constructions: {len(dlc_map)}")
-
-    # Load unlock overrides
-    print("Loading unlock overrides...")
-    unlock_overrides = load_unlock_overrides(UNLOCK_OVERRIDES_FILE)
-    print(f"  Total unlock overrides: {len(unlock_overrides)}")
+    with generator_metrics.phase("load"):
+        print("Loading items data...")
+        items_map = load_items_data(ITEMS_FILE)
+        print(f"  Total items: {len(items_map)}")
+
+        # Load constructions
+        print("Loading constructions...")
+        constructions = load_constructions_data(CONSTRUCTIONS_FILE)
+        print(f"  Total constructions: {len(constructions)}")
+
+        # Load recipes
+        print("Loading recipes...")
+        recipes = load_recipes_data(RECIPES_FILE)
+        print(f"  Total recipes: {len(recipes)}")
+
+        # Load DLC entitlements
+        print("Loading DLC entitlements...")
+        dlc_map = load_entitlements(ENTITLEMENTS_FILE)
+        print(f"  Total DLC constructions: {len(dlc_map)}")
+
+        # Load unlock overrides
+        print("Loading unlock overrides...")
+        unlock_overrides = load_unlock_overrides(UNLOCK_OVERRIDES_FILE)
+        print(f"  Total unlock overrides: {len(unlock_overrides)}")
 
     # Process constructions
-    construction_models, all_constructions_map = process_constructions(
-        constructions, recipes, string_map, dlc_map
-    )
+    with generator_metrics.phase("build"):
+        construction_models, all_constructions_map = process_constructions(
+            constructions, recipes, string_map, dlc_map
+        )
+        generator_metrics.count("entities", len(construction_models))
+
+    # Export models for structured data consumers, if enabled
+    with generator_metrics.phase("export"):
+        export_models("constructions", construction_models)
 
     # Write wiki files using the complete constructions map for cross-references
     write_wiki_files(construction_models, OUTPUT_DIR, items_map, string_map, unlock_overrides, all_constructions_map)
 
     print("\nDone!")
+    generator_metrics.end()
 
 
 if __name__ == "__main__":
@@ -1,12 +1,20 @@
 import json
 import os
 
+from cancellation import check_cancelled
+from datajson_cache import load_json
+import generator_metrics
+from input_ledger import InputLedger
+from model_export import export_models
+import wiki_paths
+
 # Paths - Updated for new datajson structure
-OUTPUT_BASE = os.path.join(os.environ.get("APPDATA", ""), "MoriaWikiGenerator", "output")
-SOURCE_DIR = os.path.join(OUTPUT_BASE, "datajson", "Moria", "Content", "Tech", "Data")
+OUTPUT_BASE = wiki_paths.get_output_dir()
+SOURCE_DIR = wiki_paths.get_data_dir()
 STRINGS_DIR = os.path.join(SOURCE_DIR, "StringTables")
 CONSUMABLES_FILE = os.path.join(SOURCE_DIR, "Items", "DT_Consumables.json")
 RECIPES_FILE = os.path.join(SOURCE_DIR, "Items", "DT_ItemRecipes.json")
+UNLOCK_OVERRIDES_FILE = "consumable_unlock_overrides.json"
 OUTPUT_DIR = os.path.join(OUTPUT_BASE, "wiki", "consumables")
 
 # Mapping from DLC path names to DLC titles
@@ -26,9 +34,8 @@ DLC_TITLE_MAP = {
 # Load unlock overrides from JSON file
 def load_unlock_overrides():
     """Load unlock overrides from consumable_unlock_overrides.json"""
-    override_file = "consumable_unlock_overrides.json"
-    if os.path.exists(override_file):
-        with open(override_file, 'r', encoding='utf-8') as f:
+    if os.path.exists(UNLOCK_OVERRIDES_FILE):
+        with open(UNLOCK_OVERRIDES_FILE, 'r', encoding='utf-8') as f:
             overrides = json.load(f)
             campaign_overrides = {}
             sandbox_overrides = {}
@@ -154,8 +161,7 @@ TAG_MAPPINGS = {
 
 def load_consumables_data(filepath):
     """Load DT_Consumables.json and return a list of consumable entries and imports."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     tradegoods_list = []
     exports = data.get("Exports", [])
@@ -171,8 +177,7 @@ def load_consumables_data(filepath):
 
 def load_recipe_data(filepath):
     """Load DT_ItemRecipes.json and return a dictionary keyed by item name (lowercase for case-insensitive lookup)."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     recipes = {}
     exports = data.get("Exports", [])
@@ -208,24 +213,23 @@ def load_all_string_tables(strings_dir):
         if filename.endswith('.json'):
             filepath = os.path.join(strings_dir, filename)
             print(f"  Loading {filename}...")
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-                # Parse UAssetAPI string table format
-                exports = data.get("Exports", [])
-                file_string_count = 0
-
-                for export in exports:
-                    table = export.get("Table", {})
-                    if table and isinstance(table, dict):
-                        # The table has a 'Value' which is a list of [key, value] pairs
-                        entries = table.get("Value", [])
-                        if isinstance(entries, list):
-                            for entry in entries:
-                                if isinstance(entry, list) and len(entry) == 2:
-                                    key, value = entry
-                                    string_map[key] = value
-                                    file_string_count += 1
+            data = load_json(filepath)
+
+            # Parse UAssetAPI string table format
+            exports = data.get("Exports", [])
+            file_string_count = 0
+
+            for export in exports:
+                table = export.get("Table", {})
+                if table and isinstance(table, dict):
+                    # The table has a 'Value' which is a list of [key, value] pairs
+                    entries = table.get("Value", [])
+                    if isinstance(entries, list):
+                        for entry in entries:
+                            if isinstance(entry, list) and len(entry) == 2:
+                                key, value = entry
+                                string_map[key] = value
+                                file_string_count += 1
 
             print(f"    Found {file_string_count} strings")
 
@@ -601,6 +605,7 @@ def process_consumables(consumables_data, recipes_data, string_map, imports):
     consumable_models = []
 
     for consumable_entry in consumables_data:
+        check_cancelled()
         consumable_name = consumable_entry.get("Name", "")
 
         # Get properties
@@ -677,47 +682,70 @@ def process_consumables(consumables_data, recipes_data, string_map, imports):
 
 
 def write_wiki_files(consumable_models, output_dir):
-    """Write wiki files for all consumables."""
+    """Write wiki files for all consumables whose inputs changed since the last run."""
     os.makedirs(output_dir, exist_ok=True)
+    ledger = InputLedger("consumables", __file__)
+    # Unlock overrides were applied while building the models; record the entry each page looked up
+    ledger.track("campaign_overrides", CAMPAIGN_UNLOCK_OVERRIDE, UNLOCK_OVERRIDES_FILE)
+    ledger.track("sandbox_overrides", SANDBOX_UNLOCK_OVERRIDE, UNLOCK_OVERRIDES_FILE)
 
     print(f"\nWriting wiki files to {output_dir}...")
     for consumable_model in consumable_models:
         filename = f"{consumable_model['DisplayName']}.wiki"
         filepath = os.path.join(output_dir, filename)
+        if ledger.is_current(consumable_model['DisplayName'], consumable_model, filepath):
+            continue
+        ledger.add_read("campaign_overrides", consumable_model['DisplayName'])
+        ledger.add_read("sandbox_overrides", consumable_model['DisplayName'])
 
-        wiki_content = generate_wiki_template(consumable_model)
+        with generator_metrics.phase("render"):
+            wiki_content = generate_wiki_template(consumable_model)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(wiki_content)
+        with generator_metrics.phase("write"):
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(wiki_content)
+            generator_metrics.count("files")
+        ledger.record()
 
-    print(f"  Wrote {len(consumable_models)} wiki files")
+    ledger.save()
+    print(f"  Wrote {ledger.written} wiki files, {ledger.unchanged} unchanged")
 
 
 def main():
+    generator_metrics.begin("consumables")
     print("Loading data...")
 
     # Load string tables
-    print("Loading string tables...")
-    string_map = load_all_string_tables(STRINGS_DIR)
-    print(f"  Total strings: {len(string_map)}")
+    with generator_metrics.phase("strings"):
+        print("Loading string tables...")
+        string_map = load_all_string_tables(STRINGS_DIR)
+        print(f"  Total strings: {len(string_map)}")
 
     # Load consumables data
-    print("Loading consumables data...")
-    consumables_data, imports = load_consumables_data(CONSUMABLES_FILE)
-    print(f"  Total consumables: {len(consumables_data)}")
+    with generator_metrics.phase("load"):
+        print("Loading consumables data...")
+        consumables_data, imports = load_consumables_data(CONSUMABLES_FILE)
+        print(f"  Total consumables: {len(consumables_data)}")
 
-    # Load recipes data
-    print("Loading recipes data...")
-    recipes_data = load_recipe_data(RECIPES_FILE)
-    print(f"  Total recipes: {len(recipes_data)}")
+        # Load recipes data
+        print("Loading recipes data...")
+        recipes_data = load_recipe_data(RECIPES_FILE)
+        print(f"  Total recipes: {len(recipes_data)}")
 
     # Process consumables
-    consumable_models = process_consumables(consumables_data, recipes_data, string_map, imports)
+    with generator_metrics.phase("build"):
+        consumable_models = process_consumables(consumables_data, recipes_data, string_map, imports)
+        generator_metrics.count("entities", len(consumable_models))
+
+    # Export models for structured data consumers, if enabled
+    with generator_metrics.phase("export"):
+        export_models("consumables", consumable_models)
 
     # Write wiki files
     write_wiki_files(consumable_models, OUTPUT_DIR)
 
     print("\nDone!")
+    generator_metrics.end()
 
 
 if __name__ == "__main__":
@@ -8,9 +8,13 @@ import os
 import re
 from collections import defaultdict
 
+from cancellation import check_cancelled
+import generator_metrics
+import wiki_paths
 
-# Base path for wiki output files in %APPDATA%
-OUTPUT_BASE = os.path.join(os.environ.get("APPDATA", ""), "MoriaWikiGenerator", "output")
+
+# Base path for wiki output files (see wiki_paths)
+OUTPUT_BASE = wiki_paths.get_output_dir()
 WIKI_DIR = os.path.join(OUTPUT_BASE, "wiki")
 
 # Directories to search for recipe usage
@@ -379,9 +383,15 @@ def update_wiki_file_with_crossref(filepath, used_in_section):
     Args:
         filepath: Path to the wiki file
         used_in_section: Formatted Used In section text
+
+    Returns:
+        bool: True if the file was rewritten, False if it was already up to date
     """
     with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+        original = f.read()
+
+    # Take out the section an earlier run added, so it is inserted the same way again
+    content = strip_used_in_section(original)
 
     # Check if Used In section already exists
     if '==Used In==' in content:
@@ -402,68 +412,115 @@ def update_wiki_file_with_crossref(filepath, used_in_section):
             # Append at end
             content = content.rstrip() + "\n" + used_in_section + "\n"
 
+    if content == original:
+        return False
+
     # Write updated content
     with open(filepath, 'w', encoding='utf-8') as f:
         f.write(content)
+    return True
+
+
+def strip_used_in_section(content):
+    """Return page content without a Used In section added by update_wiki_file_with_crossref()."""
+    updated = re.sub(r'\n==Used In==.*?\n+(?=\{\{Navbox )', '', content, count=1, flags=re.DOTALL)
+    if updated == content:
+        updated = re.sub(r'\n\n==Used In==.*\Z', '', content, count=1, flags=re.DOTALL)
+    return updated
+
+
+def remove_used_in_section(filepath):
+    """Remove the Used In section from a page whose item is no longer used in any recipe.
+
+    Generators leave pages with unchanged inputs as they are, so a section
+    added by an earlier run can still be there.
+
+    Returns:
+        bool: True if a section was removed
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
+    updated = strip_used_in_section(content)
+    if updated == content:
+        return False
+
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(updated)
+    return True
 
 
 def main():
     """Main processing function."""
+    generator_metrics.begin("crossreference")
     print("Cross-Reference Wiki Generator")
     print("=" * 80)
     print()
 
     # Build list of all target items
-    target_items = []
-    for directory in TARGET_DIRS:
-        if not os.path.exists(directory):
-            print(f"Warning: Directory not found: {directory}")
-            continue
-
-        for filename in os.listdir(directory):
-            if not filename.endswith('.wiki'):
+    with generator_metrics.phase("load"):
+        target_items = []
+        for directory in TARGET_DIRS:
+            if not os.path.exists(directory):
+                print(f"Warning: Directory not found: {directory}")
                 continue
 
-            filepath = os.path.join(directory, filename)
-            item_name = os.path.splitext(filename)[0]
-            target_items.append((item_name, filepath))
+            for filename in os.listdir(directory):
+                if not filename.endswith('.wiki'):
+                    continue
+
+                filepath = os.path.join(directory, filename)
+                item_name = os.path.splitext(filename)[0]
+                target_items.append((item_name, filepath))
+        generator_metrics.count("entities", len(target_items))
 
     print(f"Found {len(target_items)} target items to process")
     print()
 
     # Process each target item
     updated_count = 0
+    unchanged_count = 0
     skipped_count = 0
 
-    for item_name, filepath in target_items:
-        print(f"Processing: {item_name}...")
+    with generator_metrics.phase("crossref"):
+        for item_name, filepath in target_items:
+            check_cancelled()
+            print(f"Processing: {item_name}...")
 
-        # Find where this item is used
-        usage_list = find_material_usage(item_name, SEARCH_DIRS)
+            # Find where this item is used
+            usage_list = find_material_usage(item_name, SEARCH_DIRS)
 
-        if usage_list:
-            print(f"  Found {len(usage_list)} recipes using this item")
+            if usage_list:
+                print(f"  Found {len(usage_list)} recipes using this item")
 
-            # Determine which format to use based on directory
-            # Consumables use detailed table format, items/ores use simple list format
-            if "output/consumables" in filepath.replace("\\", "/"):
-                used_in_section = generate_used_in_section_detailed(usage_list)
-            else:
-                used_in_section = generate_used_in_section_simple(usage_list)
+                # Determine which format to use based on directory
+                # Consumables use detailed table format, items/ores use simple list format
+                if "output/consumables" in filepath.replace("\\", "/"):
+                    used_in_section = generate_used_in_section_detailed(usage_list)
+                else:
+                    used_in_section = generate_used_in_section_simple(usage_list)
 
-            # Update wiki file
-            update_wiki_file_with_crossref(filepath, used_in_section)
-            updated_count += 1
-        else:
-            print(f"  No recipes found using this item")
-            skipped_count += 1
+                # Update wiki file
+                if update_wiki_file_with_crossref(filepath, used_in_section):
+                    updated_count += 1
+                else:
+                    unchanged_count += 1
+            else:
+                print(f"  No recipes found using this item")
+                if remove_used_in_section(filepath):
+                    print(f"  Removed outdated Used In section")
+                    updated_count += 1
+                skipped_count += 1
+        generator_metrics.count("files", updated_count)
+        generator_metrics.count("unchanged", unchanged_count)
 
     print()
     print("=" * 80)
     print(f"Processing complete!")
     print(f"  Updated: {updated_count} files")
+    print(f"  Unchanged: {unchanged_count} files")
     print(f"  Skipped (no usage): {skipped_count} files")
     print(f"  Total processed: {len(target_items)} files")
+    generator_metrics.end()
 
 
 if __name__ == "__main__":
@@ -2,12 +2,20 @@ import json
 import os
 import re
 
+from cancellation import check_cancelled
+from datajson_cache import load_json
+import generator_metrics
+from input_ledger import InputLedger
+from model_export import export_models
+import wiki_paths
+
 # Paths - Updated for new datajson structure
-OUTPUT_BASE = os.path.join(os.environ.get("APPDATA", ""), "MoriaWikiGenerator", "output")
-SOURCE_DIR = os.path.join(OUTPUT_BASE, "datajson", "Moria", "Content", "Tech", "Data")
+OUTPUT_BASE = wiki_paths.get_output_dir()
+SOURCE_DIR = wiki_paths.get_data_dir()
 STRINGS_DIR = os.path.join(SOURCE_DIR, "StringTables")
 ITEMS_FILE = os.path.join(SOURCE_DIR, "Items", "DT_Items.json")
 RECIPES_FILE = os.path.join(SOURCE_DIR, "Items", "DT_ItemRecipes.json")
+UNLOCK_OVERRIDES_FILE = "item_unlock_overrides.json"
 OUTPUT_DIR = os.path.join(OUTPUT_BASE, "wiki", "items")
 
 # Mapping from DLC path names to DLC titles
@@ -47,9 +55,8 @@ SANDBOX_FRAGMENT_LOCATION = {
 # Load unlock overrides from JSON file
 def load_unlock_overrides():
     """Load unlock overrides from item_unlock_overrides.json"""
-    override_file = "item_unlock_overrides.json"
-    if os.path.exists(override_file):
-        with open(override_file, 'r', encoding='utf-8') as f:
+    if os.path.exists(UNLOCK_OVERRIDES_FILE):
+        with open(UNLOCK_OVERRIDES_FILE, 'r', encoding='utf-8') as f:
             overrides = json.load(f)
             campaign_overrides = {}
             sandbox_overrides = {}
@@ -130,8 +137,7 @@ TAG_MAPPINGS = {
 
 def load_string_table(filepath):
     """Load a single string table file and return a key->value dictionary."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     string_map = {}
     exports = data.get("Exports", [])
@@ -162,8 +168,7 @@ def load_all_string_tables(strings_dir):
 
 def load_items_data(filepath):
     """Load DT_Items.json and return the list of item entries."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     items_list = []
     exports = data.get("Exports", [])
@@ -178,8 +183,7 @@ def load_items_data(filepath):
 
 def load_recipe_data(filepath):
     """Load DT_ItemRecipes.json and return a dictionary keyed by item name (lowercase, no underscores)."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     recipes = {}
     exports = data.get("Exports", [])
@@ -782,6 +786,7 @@ def process_items(items_data, recipes_data, string_map):
     item_models = []
 
     for item_entry in items_data:
+        check_cancelled()
         item_name = item_entry.get("Name", "")
 
         # Get basic properties
@@ -923,50 +928,74 @@ def process_items(items_data, recipes_data, string_map):
 
 
 def write_wiki_files(item_models, output_dir):
-    """Write wiki template files for each item."""
+    """Write wiki template files for each item whose inputs changed since the last run."""
     print(f"\nWriting wiki files to {output_dir}...")
 
     os.makedirs(output_dir, exist_ok=True)
+    ledger = InputLedger("items", __file__)
+    # Unlock overrides were applied while building the models; record the entry each page looked up
+    ledger.track("campaign_overrides", CAMPAIGN_UNLOCK_OVERRIDE, UNLOCK_OVERRIDES_FILE)
+    ledger.track("sandbox_overrides", SANDBOX_UNLOCK_OVERRIDE, UNLOCK_OVERRIDES_FILE)
 
     for item in item_models:
-        wiki_content = generate_wiki_template(item)
         filename = f"{item['DisplayName']}.wiki"
         filepath = os.path.join(output_dir, filename)
+        if ledger.is_current(item['DisplayName'], item, filepath):
+            continue
+        ledger.add_read("campaign_overrides", item['DisplayName'])
+        ledger.add_read("sandbox_overrides", item['DisplayName'])
+
+        with generator_metrics.phase("render"):
+            wiki_content = generate_wiki_template(item)
 
         # Write new content (==Used In== section will be added by cross-reference script)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(wiki_content)
+        with generator_metrics.phase("write"):
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(wiki_content)
+            generator_metrics.count("files")
+        ledger.record()
 
-    print(f"  Wrote {len(item_models)} wiki files")
+    ledger.save()
+    print(f"  Wrote {ledger.written} wiki files, {ledger.unchanged} unchanged")
 
 
 
 
 def main():
+    generator_metrics.begin("items")
     print("Loading data...")
 
     # Load string tables
-    print("Loading string tables...")
-    string_map = load_all_string_tables(STRINGS_DIR)
-    print(f"  Total strings: {len(string_map)}")
+    with generator_metrics.phase("strings"):
+        print("Loading string tables...")
+        string_map = load_all_string_tables(STRINGS_DIR)
+        print(f"  Total strings: {len(string_map)}")
 
     # Load items data
-    print("Loading items data...")
-    items_data = load_items_data(ITEMS_FILE)
-    print(f"  Total items: {len(items_data)}")
+    with generator_metrics.phase("load"):
+        print("Loading items data...")
+        items_data = load_items_data(ITEMS_FILE)
+        print(f"  Total items: {len(items_data)}")
 
-    # Load recipes data
-    print("Loading recipes data...")
-    recipes_data = load_recipe_data(RECIPES_FILE)
-    print(f"  Total recipes: {len(recipes_data)}")
+        # Load recipes data
+        print("Loading recipes data...")
+        recipes_data = load_recipe_data(RECIPES_FILE)
+        print(f"  Total recipes: {len(recipes_data)}")
 
     # Process items
-    item_models = process_items(items_data, recipes_data, string_map)
+    with generator_metrics.phase("build"):
+        item_models = process_items(items_data, recipes_data, string_map)
+        generator_metrics.count("entities", len(item_models))
+
+    # Export models for structured data consumers, if enabled
+    with generator_metrics.phase("export"):
+        export_models("items", item_models)
 
     # Write wiki files
     write_wiki_files(item_models, OUTPUT_DIR)
 
     print("\nDone!")
+    generator_metrics.end()
 
 
 if __name__ == "__main__":
@@ -1,11 +1,19 @@
 import json
 import os
 
+from cancellation import check_cancelled
+from datajson_cache import load_json
+import generator_metrics
+from input_ledger import InputLedger
+from model_export import export_models
+import wiki_paths
+
 # Paths - Updated for new datajson structure
-OUTPUT_BASE = os.path.join(os.environ.get("APPDATA", ""), "MoriaWikiGenerator", "output")
-SOURCE_DIR = os.path.join(OUTPUT_BASE, "datajson", "Moria", "Content", "Tech", "Data")
+OUTPUT_BASE = wiki_paths.get_output_dir()
+SOURCE_DIR = wiki_paths.get_data_dir()
 STRINGS_DIR = os.path.join(SOURCE_DIR, "StringTables")
 ORES_FILE = os.path.join(SOURCE_DIR, "Items", "DT_Ores.json")
+UNLOCK_OVERRIDES_FILE = "ore_unlock_overrides.json"
 OUTPUT_DIR = os.path.join(OUTPUT_BASE, "wiki", "ores")
 
 # DLC detection patterns
@@ -25,9 +33,8 @@ DLC_PATH_PATTERNS = {
 # Load unlock overrides from JSON file
 def load_unlock_overrides():
     """Load unlock overrides from ore_unlock_overrides.json"""
-    override_file = "ore_unlock_overrides.json"
-    if os.path.exists(override_file):
-        with open(override_file, 'r', encoding='utf-8') as f:
+    if os.path.exists(UNLOCK_OVERRIDES_FILE):
+        with open(UNLOCK_OVERRIDES_FILE, 'r', encoding='utf-8') as f:
             overrides = json.load(f)
             campaign_overrides = {}
             sandbox_overrides = {}
@@ -51,24 +58,23 @@ def load_all_string_tables(strings_dir):
         if filename.endswith('.json'):
             filepath = os.path.join(strings_dir, filename)
             print(f"  Loading {filename}...")
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-                # Parse UAssetAPI string table format
-                exports = data.get("Exports", [])
-                file_string_count = 0
-
-                for export in exports:
-                    table = export.get("Table", {})
-                    if table and isinstance(table, dict):
-                        # The table has a 'Value' which is a list of [key, value] pairs
-                        entries = table.get("Value", [])
-                        if isinstance(entries, list):
-                            for entry in entries:
-                                if isinstance(entry, list) and len(entry) == 2:
-                                    key, value = entry
-                                    string_map[key] = value
-                                    file_string_count += 1
+            data = load_json(filepath)
+
+            # Parse UAssetAPI string table format
+            exports = data.get("Exports", [])
+            file_string_count = 0
+
+            for export in exports:
+                table = export.get("Table", {})
+                if table and isinstance(table, dict):
+                    # The table has a 'Value' which is a list of [key, value] pairs
+                    entries = table.get("Value", [])
+                    if isinstance(entries, list):
+                        for entry in entries:
+                            if isinstance(entry, list) and len(entry) == 2:
+                                key, value = entry
+                                string_map[key] = value
+                                file_string_count += 1
 
             print(f"    Found {file_string_count} strings")
 
@@ -77,8 +83,7 @@ def load_all_string_tables(strings_dir):
 
 def load_ores_data(filepath):
     """Load DT_Ores.json and return a list of ore entries."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     ores_list = []
     exports = data.get("Exports", [])
@@ -276,6 +281,7 @@ def process_ores(ores_data, string_map):
     excluded_ores = []
 
     for ore_entry in ores_data:
+        check_cancelled()
         ore_name = ore_entry.get("Name", "")
 
         # Skip UNSHIPPABLE items
@@ -354,20 +360,33 @@ def process_ores(ores_data, string_map):
 
 
 def write_wiki_files(ore_models, output_dir):
-    """Write wiki files for all ores."""
+    """Write wiki files for all ores whose inputs changed since the last run."""
     os.makedirs(output_dir, exist_ok=True)
+    ledger = InputLedger("ores", __file__)
+    # Unlock overrides were applied while building the models; record the entry each page looked up
+    ledger.track("campaign_overrides", CAMPAIGN_UNLOCK_OVERRIDE, UNLOCK_OVERRIDES_FILE)
+    ledger.track("sandbox_overrides", SANDBOX_UNLOCK_OVERRIDE, UNLOCK_OVERRIDES_FILE)
 
     print(f"\nWriting wiki files to {output_dir}...")
     for ore_model in ore_models:
         filename = f"{ore_model['DisplayName']}.wiki"
         filepath = os.path.join(output_dir, filename)
+        if ledger.is_current(ore_model['DisplayName'], ore_model, filepath):
+            continue
+        ledger.add_read("campaign_overrides", ore_model['DisplayName'])
+        ledger.add_read("sandbox_overrides", ore_model['DisplayName'])
 
-        wiki_content = generate_wiki_template(ore_model)
+        with generator_metrics.phase("render"):
+            wiki_content = generate_wiki_template(ore_model)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(wiki_content)
+        with generator_metrics.phase("write"):
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(wiki_content)
+            generator_metrics.count("files")
+        ledger.record()
 
-    print(f"  Wrote {len(ore_models)} wiki files")
+    ledger.save()
+    print(f"  Wrote {ledger.written} wiki files, {ledger.unchanged} unchanged")
 
 
 def write_excluded_log(excluded_ores, output_root):
@@ -384,20 +403,29 @@ def write_excluded_log(excluded_ores, output_root):
 
 
 def main():
+    generator_metrics.begin("ores")
     print("Loading data...")
 
     # Load string tables
-    print("Loading string tables...")
-    string_map = load_all_string_tables(STRINGS_DIR)
-    print(f"  Total strings: {len(string_map)}")
+    with generator_metrics.phase("strings"):
+        print("Loading string tables...")
+        string_map = load_all_string_tables(STRINGS_DIR)
+        print(f"  Total strings: {len(string_map)}")
 
     # Load ores data
-    print("Loading ores data...")
-    ores_data = load_ores_data(ORES_FILE)
-    print(f"  Total ores: {len(ores_data)}")
+    with generator_metrics.phase("load"):
+        print("Loading ores data...")
+        ores_data = load_ores_data(ORES_FILE)
+        print(f"  Total ores: {len(ores_data)}")
 
     # Process ores
-    ore_models, excluded_ores = process_ores(ores_data, string_map)
+    with generator_metrics.phase("build"):
+        ore_models, excluded_ores = process_ores(ores_data, string_map)
+        generator_metrics.count("entities", len(ore_models))
+
+    # Export models for structured data consumers, if enabled
+    with generator_metrics.phase("export"):
+        export_models("ores", ore_models)
 
     # Write wiki files
     write_wiki_files(ore_models, OUTPUT_DIR)
@@ -407,6 +435,7 @@ def main():
         write_excluded_log(excluded_ores, "output")
 
     print("\nDone!")
+    generator_metrics.end()
 
 
 if __name__ == "__main__":
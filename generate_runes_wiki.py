@@ -1,9 +1,15 @@
-import json
 import os
 
+from cancellation import check_cancelled
+from datajson_cache import load_json
+import generator_metrics
+from input_ledger import InputLedger
+from model_export import export_models
+import wiki_paths
+
 # Paths - Updated for new datajson structure
-OUTPUT_BASE = os.path.join(os.environ.get("APPDATA", ""), "MoriaWikiGenerator", "output")
-SOURCE_DIR = os.path.join(OUTPUT_BASE, "datajson", "Moria", "Content", "Tech", "Data")
+OUTPUT_BASE = wiki_paths.get_output_dir()
+SOURCE_DIR = wiki_paths.get_data_dir()
 STRINGS_DIR = os.path.join(SOURCE_DIR, "StringTables")
 RUNES_FILE = os.path.join(SOURCE_DIR, "Items", "DT_Runes.json")
 OUTPUT_DIR = os.path.join(OUTPUT_BASE, "wiki", "runes")
@@ -39,34 +45,32 @@ def load_all_string_tables(strings_dir):
         if filename.endswith('.json'):
             filepath = os.path.join(strings_dir, filename)
             print(f"  Loading {filename}...")
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-                # Parse UAssetAPI string table format
-                exports = data.get("Exports", [])
-                file_string_count = 0
-
-                for export in exports:
-                    table = export.get("Table", {})
-                    if table and isinstance(table, dict):
-                        # The table has a 'Value' which is a list of [key, value] pairs
-                        entries = table.get("Value", [])
-                        if isinstance(entries, list):
-                            for entry in entries:
-                                if isinstance(entry, list) and len(entry) == 2:
-                                    key, value = entry
-                                    string_map[key] = value
-                                    file_string_count += 1
-
-                print(f"    Found {file_string_count} strings")
+            data = load_json(filepath)
+
+            # Parse UAssetAPI string table format
+            exports = data.get("Exports", [])
+            file_string_count = 0
+
+            for export in exports:
+                table = export.get("Table", {})
+                if table and isinstance(table, dict):
+                    # The table has a 'Value' which is a list of [key, value] pairs
+                    entries = table.get("Value", [])
+                    if isinstance(entries, list):
+                        for entry in entries:
+                            if isinstance(entry, list) and len(entry) == 2:
+                                key, value = entry
+                                string_map[key] = value
+                                file_string_count += 1
+
+            print(f"    Found {file_string_count} strings")
 
     return string_map
 
 
 def load_runes_data(filepath):
     """Load DT_Runes.json and return a list of rune entries."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     runes_list = []
     exports = data.get("Exports", [])
@@ -320,6 +324,7 @@ def process_runes(runes_data, string_map):
     rune_models = []
 
     for rune_entry in runes_data:
+        check_cancelled()
         rune_name = rune_entry.get("Name", "")
 
         # Get properties
@@ -388,45 +393,64 @@ def sanitize_filename(filename):
 
 
 def write_wiki_files(rune_models, output_dir, string_map):
-    """Write wiki files for all runes."""
+    """Write wiki files for all runes whose inputs changed since the last run."""
     os.makedirs(output_dir, exist_ok=True)
+    ledger = InputLedger("runes", __file__)
+    string_map = ledger.track("strings", string_map, STRINGS_DIR)
 
     print(f"\nWriting wiki files to {output_dir}...")
     for rune_model in rune_models:
         display_name = sanitize_filename(rune_model['DisplayName'])
         filename = f"{display_name}.wiki"
         filepath = os.path.join(output_dir, filename)
+        if ledger.is_current(display_name, rune_model, filepath):
+            continue
 
-        wiki_content = generate_wiki_template(rune_model, string_map)
+        with generator_metrics.phase("render"):
+            wiki_content = generate_wiki_template(rune_model, string_map)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(wiki_content)
+        with generator_metrics.phase("write"):
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(wiki_content)
+            generator_metrics.count("files")
+        ledger.record()
 
-    print(f"  Wrote {len(rune_models)} wiki files")
+    ledger.save()
+    print(f"  Wrote {ledger.written} wiki files, {ledger.unchanged} unchanged")
 
 
 
 
 def main():
+    generator_metrics.begin("runes")
     print("Loading data...")
 
     # Load string tables
-    print("Loading string tables...")
-    string_map = load_all_string_tables(STRINGS_DIR)
-    print(f"  Total strings: {len(string_map)}")
+    with generator_metrics.phase("strings"):
+        print("Loading string tables...")
+        string_map = load_all_string_tables(STRINGS_DIR)
+        print(f"  Total strings: {len(string_map)}")
 
     # Load runes data
-    print("Loading runes data...")
-    runes_data = load_runes_data(RUNES_FILE)
-    print(f"  Total runes: {len(runes_data)}")
+    with generator_metrics.phase("load"):
+        print("Loading runes data...")
+        runes_data = load_runes_data(RUNES_FILE)
+        print(f"  Total runes: {len(runes_data)}")
 
     # Process runes
-    rune_models = process_runes(runes_data, string_map)
+    with generator_metrics.phase("build"):
+        rune_models = process_runes(runes_data, string_map)
+        generator_metrics.count("entities", len(rune_models))
+
+    # Export models for structured data consumers, if enabled
+    with generator_metrics.phase("export"):
+        export_models("runes", rune_models)
 
     # Write wiki files
     write_wiki_files(rune_models, OUTPUT_DIR, string_map)
 
     print("\nDone!")
+    generator_metrics.end()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,15 @@
-import json
 import os
 
+from cancellation import check_cancelled
+from datajson_cache import load_json
+import generator_metrics
+from input_ledger import InputLedger
+from model_export import export_models
+import wiki_paths
+
 # Paths - Updated for new datajson structure
-OUTPUT_BASE = os.path.join(os.environ.get("APPDATA", ""), "MoriaWikiGenerator", "output")
-SOURCE_DIR = os.path.join(OUTPUT_BASE, "datajson", "Moria", "Content", "Tech", "Data")
+OUTPUT_BASE = wiki_paths.get_output_dir()
+SOURCE_DIR = wiki_paths.get_data_dir()
 STRINGS_DIR = os.path.join(SOURCE_DIR, "StringTables")
 STORAGE_FILE = os.path.join(SOURCE_DIR, "Items", "DT_Storage.json")
 RECIPES_FILE = os.path.join(SOURCE_DIR, "Items", "DT_ItemRecipes.json")
@@ -40,34 +46,32 @@ def load_all_string_tables(strings_dir):
         if filename.endswith('.json'):
             filepath = os.path.join(strings_dir, filename)
             print(f"  Loading {filename}...")
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-                # Parse UAssetAPI string table format
-                exports = data.get("Exports", [])
-                file_string_count = 0
-
-                for export in exports:
-                    table = export.get("Table", {})
-                    if table and isinstance(table, dict):
-                        # The table has a 'Value' which is a list of [key, value] pairs
-                        entries = table.get("Value", [])
-                        if isinstance(entries, list):
-                            for entry in entries:
-                                if isinstance(entry, list) and len(entry) == 2:
-                                    key, value = entry
-                                    string_map[key] = value
-                                    file_string_count += 1
-
-                print(f"    Found {file_string_count} strings")
+            data = load_json(filepath)
+
+            # Parse UAssetAPI string table format
+            exports = data.get("Exports", [])
+            file_string_count = 0
+
+            for export in exports:
+                table = export.get("Table", {})
+                if table and isinstance(table, dict):
+                    # The table has a 'Value' which is a list of [key, value] pairs
+                    entries = table.get("Value", [])
+                    if isinstance(entries, list):
+                        for entry in entries:
+                            if isinstance(entry, list) and len(entry) == 2:
+                                key, value = entry
+                                string_map[key] = value
+                                file_string_count += 1
+
+            print(f"    Found {file_string_count} strings")
 
     return string_map
 
 
 def load_storage_data(filepath):
     """Load DT_Storage.json and return a list of storage entries."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     storage_list = []
     exports = data.get("Exports", [])
@@ -82,8 +86,7 @@ def load_storage_data(filepath):
 
 def load_recipes_data(filepath):
     """Load DT_ItemRecipes.json and return a dict of recipe materials by item name."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     recipes_dict = {}
     exports = data.get("Exports", [])
@@ -294,6 +297,7 @@ def process_storage(storage_data, string_map, recipes_dict):
     storage_models = []
 
     for storage_entry in storage_data:
+        check_cancelled()
         storage_name = storage_entry.get("Name", "")
 
         # Get properties
@@ -349,49 +353,68 @@ def process_storage(storage_data, string_map, recipes_dict):
 
 
 def write_wiki_files(storage_models, output_dir, string_map):
-    """Write wiki files for all storage items."""
+    """Write wiki files for all storage items whose inputs changed since the last run."""
     os.makedirs(output_dir, exist_ok=True)
+    ledger = InputLedger("storage", __file__)
+    string_map = ledger.track("strings", string_map, STRINGS_DIR)
 
     print(f"\nWriting wiki files to {output_dir}...")
     for storage_model in storage_models:
         filename = f"{storage_model['DisplayName']}.wiki"
         filepath = os.path.join(output_dir, filename)
+        if ledger.is_current(storage_model['DisplayName'], storage_model, filepath):
+            continue
 
-        wiki_content = generate_wiki_template(storage_model, string_map)
+        with generator_metrics.phase("render"):
+            wiki_content = generate_wiki_template(storage_model, string_map)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(wiki_content)
+        with generator_metrics.phase("write"):
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(wiki_content)
+            generator_metrics.count("files")
+        ledger.record()
 
-    print(f"  Wrote {len(storage_models)} wiki files")
+    ledger.save()
+    print(f"  Wrote {ledger.written} wiki files, {ledger.unchanged} unchanged")
 
 
 
 
 def main():
+    generator_metrics.begin("storage")
     print("Loading data...")
 
     # Load string tables
-    print("Loading string tables...")
-    string_map = load_all_string_tables(STRINGS_DIR)
-    print(f"  Total strings: {len(string_map)}")
+    with generator_metrics.phase("strings"):
+        print("Loading string tables...")
+        string_map = load_all_string_tables(STRINGS_DIR)
+        print(f"  Total strings: {len(string_map)}")
 
     # Load recipes data
-    print("Loading recipes data...")
-    recipes_dict = load_recipes_data(RECIPES_FILE)
-    print(f"  Total recipes: {len(recipes_dict)}")
+    with generator_metrics.phase("load"):
+        print("Loading recipes data...")
+        recipes_dict = load_recipes_data(RECIPES_FILE)
+        print(f"  Total recipes: {len(recipes_dict)}")
 
-    # Load storage data
-    print("Loading storage data...")
-    storage_data = load_storage_data(STORAGE_FILE)
-    print(f"  Total storage items: {len(storage_data)}")
+        # Load storage data
+        print("Loading storage data...")
+        storage_data = load_storage_data(STORAGE_FILE)
+        print(f"  Total storage items: {len(storage_data)}")
 
     # Process storage
-    storage_models = process_storage(storage_data, string_map, recipes_dict)
+    with generator_metrics.phase("build"):
+        storage_models = process_storage(storage_data, string_map, recipes_dict)
+        generator_metrics.count("entities", len(storage_models))
+
+    # Export models for structured data consumers, if enabled
+    with generator_metrics.phase("export"):
+        export_models("storage", storage_models)
 
     # Write wiki files
     write_wiki_files(storage_models, OUTPUT_DIR, string_map)
 
     print("\nDone!")
+    generator_metrics.end()
 
 
 if __name__ == "__main__":
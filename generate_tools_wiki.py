@@ -1,10 +1,16 @@
-import json
 import os
 import re
 
+from cancellation import check_cancelled
+from datajson_cache import load_json
+import generator_metrics
+from input_ledger import InputLedger
+from model_export import open_model_exporter
+import wiki_paths
+
 # Paths - Updated for new datajson structure
-OUTPUT_BASE = os.path.join(os.environ.get("APPDATA", ""), "MoriaWikiGenerator", "output")
-SOURCE_DIR = os.path.join(OUTPUT_BASE, "datajson", "Moria", "Content", "Tech", "Data")
+OUTPUT_BASE = wiki_paths.get_output_dir()
+SOURCE_DIR = wiki_paths.get_data_dir()
 STRINGS_DIR = os.path.join(SOURCE_DIR, "StringTables")
 TOOLS_FILE = os.path.join(SOURCE_DIR, "Items", "DT_Tools.json")
 THROWLIGHTS_FILE = os.path.join(SOURCE_DIR, "Items", "DT_ThrowLights.json")
@@ -154,8 +160,7 @@ UNLOCK_TYPE_DISPLAY = {
 
 def load_string_table(filepath):
     """Load a single string table file and return a key->value dictionary."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     string_map = {}
     exports = data.get("Exports", [])
@@ -186,8 +191,7 @@ def load_all_string_tables(strings_dir):
 
 def load_tools_data(filepath):
     """Load DT_Tools.json and return the list of tool entries."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     tools_list = []
     exports = data.get("Exports", [])
@@ -202,8 +206,7 @@ def load_tools_data(filepath):
 
 def load_throwlights_data(filepath):
     """Load DT_ThrowLights.json and return the list of throw light entries."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     throwlights_list = []
     exports = data.get("Exports", [])
@@ -218,8 +221,7 @@ def load_throwlights_data(filepath):
 
 def load_recipe_data(filepath):
     """Load DT_ItemRecipes.json and return a dictionary keyed by result item handle."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     recipe_map = {}
     exports = data.get("Exports", [])
@@ -911,69 +913,108 @@ def sanitize_filename(name):
 
 
 def main():
+    generator_metrics.begin("tools")
+
     # Create output directory
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     # Load data
-    print("Loading all string tables...")
-    string_map = load_all_string_tables(STRINGS_DIR)
-    print(f"Loaded {len(string_map)} total strings")
+    with generator_metrics.phase("strings"):
+        print("Loading all string tables...")
+        string_map = load_all_string_tables(STRINGS_DIR)
+        print(f"Loaded {len(string_map)} total strings")
 
-    print("Loading tools data...")
-    tools_list = load_tools_data(TOOLS_FILE)
-    print(f"Loaded {len(tools_list)} tool entries")
+    with generator_metrics.phase("load"):
+        print("Loading tools data...")
+        tools_list = load_tools_data(TOOLS_FILE)
+        print(f"Loaded {len(tools_list)} tool entries")
 
-    print("Loading throw lights data...")
-    throwlights_list = load_throwlights_data(THROWLIGHTS_FILE)
-    print(f"Loaded {len(throwlights_list)} throw light entries")
+        print("Loading throw lights data...")
+        throwlights_list = load_throwlights_data(THROWLIGHTS_FILE)
+        print(f"Loaded {len(throwlights_list)} throw light entries")
 
-    print("Loading recipe data...")
-    recipe_map = load_recipe_data(RECIPES_FILE)
-    print(f"Loaded {len(recipe_map)} recipes")
+        print("Loading recipe data...")
+        recipe_map = load_recipe_data(RECIPES_FILE)
+        print(f"Loaded {len(recipe_map)} recipes")
+
+    # Export models for structured data consumers, if enabled
+    exporter = open_model_exporter("tools")
+    ledger = InputLedger("tools", __file__)
 
     # Process each tool entry
     generated = 0
 
     for tool_entry in tools_list:
-        model = extract_tool_model(tool_entry, string_map, recipe_map)
+        check_cancelled()
+        with generator_metrics.phase("build"):
+            model = extract_tool_model(tool_entry, string_map, recipe_map)
 
         # Skip if no display name
         if not model.get("DisplayName"):
             continue
 
-        # Generate wiki template
-        template = generate_wiki_template(model)
+        generator_metrics.count("entities")
+        with generator_metrics.phase("export"):
+            exporter.add(model["DisplayName"], model)
 
-        # Write to file
+        # Write to file, unless its inputs are unchanged
         filename = sanitize_filename(model["DisplayName"]) + ".wiki"
         filepath = os.path.join(OUTPUT_DIR, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(template)
+        if ledger.is_current(filename[:-5], model, filepath):
+            continue
+
+        # Generate wiki template
+        with generator_metrics.phase("render"):
+            template = generate_wiki_template(model)
+
+        with generator_metrics.phase("write"):
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(template)
+            generator_metrics.count("files")
+        ledger.record()
 
         print(f"Generated: {filename}")
         generated += 1
 
     # Process each throw light entry
     for throwlight_entry in throwlights_list:
-        model = extract_throwlight_model(throwlight_entry, string_map, recipe_map)
+        check_cancelled()
+        with generator_metrics.phase("build"):
+            model = extract_throwlight_model(throwlight_entry, string_map, recipe_map)
 
         # Skip if no display name
         if not model.get("DisplayName"):
             continue
 
-        # Generate wiki template
-        template = generate_wiki_template(model)
+        generator_metrics.count("entities")
+        with generator_metrics.phase("export"):
+            exporter.add(model["DisplayName"], model)
 
-        # Write to file
+        # Write to file, unless its inputs are unchanged
         filename = sanitize_filename(model["DisplayName"]) + ".wiki"
         filepath = os.path.join(OUTPUT_DIR, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(template)
+        if ledger.is_current(filename[:-5], model, filepath):
+            continue
+
+        # Generate wiki template
+        with generator_metrics.phase("render"):
+            template = generate_wiki_template(model)
+
+        with generator_metrics.phase("write"):
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(template)
+            generator_metrics.count("files")
+        ledger.record()
 
         print(f"Generated: {filename}")
         generated += 1
 
-    print(f"\nDone! Generated {generated} wiki templates in {OUTPUT_DIR}")
+    with generator_metrics.phase("export"):
+        exporter.close()
+    ledger.save()
+
+    print(f"\nDone! Generated {generated} wiki templates in {OUTPUT_DIR} ({ledger.unchanged} unchanged)")
+    generator_metrics.end()
 
 
 if __name__ == "__main__":
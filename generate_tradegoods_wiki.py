@@ -1,9 +1,15 @@
-import json
 import os
 
+from cancellation import check_cancelled
+from datajson_cache import load_json
+import generator_metrics
+from input_ledger import InputLedger
+from model_export import export_models
+import wiki_paths
+
 # Paths - Updated for new datajson structure
-OUTPUT_BASE = os.path.join(os.environ.get("APPDATA", ""), "MoriaWikiGenerator", "output")
-SOURCE_DIR = os.path.join(OUTPUT_BASE, "datajson", "Moria", "Content", "Tech", "Data")
+OUTPUT_BASE = wiki_paths.get_output_dir()
+SOURCE_DIR = wiki_paths.get_data_dir()
 STRINGS_DIR = os.path.join(SOURCE_DIR, "StringTables")
 TRADEGOODS_FILE = os.path.join(SOURCE_DIR, "Economy", "DT_TradeGoods.json")
 RECIPES_FILE = os.path.join(SOURCE_DIR, "Items", "DT_ItemRecipes.json")
@@ -73,8 +79,7 @@ TAG_MAPPINGS = {
 
 def load_string_table(filepath):
     """Load a single string table file and return a key->value dictionary."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     string_map = {}
     exports = data.get("Exports", [])
@@ -105,8 +110,7 @@ def load_all_string_tables(strings_dir):
 
 def load_tradegoods_data(filepath):
     """Load DT_TradeGoods.json and return the list of trade good entries."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     tradegoods_list = []
     exports = data.get("Exports", [])
@@ -121,8 +125,7 @@ def load_tradegoods_data(filepath):
 
 def load_recipe_data(filepath):
     """Load DT_ItemRecipes.json and return a dictionary keyed by item name."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     recipes = {}
     exports = data.get("Exports", [])
@@ -482,6 +485,7 @@ def process_tradegoods(tradegoods_data, recipes_data, string_map):
     tradegood_models = []
 
     for tradegood_entry in tradegoods_data:
+        check_cancelled()
         tradegood_name = tradegood_entry.get("Name", "")
 
         # Get basic properties
@@ -538,49 +542,68 @@ def process_tradegoods(tradegoods_data, recipes_data, string_map):
 
 
 def write_wiki_files(tradegood_models, output_dir):
-    """Write wiki template files for each trade good."""
+    """Write wiki template files for each trade good whose inputs changed since the last run."""
     print(f"\nWriting wiki files to {output_dir}...")
 
     os.makedirs(output_dir, exist_ok=True)
+    ledger = InputLedger("tradegoods", __file__)
 
     for tradegood in tradegood_models:
-        wiki_content = generate_wiki_template(tradegood)
         filename = f"{tradegood['DisplayName']}.wiki"
         filepath = os.path.join(output_dir, filename)
+        if ledger.is_current(tradegood['DisplayName'], tradegood, filepath):
+            continue
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(wiki_content)
+        with generator_metrics.phase("render"):
+            wiki_content = generate_wiki_template(tradegood)
 
-    print(f"  Wrote {len(tradegood_models)} wiki files")
+        with generator_metrics.phase("write"):
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(wiki_content)
+            generator_metrics.count("files")
+        ledger.record()
+
+    ledger.save()
+    print(f"  Wrote {ledger.written} wiki files, {ledger.unchanged} unchanged")
 
 
 
 
 def main():
+    generator_metrics.begin("tradegoods")
     print("Loading data...")
 
     # Load string tables
-    print("Loading string tables...")
-    string_map = load_all_string_tables(STRINGS_DIR)
-    print(f"  Total strings: {len(string_map)}")
+    with generator_metrics.phase("strings"):
+        print("Loading string tables...")
+        string_map = load_all_string_tables(STRINGS_DIR)
+        print(f"  Total strings: {len(string_map)}")
 
     # Load trade goods data
-    print("Loading trade goods data...")
-    tradegoods_data = load_tradegoods_data(TRADEGOODS_FILE)
-    print(f"  Total trade goods: {len(tradegoods_data)}")
+    with generator_metrics.phase("load"):
+        print("Loading trade goods data...")
+        tradegoods_data = load_tradegoods_data(TRADEGOODS_FILE)
+        print(f"  Total trade goods: {len(tradegoods_data)}")
 
-    # Load recipes data
-    print("Loading recipes data...")
-    recipes_data = load_recipe_data(RECIPES_FILE)
-    print(f"  Total recipes: {len(recipes_data)}")
+        # Load recipes data
+        print("Loading recipes data...")
+        recipes_data = load_recipe_data(RECIPES_FILE)
+        print(f"  Total recipes: {len(recipes_data)}")
 
     # Process trade goods
-    tradegood_models = process_tradegoods(tradegoods_data, recipes_data, string_map)
+    with generator_metrics.phase("build"):
+        tradegood_models = process_tradegoods(tradegoods_data, recipes_data, string_map)
+        generator_metrics.count("entities", len(tradegood_models))
+
+    # Export models for structured data consumers, if enabled
+    with generator_metrics.phase("export"):
+        export_models("tradegoods", tradegood_models)
 
     # Write wiki files
     write_wiki_files(tradegood_models, OUTPUT_DIR)
 
     print("\nDone!")
+    generator_metrics.end()
 
 
 if __name__ == "__main__":
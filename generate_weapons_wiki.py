@@ -2,12 +2,20 @@ import json
 import os
 import re
 
+from cancellation import check_cancelled
+from datajson_cache import load_json
+import generator_metrics
+from input_ledger import InputLedger
+from model_export import open_model_exporter
+import wiki_paths
+
 # Paths - Updated for new datajson structure
-OUTPUT_BASE = os.path.join(os.environ.get("APPDATA", ""), "MoriaWikiGenerator", "output")
-SOURCE_DIR = os.path.join(OUTPUT_BASE, "datajson", "Moria", "Content", "Tech", "Data")
+OUTPUT_BASE = wiki_paths.get_output_dir()
+SOURCE_DIR = wiki_paths.get_data_dir()
 STRINGS_DIR = os.path.join(SOURCE_DIR, "StringTables")
 WEAPONS_FILE = os.path.join(SOURCE_DIR, "Items", "DT_Weapons.json")
 RECIPES_FILE = os.path.join(SOURCE_DIR, "Items", "DT_ItemRecipes.json")
+UNLOCK_OVERRIDES_FILE = "weapon_unlock_overrides.json"
 OUTPUT_DIR = os.path.join(OUTPUT_BASE, "wiki", "weapons")
 
 # Mapping from DLC path names to DLC titles
@@ -138,9 +146,8 @@ def load_unlock_overrides():
     }
 
     # Load overrides from JSON file
-    override_file = "weapon_unlock_overrides.json"
-    if os.path.exists(override_file):
-        with open(override_file, 'r', encoding='utf-8') as f:
+    if os.path.exists(UNLOCK_OVERRIDES_FILE):
+        with open(UNLOCK_OVERRIDES_FILE, 'r', encoding='utf-8') as f:
             overrides = json.load(f)
             for item_name, unlock_data in overrides.items():
                 if "campaign" in unlock_data:
@@ -223,8 +230,7 @@ UNLOCK_TYPE_DISPLAY = {
 
 def load_string_table(filepath):
     """Load a single string table file and return a key->value dictionary."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     string_map = {}
     exports = data.get("Exports", [])
@@ -257,8 +263,7 @@ def load_all_string_tables(strings_dir):
 
 def load_weapons_data(filepath):
     """Load DT_Weapons.json and return the list of weapon entries."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     weapons_list = []
     exports = data.get("Exports", [])
@@ -273,8 +278,7 @@ def load_weapons_data(filepath):
 
 def load_recipe_data(filepath):
     """Load DT_ItemRecipes.json and return a dictionary keyed by result item handle."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(filepath)
 
     recipe_map = {}
     exports = data.get("Exports", [])
@@ -683,7 +687,7 @@ def get_article(word):
     return "a"
 
 
-def generate_wiki_template(model):
+def generate_wiki_template(model, campaign_overrides, sandbox_overrides):
     """Generate MediaWiki template from the data model."""
 
     description = strip_rich_text(model["Description"])
@@ -698,8 +702,8 @@ def generate_wiki_template(model):
 
     # Build unlock lines
     campaign_unlock = "???"
-    if model["DisplayName"] in CAMPAIGN_UNLOCK_OVERRIDE:
-        campaign_unlock = CAMPAIGN_UNLOCK_OVERRIDE[model["DisplayName"]]
+    if model["DisplayName"] in campaign_overrides:
+        campaign_unlock = campaign_overrides[model["DisplayName"]]
     elif model["CampaignUnlockType"] == "CollectFragments":
         campaign_unlock = f"Collect {model['CampaignUnlockFragments']} fragments"
         if tier_int in CAMPAIGN_FRAGMENT_LOCATION:
@@ -710,8 +714,8 @@ def generate_wiki_template(model):
         campaign_unlock = get_unlock_display(model["CampaignUnlockType"])
 
     sandbox_unlock = "???"
-    if model["DisplayName"] in SANDBOX_UNLOCK_OVERRIDE:
-        sandbox_unlock = SANDBOX_UNLOCK_OVERRIDE[model["DisplayName"]]
+    if model["DisplayName"] in sandbox_overrides:
+        sandbox_unlock = sandbox_overrides[model["DisplayName"]]
     elif model["SandboxUnlockType"] == "CollectFragments":
         sandbox_unlock = f"Collect {model['SandboxUnlockFragments']} fragments"
         if tier_int in SANDBOX_FRAGMENT_LOCATION:
@@ -869,46 +873,74 @@ def sanitize_filename(name):
 
 
 def main():
+    generator_metrics.begin("weapons")
+
     # Create output directory
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     # Load data
-    print("Loading all string tables...")
-    string_map = load_all_string_tables(STRINGS_DIR)
-    print(f"Loaded {len(string_map)} total strings")
-
-    print("Loading weapons data...")
-    weapons_list = load_weapons_data(WEAPONS_FILE)
-    print(f"Loaded {len(weapons_list)} weapon entries")
-
-    print("Loading recipe data...")
-    recipe_map = load_recipe_data(RECIPES_FILE)
-    print(f"Loaded {len(recipe_map)} recipes")
+    with generator_metrics.phase("strings"):
+        print("Loading all string tables...")
+        string_map = load_all_string_tables(STRINGS_DIR)
+        print(f"Loaded {len(string_map)} total strings")
+
+    with generator_metrics.phase("load"):
+        print("Loading weapons data...")
+        weapons_list = load_weapons_data(WEAPONS_FILE)
+        print(f"Loaded {len(weapons_list)} weapon entries")
+
+        print("Loading recipe data...")
+        recipe_map = load_recipe_data(RECIPES_FILE)
+        print(f"Loaded {len(recipe_map)} recipes")
+
+    # Export models for structured data consumers, if enabled
+    exporter = open_model_exporter("weapons")
+    ledger = InputLedger("weapons", __file__)
+    # Overrides from weapon_unlock_overrides.json are applied while rendering
+    campaign_overrides = ledger.track("campaign_overrides", CAMPAIGN_UNLOCK_OVERRIDE, UNLOCK_OVERRIDES_FILE)
+    sandbox_overrides = ledger.track("sandbox_overrides", SANDBOX_UNLOCK_OVERRIDE, UNLOCK_OVERRIDES_FILE)
 
     # Process each weapon entry
     count = 0
 
     for weapon_entry in weapons_list:
-        model = extract_weapon_model(weapon_entry, string_map, recipe_map)
+        check_cancelled()
+        with generator_metrics.phase("build"):
+            model = extract_weapon_model(weapon_entry, string_map, recipe_map)
 
         # Skip if no display name
         if not model.get("DisplayName"):
             continue
 
-        # Generate wiki template
-        wiki_content = generate_wiki_template(model)
+        generator_metrics.count("entities")
+        with generator_metrics.phase("export"):
+            exporter.add(model["DisplayName"], model)
 
-        # Write to file using DisplayName as filename
+        # Write to file using DisplayName as filename, unless its inputs are unchanged
         filename = sanitize_filename(model["DisplayName"]) + ".wiki"
         filepath = os.path.join(OUTPUT_DIR, filename)
+        if ledger.is_current(filename[:-5], model, filepath):
+            continue
+
+        # Generate wiki template
+        with generator_metrics.phase("render"):
+            wiki_content = generate_wiki_template(model, campaign_overrides, sandbox_overrides)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(wiki_content)
+        with generator_metrics.phase("write"):
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(wiki_content)
+            generator_metrics.count("files")
+        ledger.record()
 
         count += 1
         print(f"Generated: {filename}")
 
-    print(f"\nDone! Generated {count} wiki templates in {OUTPUT_DIR}")
+    with generator_metrics.phase("export"):
+        exporter.close()
+    ledger.save()
+
+    print(f"\nDone! Generated {count} wiki templates in {OUTPUT_DIR} ({ledger.unchanged} unchanged)")
+    generator_metrics.end()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,166 @@
+"""Phase timings and entity counts for generator runs, with a persisted history.
+
+A generator calls begin() at the start of main(), wraps each stage in
+phase(), counts what it built and wrote with count(), and calls end() when it
+finishes:
+
+    generator_metrics.begin("items")
+    with generator_metrics.phase("strings"):
+        string_map = load_all_string_tables(STRINGS_DIR)
+    ...
+    generator_metrics.end()
+
+Phases accumulate, so a phase entered once per page (render, write) reports
+its total. end() prints the run report as a single line starting with
+REPORT_PREFIX. Generators run as child processes, so the UI reads their
+reports from the output it already captures, using parse_report_line().
+
+Reports are appended to a JSON Lines history file, so a run can be compared
+with earlier ones after a game patch or code change.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+
+REPORT_PREFIX = "@@generator-metrics "
+
+# Display order of the standard phases; a generator uses the ones that apply
+PHASES = ("strings", "load", "build", "export", "render", "write", "crossref")
+
+# Runs kept in the history file
+HISTORY_MAX_RUNS = 1000
+
+
+class GeneratorRun:
+    """Timings and counts collected during one generator run."""
+
+    def __init__(self, generator):
+        self.generator = generator
+        self.started_at = datetime.now()
+        self.start_time = time.perf_counter()
+        self.phases = {}  # {phase name: seconds}
+        self.counts = {}  # {count name: number}
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block and add it to the named phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name, amount=1):
+        """Add to a named count, e.g. 'entities' or 'files'."""
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def to_dict(self):
+        """Return the run report as a JSON-serializable dict."""
+        total = time.perf_counter() - self.start_time
+        files = self.counts.get("files", 0)
+        return {
+            "generator": self.generator,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "total_seconds": round(total, 3),
+            "phases": {name: round(seconds, 3) for name, seconds in self.phases.items()},
+            "counts": dict(self.counts),
+            "files_per_second": round(files / total, 1) if total > 0 else 0.0,
+        }
+
+
+_current = None
+
+
+def begin(generator):
+    """Start collecting metrics for a generator run."""
+    global _current
+    _current = GeneratorRun(generator)
+    return _current
+
+
+def phase(name):
+    """Time a block as part of the current run's named phase (no-op outside a run)."""
+    if _current is None:
+        return nullcontext()
+    return _current.phase(name)
+
+
+def count(name, amount=1):
+    """Add to a count of the current run."""
+    if _current is not None:
+        _current.count(name, amount)
+
+
+def end():
+    """Finish the current run and print its report line."""
+    global _current
+    if _current is None:
+        return None
+    report = _current.to_dict()
+    _current = None
+    print(REPORT_PREFIX + json.dumps(report))
+    return report
+
+
+def parse_report_line(line):
+    """Return the report from a generator output line, or None for ordinary output."""
+    if not line.startswith(REPORT_PREFIX):
+        return None
+    try:
+        return json.loads(line[len(REPORT_PREFIX):])
+    except ValueError:
+        return None
+
+
+def format_report(report):
+    """Return a one-line summary of a run report for the output log."""
+    phases = report.get("phases", {})
+    ordered = [name for name in PHASES if name in phases] + [name for name in phases if name not in PHASES]
+    text = ", ".join(f"{name} {phases[name]:.2f}s" for name in ordered)
+    counts = report.get("counts", {})
+    unchanged = f" ({counts['unchanged']} unchanged)" if counts.get("unchanged") else ""
+    return (
+        f"{text} | {counts.get('entities', 0)} entities, {counts.get('files', 0)} files{unchanged}, "
+        f"{report.get('files_per_second', 0)} files/s in {report.get('total_seconds', 0):.2f}s"
+    )
+
+
+_history_lock = threading.Lock()
+
+
+def append_history(history_file, report, max_runs=HISTORY_MAX_RUNS):
+    """Append a run report to the history file, dropping the oldest runs over max_runs."""
+    with _history_lock:
+        os.makedirs(os.path.dirname(history_file), exist_ok=True)
+        with open(history_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(report) + "\n")
+
+        # Trim occasionally rather than rewriting the file on every run
+        if os.path.getsize(history_file) > max_runs * 400:
+            runs = load_history(history_file)
+            if len(runs) > max_runs:
+                temp_path = history_file + ".tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    for run in runs[-max_runs:]:
+                        f.write(json.dumps(run) + "\n")
+                os.replace(temp_path, history_file)
+
+
+def load_history(history_file):
+    """Return every run report in the history file, oldest first."""
+    runs = []
+    try:
+        with open(history_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    runs.append(json.loads(line))
+                except ValueError:
+                    continue  # Line cut short by a crash; skip it
+    except FileNotFoundError:
+        pass
+    return runs
@@ -0,0 +1,928 @@
+"""Generator and game file import orchestration shared by the UI and the CLI.
+
+This module runs the wiki generators (as child processes, or embedded when
+frozen), schedules them with their dependencies, and imports the game files
+with retoc and UAssetGUI. None of it touches Tk: progress is reported through
+callbacks that are safe to call from a worker thread, so the same code drives
+the window in wiki_generator_ui and the headless moria-wiki command.
+
+log_callback(message, tag=None) receives each log line; tag is one of "info",
+"success", "warning" or "error". Generators call it with the message only.
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cancellation
+import datajson_cache
+import generator_metrics
+import generator_scheduler
+from import_metrics import ImportMetrics, format_duration
+from wiki_paths import get_config_dir
+
+
+# Generators shown in the UI and run by "all", as (display name, type).
+# Cross-reference runs after them and is not listed here.
+GENERATORS = [
+    ("Armor", "armor"),
+    ("Brews", "brews"),
+    ("Constructions", "constructions"),
+    ("Consumables", "consumables"),
+    ("Items", "items"),
+    ("Ores", "ores"),
+    ("Runes", "runes"),
+    ("Storage", "storage"),
+    ("Tools", "tools"),
+    ("Trade Goods", "tradegoods"),
+    ("Weapons", "weapons"),
+]
+
+IMPORT_REPORTS_DIR_NAME = "import_reports"
+GENERATOR_HISTORY_FILE = "generator_runs.jsonl"
+
+# Minimum seconds between progress updates posted from worker threads
+PROGRESS_UPDATE_INTERVAL = 0.25
+
+
+# =============================================================================
+# EMBEDDED GENERATOR FUNCTIONS
+# =============================================================================
+
+def get_generator_function(gen_type):
+    """Get the generator function for the given type."""
+    generators = {
+        "items": generate_items_wiki,
+        "consumables": generate_consumables_wiki,
+        "constructions": generate_constructions_wiki,
+        "weapons": generate_weapons_wiki,
+        "armor": generate_armor_wiki,
+        "tools": generate_tools_wiki,
+        "ores": generate_ores_wiki,
+        "brews": generate_brews_wiki,
+        "runes": generate_runes_wiki,
+        "storage": generate_storage_wiki,
+        "tradegoods": generate_tradegoods_wiki,
+        "crossreference": generate_crossreference_wiki,
+    }
+    return generators.get(gen_type)
+
+
+# Data tables each generator reads, relative to datajson\Moria\Content\Tech\Data.
+# Every generator also reads all of StringTables\. Cross-reference reads the other
+# generators' wiki output instead of data tables.
+GENERATOR_INPUTS = {
+    "items": ["Items/DT_Items.json", "Items/DT_ItemRecipes.json"],
+    "consumables": ["Items/DT_Consumables.json", "Items/DT_ItemRecipes.json"],
+    "constructions": ["Building/DT_Constructions.json", "Building/DT_ConstructionRecipes.json",
+                      "DT_Entitlements.json", "Items/DT_Items.json"],
+    "weapons": ["Items/DT_Weapons.json", "Items/DT_ItemRecipes.json"],
+    "armor": ["Items/DT_Armor.json", "Items/DT_ItemRecipes.json"],
+    "tools": ["Items/DT_Tools.json", "Items/DT_ThrowLights.json", "Items/DT_ItemRecipes.json"],
+    "ores": ["Items/DT_Ores.json"],
+    "brews": ["Items/DT_Brews.json", "Items/DT_ItemRecipes.json", "Items/DT_ThresholdEffects.json"],
+    "runes": ["Items/DT_Runes.json"],
+    "storage": ["Items/DT_Storage.json", "Items/DT_ItemRecipes.json"],
+    "tradegoods": ["Economy/DT_TradeGoods.json", "Items/DT_ItemRecipes.json"],
+}
+
+# Generators whose wiki output each generator reads, so it must run after them.
+# Cross-reference reads its SEARCH_DIRS and updates the pages in its TARGET_DIRS.
+GENERATOR_DEPENDENCIES = {
+    "crossreference": ["weapons", "tools", "constructions", "brews", "armor", "tradegoods",
+                       "consumables", "items", "ores"],
+}
+
+# Unlock override files each generator reads from the generator script folder
+GENERATOR_OVERRIDE_FILES = {
+    "items": ["item_unlock_overrides.json"],
+    "consumables": ["consumable_unlock_overrides.json"],
+    "constructions": ["construction_unlock_overrides.json"],
+    "weapons": ["weapon_unlock_overrides.json"],
+    "ores": ["ore_unlock_overrides.json"],
+}
+
+# Path of the generator data directory inside the datajson output
+DATA_TABLE_PREFIX = "Moria/Content/Tech/Data/"
+
+
+def verify_trader_unlocks(output_path, log_callback):
+    """Verify that all trader items have correct unlock sections."""
+    log_callback("Verifying trader unlock sections...")
+
+    # List of items that should have trader unlocks
+    trader_items = [
+        "Northern Wool", "Shell", "Coastal Marble", "Elven Silk",
+        "Elanor Seed", "Niphredil Seed", "Fireclay Brick", "Sea Wax",
+        "Ithildin Ingot", "Pumpkin Seed", "Sweetroot Seed",
+        "Salt-cured Fish", "Saffron", "Southern Oil", "Whale Tallow",
+        "Thanazutsam", "Pumice", "Volcanic Glass", "Red Sandstone",
+        "Drakhbarzin", "Crimson Fire Brazier", "White Tree Replica",
+        "Hanging Cookware"
+    ]
+
+    found_count = 0
+    missing_count = 0
+
+    # Search through output directories
+    token = cancellation.get_active_token()
+    for root, dirs, files in os.walk(output_path):
+        if token is not None and token.cancelled:
+            log_callback("Verification cancelled")
+            return False
+        for filename in files:
+            if filename.endswith('.wiki'):
+                item_name = filename[:-5]  # Remove .wiki extension
+                if item_name in trader_items or item_name.rstrip() in trader_items:
+                    filepath = os.path.join(root, filename)
+                    with open(filepath, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                    if "== Unlock ==" in content and "Trader" in content:
+                        found_count += 1
+                        log_callback(f"  OK: {item_name}")
+                    else:
+                        missing_count += 1
+                        log_callback(f"  MISSING: {item_name}")
+
+    log_callback(f"\nResults: {found_count} found, {missing_count} missing")
+    return missing_count == 0
+
+
+# =============================================================================
+# STANDALONE SCRIPT RUNNER
+# =============================================================================
+
+def _get_script_dir():
+    """Get the directory containing the standalone generator scripts."""
+    if getattr(sys, 'frozen', False):
+        # Running as compiled executable - check PyInstaller's temp directory first
+        # For onefile builds, files are extracted to _MEIPASS
+        base_path = getattr(sys, '_MEIPASS', os.path.dirname(sys.executable))
+        # Scripts are in the 'generators' subdirectory within the bundle
+        script_dir = os.path.join(base_path, 'generators')
+        if not os.path.exists(script_dir):
+            # Fallback to executable directory (for onedir builds or if placed alongside exe)
+            script_dir = os.path.dirname(sys.executable)
+    else:
+        # Running as script
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+    return script_dir
+
+
+def _record_generator_metrics(report, log_callback):
+    """Log a generator's timing report and add it to the run history."""
+    log_callback(f"  Timings: {generator_metrics.format_report(report)}")
+    try:
+        generator_metrics.append_history(os.path.join(get_config_dir(), GENERATOR_HISTORY_FILE), report)
+    except OSError as e:
+        log_callback(f"  Could not save run history: {e}")
+
+
+def _log_generator_output(line, log_callback):
+    """Log one line of generator output, recording it instead if it is a timing report."""
+    report = generator_metrics.parse_report_line(line)
+    if report is not None:
+        _record_generator_metrics(report, log_callback)
+    else:
+        log_callback(line)
+
+
+def _run_standalone_script(script_name, log_callback):
+    """Run a standalone generator script and capture its output.
+
+    The active cancellation token, if any, is passed to the script through its
+    environment so it can stop between entities when the job is cancelled.
+    """
+    # Check if running as frozen executable
+    if getattr(sys, 'frozen', False):
+        # When frozen, import and run the generator module directly
+        return _run_embedded_generator(script_name, log_callback)
+
+    # Running as normal Python script - use subprocess
+    import subprocess
+
+    script_dir = _get_script_dir()
+    script_path = os.path.join(script_dir, script_name)
+
+    if not os.path.exists(script_path):
+        log_callback(f"Error: Script not found: {script_path}")
+        return False
+
+    token = cancellation.get_active_token()
+    if token is not None and token.cancelled:
+        log_callback(f"  {script_name} skipped (cancelled)")
+        return False
+
+    log_callback(f"Running {script_name}...")
+
+    try:
+        # Run the script and capture output in real-time
+        process = subprocess.Popen(
+            [sys.executable, script_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            cwd=script_dir,
+            bufsize=1,
+            env=token.child_env() if token is not None else None
+        )
+        if token is not None:
+            token.register_process(process)
+
+        try:
+            # Read output line by line
+            for line in process.stdout:
+                _log_generator_output(line.rstrip(), log_callback)
+
+            process.wait()
+        finally:
+            if token is not None:
+                token.unregister_process(process)
+
+        if process.returncode == 0:
+            log_callback(f"  {script_name} completed successfully")
+            return True
+        elif token is not None and token.cancelled:
+            log_callback(f"  {script_name} cancelled")
+            return False
+        else:
+            log_callback(f"  {script_name} failed with return code {process.returncode}")
+            return False
+
+    except Exception as e:
+        log_callback(f"Error running {script_name}: {str(e)}")
+        return False
+
+
+def _run_embedded_generator(script_name, log_callback):
+    """Import and run an embedded generator module when running as frozen executable."""
+    import importlib
+    import io
+    from contextlib import redirect_stdout
+
+    # Convert script name to module name (e.g., "generate_armor_wiki.py" -> "generate_armor_wiki")
+    module_name = script_name.replace('.py', '')
+
+    token = cancellation.get_active_token()
+    if token is not None and token.cancelled:
+        log_callback(f"  {script_name} skipped (cancelled)")
+        return False
+
+    log_callback(f"Running {script_name} (embedded)...")
+
+    # Capture stdout to display in log
+    output_buffer = io.StringIO()
+
+    try:
+        # Import the embedded module
+        module = importlib.import_module(module_name)
+
+        # Run the module's main function with captured output
+        with redirect_stdout(output_buffer):
+            if hasattr(module, 'main'):
+                module.main()
+            else:
+                log_callback(f"Warning: {module_name} has no main() function")
+                return False
+
+        # Log the captured output
+        output = output_buffer.getvalue()
+        for line in output.splitlines():
+            _log_generator_output(line, log_callback)
+
+        log_callback(f"  {script_name} completed successfully")
+        return True
+
+    except cancellation.OperationCancelled:
+        # The generator stopped between entities; show what it printed so far
+        for line in output_buffer.getvalue().splitlines():
+            log_callback(line)
+        log_callback(f"  {script_name} cancelled")
+        return False
+
+    except Exception as e:
+        log_callback(f"Error running {script_name}: {str(e)}")
+        import traceback
+        log_callback(traceback.format_exc())
+        return False
+
+
+# =============================================================================
+# GENERATOR FUNCTIONS - Call standalone scripts
+# =============================================================================
+
+# Standalone script of each generator type
+GENERATOR_SCRIPTS = {
+    "items": "generate_items_wiki.py",
+    "consumables": "generate_consumables_wiki.py",
+    "constructions": "generate_constructions_wiki.py",
+    "weapons": "generate_weapons_wiki.py",
+    "armor": "generate_armor_wiki.py",
+    "tools": "generate_tools_wiki.py",
+    "ores": "generate_ore_wiki.py",
+    "brews": "generate_brews_wiki.py",
+    "runes": "generate_runes_wiki.py",
+    "storage": "generate_storage_wiki.py",
+    "tradegoods": "generate_tradegoods_wiki.py",
+    "crossreference": "generate_crossreference_wiki.py",
+}
+
+
+def get_generator_script(gen_type):
+    """Return the path of a generator's standalone script."""
+    return os.path.join(_get_script_dir(), GENERATOR_SCRIPTS[gen_type])
+
+
+def get_override_files(gen_type):
+    """Return the paths of the unlock override files a generator reads."""
+    # Scripts run in their own folder; embedded generators use the working folder
+    folder = os.getcwd() if getattr(sys, 'frozen', False) else _get_script_dir()
+    return [os.path.join(folder, name) for name in GENERATOR_OVERRIDE_FILES.get(gen_type, ())]
+
+
+def generate_items_wiki(source_path, output_path, log_callback):
+    """Generate wiki pages for items using standalone script."""
+    return _run_standalone_script("generate_items_wiki.py", log_callback)
+
+
+def generate_consumables_wiki(source_path, output_path, log_callback):
+    """Generate wiki pages for consumables using standalone script."""
+    return _run_standalone_script("generate_consumables_wiki.py", log_callback)
+
+
+def generate_constructions_wiki(source_path, output_path, log_callback):
+    """Generate wiki pages for constructions using standalone script."""
+    return _run_standalone_script("generate_constructions_wiki.py", log_callback)
+
+
+def generate_weapons_wiki(source_path, output_path, log_callback):
+    """Generate wiki pages for weapons using standalone script."""
+    return _run_standalone_script("generate_weapons_wiki.py", log_callback)
+
+
+def generate_armor_wiki(source_path, output_path, log_callback):
+    """Generate wiki pages for armor using standalone script."""
+    return _run_standalone_script("generate_armor_wiki.py", log_callback)
+
+
+def generate_tools_wiki(source_path, output_path, log_callback):
+    """Generate wiki pages for tools using standalone script."""
+    return _run_standalone_script("generate_tools_wiki.py", log_callback)
+
+
+def generate_ores_wiki(source_path, output_path, log_callback):
+    """Generate wiki pages for ores using standalone script."""
+    return _run_standalone_script("generate_ore_wiki.py", log_callback)
+
+
+def generate_brews_wiki(source_path, output_path, log_callback):
+    """Generate wiki pages for brews using standalone script."""
+    return _run_standalone_script("generate_brews_wiki.py", log_callback)
+
+
+def generate_runes_wiki(source_path, output_path, log_callback):
+    """Generate wiki pages for runes using standalone script."""
+    return _run_standalone_script("generate_runes_wiki.py", log_callback)
+
+
+def generate_storage_wiki(source_path, output_path, log_callback):
+    """Generate wiki pages for storage using standalone script."""
+    return _run_standalone_script("generate_storage_wiki.py", log_callback)
+
+
+def generate_tradegoods_wiki(source_path, output_path, log_callback):
+    """Generate wiki pages for trade goods using standalone script."""
+    return _run_standalone_script("generate_tradegoods_wiki.py", log_callback)
+
+
+def generate_crossreference_wiki(source_path, output_path, log_callback):
+    """Generate cross-reference data for wiki pages using standalone script."""
+    return _run_standalone_script("generate_crossreference_wiki.py", log_callback)
+
+
+# =============================================================================
+# IMPORT PIPELINE - Run generators while conversion is still in progress
+# =============================================================================
+
+def data_table_key(json_rel_path):
+    """Convert a path relative to datajson into a GENERATOR_INPUTS key, or None."""
+    rel_path = json_rel_path.replace("\\", "/")
+    if rel_path.startswith(DATA_TABLE_PREFIX):
+        return rel_path[len(DATA_TABLE_PREFIX):]
+    return None
+
+
+def pipeline_priority(json_rel_path):
+    """Sort key that converts string tables first, then generator inputs, then the rest."""
+    key = data_table_key(json_rel_path)
+    if key is None:
+        return 2
+    if key.startswith("StringTables/"):
+        return 0
+    if any(key in inputs for inputs in GENERATOR_INPUTS.values()):
+        return 1
+    return 2
+
+
+class GeneratorPipeline:
+    """Schedules each generator as soon as the data tables it reads have been converted.
+
+    The import loop reports every converted file through mark_converted(). Ready
+    generators run one at a time on a background worker, overlapping with the
+    remaining conversion. finish() runs anything still waiting (inputs that the
+    game no longer ships), then cross-reference once all others are done. Once
+    cancel_token is cancelled, generators that have not started are skipped.
+    """
+
+    def __init__(self, generators, source_path, output_path, log_callback, cancel_token=None):
+        self.pending = [(name, gen_type) for name, gen_type in generators if gen_type in GENERATOR_INPUTS]
+        self.source_path = source_path
+        self.output_path = output_path
+        self.log_callback = log_callback
+        self.cancel_token = cancel_token
+        self.expected = set()
+        self.converted = set()
+        self.results = {}
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.futures = []
+
+    def set_expected(self, json_rel_paths):
+        """Record the data tables this import will produce."""
+        self.expected = {key for key in map(data_table_key, json_rel_paths) if key}
+
+    def _inputs_ready(self, gen_type):
+        """Check whether every expected input of a generator has been converted."""
+        string_tables = {key for key in self.expected if key.startswith("StringTables/")}
+        needed = (set(GENERATOR_INPUTS[gen_type]) & self.expected) | string_tables
+        return needed <= self.converted
+
+    def mark_converted(self, json_rel_path):
+        """Record a converted file and start any generators whose inputs are now complete."""
+        key = data_table_key(json_rel_path)
+        if key:
+            self.converted.add(key)
+            self._schedule(ready_only=True)
+
+    def _schedule(self, ready_only):
+        """Submit pending generators to the worker."""
+        still_pending = []
+        for name, gen_type in self.pending:
+            if ready_only and not self._inputs_ready(gen_type):
+                still_pending.append((name, gen_type))
+                continue
+            self.log_callback(f"  [pipeline] Inputs ready, starting {name}")
+            self.futures.append(self.executor.submit(self._run, name, gen_type))
+        self.pending = still_pending
+
+    def _run(self, name, gen_type):
+        """Run one generator and record its result."""
+        if self.cancel_token is not None and self.cancel_token.cancelled:
+            self.results[gen_type] = False
+            return
+        try:
+            generator_func = get_generator_function(gen_type)
+            self.results[gen_type] = generator_func(self.source_path, self.output_path, self.log_callback)
+        except Exception as e:
+            self.log_callback(f"Error running {name}: {str(e)}")
+            self.results[gen_type] = False
+
+    def finish(self):
+        """Run remaining generators, wait for all of them, then run cross-reference.
+
+        Returns:
+            dict: Maps generator type to True/False success
+        """
+        self._schedule(ready_only=False)
+        self.executor.shutdown(wait=True)
+        if self.cancel_token is not None and self.cancel_token.cancelled:
+            return self.results
+        self.log_callback("  [pipeline] Starting Cross-Reference")
+        self._run("Cross-Reference", "crossreference")
+        return self.results
+
+
+# =============================================================================
+# RUN GENERATORS - One, several or all, through the dependency scheduler
+# =============================================================================
+
+def generator_names():
+    """Return {gen_type: display name} for every generator, cross-reference last."""
+    names = dict((gen_type, name) for name, gen_type in GENERATORS)
+    names["crossreference"] = "Cross-Reference"
+    return names
+
+
+def last_run_seconds():
+    """Return {gen_type: total seconds} of each generator's most recent recorded run."""
+    runs = generator_metrics.load_history(os.path.join(get_config_dir(), GENERATOR_HISTORY_FILE))
+    return {run["generator"]: run.get("total_seconds", 0.0) for run in runs if "generator" in run}
+
+
+def run_generator_batch(gen_types, source_path, output_path, log_callback, workers,
+                        cancel_token=None, status_callback=None, event_callback=None):
+    """Run generators through the dependency scheduler and log a summary.
+
+    Each generator's output is collected and logged as one block when it
+    finishes, so the logs of generators running side by side don't interleave.
+
+    Args:
+        gen_types: Generator types to run; cross-reference runs after the
+            others in the list
+        source_path: Source data directory passed to the generators
+        output_path: Output directory passed to the generators
+        log_callback: Receives (message, tag) log lines
+        workers: Maximum number of generators running at once
+        cancel_token: Once cancelled, generators that have not started are skipped
+        status_callback: Called with a short status text as generators start and finish
+        event_callback: Called with a dict for each generator that starts
+            ({"event": "start", ...}) and finishes ({"event": "finish", ...})
+
+    Returns:
+        dict: Maps each gen_type to True/False, or None if it was skipped
+    """
+    all_names = generator_names()
+    names = {gen_type: all_names.get(gen_type, gen_type) for gen_type in gen_types}
+    workers = max(1, min(workers, len(names)))
+
+    running = []
+    lock = threading.Lock()
+
+    def show_running():
+        if status_callback:
+            with lock:
+                text = ", ".join(running)
+            status_callback(f"Running {text}..." if text else "Finishing...")
+
+    def run_one(gen_type):
+        name = names[gen_type]
+        generator_func = get_generator_function(gen_type)
+        if generator_func is None:
+            log_callback(f"Skipping {name}: not yet implemented", "warning")
+            return False
+
+        with lock:
+            running.append(name)
+        show_running()
+        log_callback(f"  Started {name}", "info")
+        if event_callback:
+            event_callback({"event": "start", "generator": gen_type})
+        lines = []
+        start = time.perf_counter()
+        try:
+            success = generator_func(source_path, output_path, lines.append)
+        except Exception as e:
+            lines.append(f"Error running {name}: {str(e)}")
+            success = False
+        finally:
+            with lock:
+                running.remove(name)
+            show_running()
+
+        # Merge this generator's output into the log as one block
+        with lock:
+            log_callback(f"\n--- {name} ---", "info")
+            for line in lines:
+                log_callback(line)
+            if not success:
+                if cancel_token is not None and cancel_token.cancelled:
+                    log_callback(f"{name} cancelled", "warning")
+                else:
+                    log_callback(f"{name} finished with errors", "error")
+        if event_callback:
+            event_callback({
+                "event": "finish", "generator": gen_type, "success": bool(success),
+                "seconds": round(time.perf_counter() - start, 3),
+            })
+        return success
+
+    log_callback(f"Running up to {workers} generators at once", "info")
+    start_time = time.perf_counter()
+    try:
+        results = generator_scheduler.run_generators(
+            list(names), GENERATOR_DEPENDENCIES, run_one, workers,
+            cancel_token=cancel_token, durations=last_run_seconds()
+        )
+    except Exception as e:
+        log_callback(f"Error running generators: {str(e)}", "error")
+        results = {}
+    elapsed = time.perf_counter() - start_time
+
+    # Summary
+    success_count = sum(1 for result in results.values() if result)
+    error_count = sum(1 for result in results.values() if result is False)
+    log_callback(f"\n{'='*60}", "info")
+    if cancel_token is not None and cancel_token.cancelled:
+        log_callback(f"Cancelled: {success_count} successful, {error_count} errors", "warning")
+    else:
+        log_callback(
+            f"Completed in {format_duration(elapsed)}: {success_count} successful, {error_count} errors",
+            "success" if error_count == 0 else "warning"
+        )
+    return results
+
+
+# =============================================================================
+# GAME FILE IMPORT - retoc + UAssetGUI, optionally pipelined with generators
+# =============================================================================
+
+def write_import_report(metrics, log_callback):
+    """Write the import run report and log a timing summary.
+
+    Returns:
+        dict: The report, or None if the import never got past validation
+    """
+    report = metrics.to_dict()
+    if not report["phases"]:
+        return None
+
+    phase_text = ", ".join(f"{name} {format_duration(seconds)}" for name, seconds in report["phases"].items())
+    log_callback(f"  Timings: {phase_text}", "info")
+    if report["failures"]:
+        log_callback(f"  {len(report['failures'])} files failed to convert:", "warning")
+        for failure in report["failures"][:10]:
+            log_callback(f"    {failure['file']} ({failure['error']})", "warning")
+
+    try:
+        report_path = metrics.write_report(os.path.join(get_config_dir(), IMPORT_REPORTS_DIR_NAME))
+        log_callback(f"  Run report: {report_path}", "info")
+    except OSError as e:
+        log_callback(f"Error writing import report: {str(e)}", "error")
+    return report
+
+
+def import_game_files(game_path, source_path, output_path, utilities_path, log_callback, cancel_token,
+                      pipeline_generators=False, status_callback=None, progress_callback=None):
+    """Extract the game files with retoc and convert them to JSON with UAssetGUI.
+
+    Args:
+        game_path: Game installation folder
+        source_path: Source data directory passed to pipelined generators
+        output_path: Output folder; retoc\ and datajson\ are written under it
+        utilities_path: Folder holding retoc.exe and UAssetGUI.exe
+        log_callback: Receives (message, tag) log lines
+        cancel_token: CancellationToken; retoc and UAssetGUI are registered with it
+        pipeline_generators: Start each generator as soon as its data tables
+            are converted, and cross-reference at the end
+        status_callback: Called with a short status text at each step
+        progress_callback: Called with (text, done, total) during conversion
+
+    Returns:
+        tuple: (success, metrics) where metrics is the ImportMetrics of the run
+    """
+    import shutil
+    import subprocess
+
+    def status(text):
+        if status_callback:
+            status_callback(text)
+
+    def progress(text, done, total):
+        if progress_callback:
+            progress_callback(text, done, total)
+
+    metrics = ImportMetrics()
+    try:
+        # Validate game path
+        if not game_path:
+            log_callback("Error: Game installation path not configured", "error")
+            return False, metrics
+
+        # Build paths
+        paks_path = os.path.join(game_path, "Moria", "Content", "Paks")
+        retoc_output = os.path.join(output_path, "retoc")
+        datajson_output = os.path.join(output_path, "datajson")
+        retoc_exe = os.path.join(utilities_path, "retoc.exe")
+        uassetgui_exe = os.path.join(utilities_path, "UAssetGUI.exe")
+
+        # Validate paths
+        if not os.path.exists(paks_path):
+            log_callback(f"Error: Game Paks folder not found: {paks_path}", "error")
+            return False, metrics
+
+        if not os.path.exists(retoc_exe):
+            log_callback(f"Error: retoc.exe not found: {retoc_exe}", "error")
+            return False, metrics
+
+        if not os.path.exists(uassetgui_exe):
+            log_callback(f"Error: UAssetGUI.exe not found: {uassetgui_exe}", "error")
+            return False, metrics
+
+        # Create output directories
+        # Note: retoc needs to create its output directory itself, so remove if exists
+        if os.path.exists(retoc_output):
+            log_callback(f"  Removing existing retoc output: {retoc_output}", "info")
+            shutil.rmtree(retoc_output)
+        os.makedirs(datajson_output, exist_ok=True)
+
+        # Step 1: Run retoc.exe
+        log_callback("\nStep 1: Extracting game files with retoc...", "info")
+        log_callback(f"  Input: {paks_path}", "info")
+        log_callback(f"  Output: {retoc_output}", "info")
+        status("Running retoc.exe...")
+
+        # Ensure retoc output directory exists
+        os.makedirs(retoc_output, exist_ok=True)
+        metrics.begin_phase("retoc")
+
+        # Build command as list (subprocess handles quoting automatically)
+        retoc_cmd = [retoc_exe, "to-legacy", "--version", "UE4_27", paks_path, retoc_output]
+
+        # Display command with quotes for clarity
+        display_cmd = f'"{retoc_exe}" to-legacy --version UE4_27 "{paks_path}" "{retoc_output}"'
+        log_callback(f"  Command: {display_cmd}", "info")
+
+        try:
+            process = subprocess.Popen(
+                retoc_cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+            )
+            cancel_token.register_process(process, cooperative=False)
+
+            try:
+                # Stream output
+                for line in process.stdout:
+                    line = line.rstrip()
+                    if line:
+                        log_callback(f"  {line}")
+
+                process.wait()
+            finally:
+                cancel_token.unregister_process(process)
+
+            if cancel_token.cancelled:
+                metrics.cancelled = True
+                log_callback("\nImport cancelled during extraction", "warning")
+                return False, metrics
+
+            if process.returncode != 0:
+                log_callback(f"Error: retoc.exe exited with code {process.returncode}", "error")
+                return False, metrics
+
+            log_callback("  retoc.exe completed successfully", "success")
+
+        except Exception as e:
+            log_callback(f"Error running retoc.exe: {str(e)}", "error")
+            return False, metrics
+
+        # Step 2: Run UAssetGUI to convert each .uasset file to JSON
+        # UAssetGUI syntax: UAssetGUI tojson <source> <destination> <engine version>
+        log_callback("\nStep 2: Converting to JSON with UAssetGUI...", "info")
+        log_callback(f"  Input: {retoc_output}", "info")
+        log_callback(f"  Output: {datajson_output}", "info")
+        status("Running UAssetGUI...")
+
+        # Find all .uasset files in retoc output
+        metrics.begin_phase("scan")
+        uasset_files = []
+        for root_dir, dirs, files in os.walk(retoc_output):
+            for file in files:
+                if file.endswith(".uasset"):
+                    uasset_files.append(os.path.join(root_dir, file))
+
+        log_callback(f"  Found {len(uasset_files)} .uasset files to convert", "info")
+
+        # Optionally start generators as soon as their data tables are converted
+        pipeline = None
+        if pipeline_generators:
+            uasset_files.sort(key=lambda path: pipeline_priority(os.path.relpath(path, retoc_output)))
+            pipeline = GeneratorPipeline(GENERATORS, source_path, output_path, log_callback, cancel_token)
+            pipeline.set_expected(
+                os.path.relpath(path, retoc_output).replace(".uasset", ".json") for path in uasset_files
+            )
+            log_callback("  Pipelined generation enabled", "info")
+
+        # Size each asset with its .uexp payload for throughput reporting
+        file_sizes = []
+        for uasset_file in uasset_files:
+            size = os.path.getsize(uasset_file)
+            uexp_file = uasset_file[:-len(".uasset")] + ".uexp"
+            if os.path.exists(uexp_file):
+                size += os.path.getsize(uexp_file)
+            file_sizes.append(size)
+
+        metrics.begin_phase("convert")
+        metrics.set_files(file_sizes)
+        progress(metrics.progress_text(), 0, len(uasset_files))
+        last_progress_post = 0.0
+
+        converted_count = 0
+        error_count = 0
+
+        for uasset_file, file_size in zip(uasset_files, file_sizes):
+            if cancel_token.cancelled:
+                break
+
+            # Calculate relative path to preserve directory structure
+            rel_path = os.path.relpath(uasset_file, retoc_output)
+            file_start = time.perf_counter()
+            file_error = None
+            json_file = os.path.join(datajson_output, rel_path.replace(".uasset", ".json"))
+
+            # Create output directory if needed
+            json_dir = os.path.dirname(json_file)
+            os.makedirs(json_dir, exist_ok=True)
+
+            # UAssetGUI command: tojson <source> <destination> <engine version>
+            uassetgui_cmd = [uassetgui_exe, "tojson", uasset_file, json_file, "VER_UE4_27"]
+
+            try:
+                process = subprocess.Popen(
+                    uassetgui_cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+                )
+                cancel_token.register_process(process, cooperative=False)
+                try:
+                    output, _ = process.communicate()
+                finally:
+                    cancel_token.unregister_process(process)
+
+                if cancel_token.cancelled:
+                    break  # Killed mid-conversion; the file is not counted as failed
+                elif process.returncode == 0:
+                    converted_count += 1
+                    if pipeline:
+                        pipeline.mark_converted(rel_path.replace(".uasset", ".json"))
+                else:
+                    error_count += 1
+                    last_line = output.strip().splitlines()[-1] if output.strip() else ""
+                    file_error = f"exit code {process.returncode}" + (f": {last_line}" if last_line else "")
+
+            except Exception as e:
+                error_count += 1
+                file_error = str(e)
+
+            metrics.file_done(rel_path, file_size, time.perf_counter() - file_start, file_error)
+
+            # Update the progress bar a few times per second
+            done = converted_count + error_count
+            now = time.perf_counter()
+            if now - last_progress_post >= PROGRESS_UPDATE_INTERVAL or done == len(uasset_files):
+                last_progress_post = now
+                progress(metrics.progress_text(), done, len(uasset_files))
+
+            # Log progress periodically
+            if done % 100 == 0:
+                log_callback(f"  Progress: {done}/{len(uasset_files)} files processed")
+
+        log_callback(
+            f"  Converted {converted_count} files, {error_count} errors", "success" if error_count == 0 else "warning")
+
+        if cancel_token.cancelled:
+            metrics.cancelled = True
+            if pipeline:
+                # Let any generator already running stop at its next entity
+                log_callback("  Waiting for running generators to stop...", "info")
+                pipeline.finish()
+            log_callback("\nImport cancelled; data tables were not cached", "warning")
+            return False, metrics
+
+        # Step 3: Write compact caches of the data tables used by the generators
+        data_dir = os.path.join(datajson_output, "Moria", "Content", "Tech", "Data")
+        log_callback("\nStep 3: Caching data tables...", "info")
+        status("Caching data tables...")
+        metrics.begin_phase("cache")
+
+        cached_count, json_bytes, cache_bytes = datajson_cache.build_caches(data_dir, log_callback)
+        log_callback(
+            f"  Cached {cached_count} tables ({json_bytes // 1024} KB JSON -> {cache_bytes // 1024} KB cache)",
+            "success")
+
+        # Wait for pipelined generators, then run cross-reference
+        if pipeline:
+            log_callback("\nStep 4: Finishing pipelined generators...", "info")
+            status("Finishing generators...")
+            metrics.begin_phase("generators")
+            results = pipeline.finish()
+            failed = [gen_type for gen_type, success in results.items() if not success]
+            log_callback(
+                f"  Generators: {len(results) - len(failed)} successful, {len(failed)} errors",
+                "success" if not failed else "warning"
+            )
+
+        if cancel_token.cancelled:
+            metrics.cancelled = True
+            log_callback("\nImport cancelled; remaining generators were skipped", "warning")
+            return False, metrics
+
+        # Success
+        log_callback("\n" + "="*60, "info")
+        log_callback("Game file import completed successfully!", "success")
+        log_callback(f"JSON data available at: {datajson_output}", "success")
+        return True, metrics
+
+    except Exception as e:
+        log_callback(f"Error during import: {str(e)}", "error")
+
+    finally:
+        metrics.finish()
+        write_import_report(metrics, log_callback)
+
+    return False, metrics
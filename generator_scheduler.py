@@ -0,0 +1,102 @@
+"""Dependency-aware parallel scheduling of generator runs.
+
+run_generators() treats the generators as a dependency graph. Every generator
+whose dependencies have finished is started, up to max_workers at a time, so
+independent categories run side by side and cross-reference starts as soon as
+the categories it reads are written. With enough workers a full run takes
+about as long as its slowest chain of generators instead of the sum of all.
+
+When earlier run times are known, ready generators are started longest chain
+first: a slow generator, or one that cross-reference waits on, is not left
+until the end.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+def _chain_seconds(gen_types, dependencies, durations):
+    """Return {gen_type: seconds of its own run plus its slowest chain of dependents}."""
+    dependents = {gen_type: [] for gen_type in gen_types}
+    for gen_type in gen_types:
+        for dependency in dependencies.get(gen_type, ()):
+            if dependency in dependents:
+                dependents[dependency].append(gen_type)
+
+    chain = {}
+
+    def visit(gen_type, path=()):
+        if gen_type in path:
+            raise ValueError(f"Generator dependency cycle: {' -> '.join(path + (gen_type,))}")
+        if gen_type not in chain:
+            after = [visit(dependent, path + (gen_type,)) for dependent in dependents[gen_type]]
+            chain[gen_type] = durations.get(gen_type, 0.0) + max(after, default=0.0)
+        return chain[gen_type]
+
+    for gen_type in gen_types:
+        visit(gen_type)
+    return chain
+
+
+def run_generators(gen_types, dependencies, run_generator, max_workers, cancel_token=None, durations=None):
+    """Run generators concurrently, each after the generators it depends on.
+
+    A generator runs once its dependencies have finished, whether or not they
+    succeeded, so cross-reference still links whatever pages were written.
+
+    Args:
+        gen_types: Generators to run, in the order to start them when nothing
+            else decides
+        dependencies: {gen_type: [gen_types it must run after]}; dependencies
+            that are not being run are ignored
+        run_generator: Called on a worker thread with a gen_type; returns True on success
+        max_workers: Maximum number of generators running at once
+        cancel_token: Once cancelled, generators that have not started are skipped
+        durations: Optional {gen_type: seconds} from earlier runs
+
+    Returns:
+        dict: Maps each gen_type to True/False, or None if it was skipped
+
+    Raises:
+        ValueError: If the dependencies contain a cycle
+    """
+    gen_types = list(gen_types)
+    chain = _chain_seconds(gen_types, dependencies, durations or {})
+    waiting_on = {
+        gen_type: {dependency for dependency in dependencies.get(gen_type, ()) if dependency in chain}
+        for gen_type in gen_types
+    }
+    start_order = {gen_type: index for index, gen_type in enumerate(gen_types)}
+
+    results = {}
+    running = {}  # {future: gen_type}
+
+    def run(gen_type):
+        try:
+            return bool(run_generator(gen_type))
+        except Exception:
+            return False
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        while waiting_on or running:
+            if cancel_token is not None and cancel_token.cancelled:
+                for gen_type in waiting_on:
+                    results[gen_type] = None
+                waiting_on.clear()
+
+            ready = [gen_type for gen_type, pending in waiting_on.items() if not pending]
+            ready.sort(key=lambda gen_type: (-chain[gen_type], start_order[gen_type]))
+            for gen_type in ready[:max(1, max_workers) - len(running)]:
+                del waiting_on[gen_type]
+                running[executor.submit(run, gen_type)] = gen_type
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                gen_type = running.pop(future)
+                results[gen_type] = future.result()
+                for pending in waiting_on.values():
+                    pending.discard(gen_type)
+
+    return results
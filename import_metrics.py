@@ -0,0 +1,161 @@
+"""Structured progress and timing metrics for the game file import.
+
+ImportMetrics tracks per-phase timings (retoc extraction, directory walk,
+UAssetGUI conversion, caching), per-file conversion progress, throughput,
+an ETA, the slowest files and every failure. The UI polls snapshot() to drive
+its progress bar, and write_report() saves a JSON run report so import
+performance can be compared across game patches.
+"""
+
+import heapq
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+
+# Number of slowest conversions kept in the report
+SLOWEST_FILE_COUNT = 10
+
+
+def format_duration(seconds):
+    """Format a duration in seconds as e.g. '2m 05s' or '12.3s'."""
+    if seconds is None:
+        return "?"
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, secs = divmod(int(seconds), 60)
+    if minutes < 60:
+        return f"{minutes}m {secs:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+class ImportMetrics:
+    """Collects progress and timing data for one import run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = datetime.now()
+        self.start_time = time.perf_counter()
+        self.end_time = None
+        self.phases = {}  # {phase name: seconds}
+        self.current_phase = None
+        self._phase_start = None
+        self.files_total = 0
+        self.files_done = 0
+        self.bytes_total = 0
+        self.bytes_done = 0
+        self.convert_start = None
+        self.convert_end = None
+        self.failures = []  # [{'file': rel_path, 'error': text}]
+        self.cancelled = False
+        self._slowest = []  # min-heap of (seconds, rel_path)
+
+    def begin_phase(self, name):
+        """Start timing a named phase, ending the previous phase if one is running."""
+        self.end_phase()
+        with self._lock:
+            self.current_phase = name
+            self._phase_start = time.perf_counter()
+
+    def end_phase(self):
+        """Stop timing the current phase."""
+        with self._lock:
+            if self.current_phase is None:
+                return
+            now = time.perf_counter()
+            elapsed = now - self._phase_start
+            self.phases[self.current_phase] = self.phases.get(self.current_phase, 0.0) + elapsed
+            self.current_phase = None
+            if self.convert_start is not None and self.convert_end is None:
+                self.convert_end = now  # The phase set_files() started has ended
+
+    def set_files(self, file_sizes):
+        """Record the files to convert as a list of byte sizes and start the clock.
+
+        Call right after begin_phase() for the conversion; the throughput is
+        measured until that phase ends.
+        """
+        with self._lock:
+            self.files_total = len(file_sizes)
+            self.bytes_total = sum(file_sizes)
+            self.convert_start = time.perf_counter()
+            self.convert_end = None
+
+    def file_done(self, rel_path, size, seconds, error=None):
+        """Record one converted (or failed) file."""
+        with self._lock:
+            self.files_done += 1
+            self.bytes_done += size
+            if error:
+                self.failures.append({"file": rel_path, "error": error})
+            entry = (seconds, rel_path)
+            if len(self._slowest) < SLOWEST_FILE_COUNT:
+                heapq.heappush(self._slowest, entry)
+            else:
+                heapq.heappushpop(self._slowest, entry)
+
+    def finish(self):
+        """Stop the current phase and the overall clock."""
+        self.end_phase()
+        with self._lock:
+            self.end_time = time.perf_counter()
+
+    def snapshot(self):
+        """Return a consistent copy of the current progress for display."""
+        with self._lock:
+            now = self.end_time or time.perf_counter()
+            elapsed = now - self.start_time
+            convert_end = self.convert_end or now
+            convert_elapsed = convert_end - self.convert_start if self.convert_start else 0.0
+            rate = self.files_done / convert_elapsed if convert_elapsed > 0 else 0.0
+            byte_rate = self.bytes_done / convert_elapsed if convert_elapsed > 0 else 0.0
+            remaining = self.files_total - self.files_done
+            eta = remaining / rate if rate > 0 else None
+            return {
+                "phase": self.current_phase,
+                "files_done": self.files_done,
+                "files_total": self.files_total,
+                "bytes_done": self.bytes_done,
+                "bytes_total": self.bytes_total,
+                "files_per_second": rate,
+                "bytes_per_second": byte_rate,
+                "eta_seconds": eta,
+                "elapsed_seconds": elapsed,
+                "failure_count": len(self.failures),
+            }
+
+    def progress_text(self):
+        """Return a one-line progress description for the status bar."""
+        snap = self.snapshot()
+        return (
+            f"Converting {snap['files_done']}/{snap['files_total']} files "
+            f"({snap['files_per_second']:.1f} files/s, "
+            f"{snap['bytes_per_second'] / (1024 * 1024):.1f} MB/s, "
+            f"ETA {format_duration(snap['eta_seconds'])})"
+        )
+
+    def to_dict(self):
+        """Return the full run report as a JSON-serializable dict."""
+        report = self.snapshot()
+        with self._lock:
+            report["started_at"] = self.started_at.isoformat(timespec="seconds")
+            report["phases"] = {name: round(seconds, 3) for name, seconds in self.phases.items()}
+            report["slowest_files"] = [
+                {"file": rel_path, "seconds": round(seconds, 3)}
+                for seconds, rel_path in sorted(self._slowest, reverse=True)
+            ]
+            report["failures"] = list(self.failures)
+            report["cancelled"] = self.cancelled
+        return report
+
+    def write_report(self, report_dir):
+        """Write the run report to report_dir and return its path."""
+        os.makedirs(report_dir, exist_ok=True)
+        filename = f"import_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json"
+        report_path = os.path.join(report_dir, filename)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return report_path
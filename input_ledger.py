@@ -0,0 +1,309 @@
+"""Per-page input hashes, so a generator only rewrites pages whose inputs changed.
+
+Each generator keeps an InputLedger in <output>\\input_ledgers\\<generator>.json.
+For every page it records a hash of the entity model the page is rendered
+from, which is built from the entity's data table row, its recipe row, the
+strings it resolved and any override that applied. Shared tables the template
+looks up while rendering (string tables, other entities' models, overrides)
+are wrapped with track(), and the entries the page actually read are hashed
+too:
+
+    ledger = InputLedger("brews", __file__)
+    string_map = ledger.track("strings", string_map)
+    for model in brew_models:
+        if ledger.is_current(title, model, filepath):
+            continue
+        content = generate_wiki_template(model, string_map)
+        ...write the page...
+        ledger.record()
+    ledger.save()
+
+A page is rewritten when its model or any table entry it read has changed,
+when the generator's source or a helper module it imports has changed, or
+when the page file is missing.
+Setting MORIA_FULL_REBUILD rewrites every page. A run that stops before
+save() removes the ledger, so the next run rewrites every page.
+
+track() also takes the file or folder a table was loaded from. The ledger
+keeps these, so load_ledger() shows which files and keys each page read.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+
+import generator_metrics
+import wiki_paths
+
+
+FULL_REBUILD_ENV = "MORIA_FULL_REBUILD"
+LEDGER_DIR_NAME = "input_ledgers"
+LEDGER_FORMAT_VERSION = 1
+
+# Recorded in place of a key list when a template iterated a whole table
+ALL_KEYS = "*"
+
+
+def _json_default(value):
+    """Serialize values json does not handle natively (sets become sorted lists)."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def digest(value):
+    """Return a stable SHA-1 hex digest of a JSON-like value."""
+    try:
+        text = json.dumps(value, sort_keys=True, ensure_ascii=False, default=_json_default)
+    except TypeError:
+        text = repr(value)  # Keys of mixed types cannot be sorted
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _local_imports(path):
+    """Return the modules in path's folder that the file at path imports."""
+    folder = os.path.dirname(path)
+    modules = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            match = re.match(r'\s*(?:from\s+(\w+)\s+import\b|import\s+([\w\s,]+?)\s*(?:#|$))', line)
+            if not match:
+                continue
+            names = [match.group(1)] if match.group(1) else match.group(2).split(",")
+            for name in names:
+                candidate = os.path.join(folder, name.strip() + ".py")
+                if os.path.isfile(candidate):
+                    modules.append(candidate)
+    return modules
+
+
+def code_fingerprint(code_file):
+    """Return a digest of a generator's source and the local modules it imports.
+
+    Shared helpers (datajson_cache, wiki_paths, this module...) change a
+    generator's output as much as its own source does. When frozen, the
+    executable stands in for all of them.
+    """
+    try:
+        if getattr(sys, 'frozen', False):
+            stat = os.stat(sys.executable)
+            return f"exe-{stat.st_size}-{stat.st_mtime_ns}"
+        pending = [os.path.abspath(code_file)]
+        files = set()
+        while pending:
+            path = pending.pop()
+            if path not in files:
+                files.add(path)
+                pending.extend(_local_imports(path))
+        sha1 = hashlib.sha1()
+        for path in sorted(files):
+            sha1.update(os.path.basename(path).encode('utf-8') + b"\0")
+            with open(path, 'rb') as f:
+                sha1.update(f.read())
+        return sha1.hexdigest()
+    except OSError:
+        return ""
+
+
+def get_ledger_path(generator):
+    """Return the ledger file of a generator under the current output folder."""
+    return os.path.join(wiki_paths.get_output_dir(), LEDGER_DIR_NAME, f"{generator}.json")
+
+
+def load_ledger(generator):
+    """Return a generator's saved ledger ({"sources", "pages", ...}), or {} if there is none."""
+    try:
+        with open(get_ledger_path(generator), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if data.get("version") == LEDGER_FORMAT_VERSION else {}
+
+
+def is_full_rebuild():
+    """True if MORIA_FULL_REBUILD asks for every page to be rewritten."""
+    return os.environ.get(FULL_REBUILD_ENV, "").lower() not in ("", "0", "false")
+
+
+class TrackedMap:
+    """Read-only view of a dict that records which keys a template looks up."""
+
+    def __init__(self, mapping):
+        self.mapping = mapping
+        self.keys_read = set()
+        self.read_all = False
+
+    def reset(self):
+        """Forget the keys read so far."""
+        self.keys_read = set()
+        self.read_all = False
+
+    def get(self, key, default=None):
+        self.keys_read.add(key)
+        return self.mapping.get(key, default)
+
+    def __getitem__(self, key):
+        self.keys_read.add(key)
+        return self.mapping[key]
+
+    def __contains__(self, key):
+        self.keys_read.add(key)
+        return key in self.mapping
+
+    # Anything that walks the table depends on all of it
+    def __iter__(self):
+        self.read_all = True
+        return iter(self.mapping)
+
+    def __len__(self):
+        self.read_all = True
+        return len(self.mapping)
+
+    def keys(self):
+        self.read_all = True
+        return self.mapping.keys()
+
+    def values(self):
+        self.read_all = True
+        return self.mapping.values()
+
+    def items(self):
+        self.read_all = True
+        return self.mapping.items()
+
+    def reads(self):
+        """Return the sorted keys read, or ALL_KEYS if they can't be listed."""
+        if self.read_all or not all(isinstance(key, str) for key in self.keys_read):
+            return ALL_KEYS
+        return sorted(self.keys_read)
+
+
+class InputLedger:
+    """Input hashes of one generator's pages from its last completed run."""
+
+    def __init__(self, generator, code_file):
+        """
+        Args:
+            generator: Generator type, used as the ledger file name
+            code_file: The generator's __file__; a change to it, or to a local
+                module it imports, rewrites every page
+        """
+        self.generator = generator
+        self.ledger_path = get_ledger_path(generator)
+        self.code = code_fingerprint(code_file)
+        self.full_rebuild = is_full_rebuild()
+        self.tracked = {}  # {name: TrackedMap}
+        self.sources = {}  # {name: file or folder the table came from}
+        self.previous = {}  # {title: entry} from the last run
+        self.pages = {}  # {title: entry} for this run
+        self.written = 0
+        self.unchanged = 0
+        self._title = None
+        self._model_hash = None
+        self._table_digests = {}  # {name: digest of the whole table}
+        self._ledger_removed = False
+        self._load()
+
+    def _load(self):
+        """Load the previous run's entries if they were made by the same code."""
+        data = load_ledger(self.generator)
+        if data.get("code") == self.code:
+            self.previous = data.get("pages", {})
+
+    def track(self, name, mapping, source=None):
+        """Wrap a shared table the templates read, so the entries each page uses are hashed.
+
+        Args:
+            name: Table name recorded in each page's reads
+            mapping: The table
+            source: Optional file or folder the table was loaded from
+        """
+        tracked = TrackedMap(mapping)
+        self.tracked[name] = tracked
+        if source:
+            self.sources[name] = os.path.abspath(source)
+        return tracked
+
+    def add_read(self, name, key):
+        """Record that the current page used key of a tracked table outside its template.
+
+        For tables applied while building the models, before the ledger checks
+        each page; call it after is_current().
+        """
+        self.tracked[name].keys_read.add(key)
+
+    def _reads_digest(self, reads):
+        """Return a digest of the current values of the table entries in reads."""
+        values = {}
+        for name, keys in reads.items():
+            tracked = self.tracked.get(name)
+            if tracked is None:
+                return None  # Table no longer tracked; treat as changed
+            if keys == ALL_KEYS:
+                if name not in self._table_digests:
+                    self._table_digests[name] = digest(tracked.mapping)
+                values[name] = self._table_digests[name]
+            else:
+                mapping = tracked.mapping
+                values[name] = [[key, key in mapping, mapping.get(key)] for key in keys]
+        return digest(values)
+
+    def is_current(self, title, model, filepath):
+        """Check whether a page can be left as it is, and start tracking its render if not.
+
+        Args:
+            title: Page title (the file name without .wiki)
+            model: The entity model the page is rendered from
+            filepath: The page file
+        """
+        self._title = title
+        self._model_hash = digest(model)
+        for tracked in self.tracked.values():
+            tracked.reset()
+
+        if self.full_rebuild or title in self.pages:
+            # Another model of this run has the same title; the last one written wins
+            return False
+        entry = self.previous.get(title)
+        if not entry or entry.get("model") != self._model_hash or not os.path.exists(filepath):
+            return False
+        if self._reads_digest(entry.get("reads", {})) != entry.get("inputs"):
+            return False
+
+        self.pages[title] = entry
+        self.unchanged += 1
+        generator_metrics.count("unchanged")
+        return True
+
+    def record(self):
+        """Record the page just written with the table entries its template read."""
+        if not self._ledger_removed:
+            # Until save(), the ledger on disk no longer matches the pages
+            self._ledger_removed = True
+            try:
+                os.remove(self.ledger_path)
+            except OSError:
+                pass
+
+        reads = {}
+        for name, tracked in self.tracked.items():
+            keys = tracked.reads()
+            if keys:
+                reads[name] = keys
+        self.pages[self._title] = {
+            "model": self._model_hash,
+            "reads": reads,
+            "inputs": self._reads_digest(reads),
+        }
+        self.written += 1
+
+    def save(self):
+        """Write this run's entries; pages not generated this time are dropped."""
+        os.makedirs(os.path.dirname(self.ledger_path), exist_ok=True)
+        data = {"version": LEDGER_FORMAT_VERSION, "code": self.code, "sources": self.sources, "pages": self.pages}
+        temp_path = self.ledger_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, self.ledger_path)
@@ -0,0 +1,245 @@
+"""Streaming writer for MediaWiki XML import files.
+
+Pages are escaped and written to the output file one at a time, so memory use
+stays flat no matter how many pages are packaged. The output follows the
+export-0.11 schema accepted by Special:Import and importDump.php.
+
+Output files ending in .gz or .bz2 are compressed as they are written;
+importDump.php reads both formats directly.
+"""
+
+import bz2
+import gzip
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+EXPORT_NAMESPACE = "http://www.mediawiki.org/xml/export-0.11/"
+EXPORT_SCHEMA = "http://www.mediawiki.org/xml/export-0.11.xsd"
+EXPORT_VERSION = "0.11"
+
+SITE_NAME = "Wiki"
+REVISION_TIMESTAMP = "2024-01-01T00:00:00Z"
+REVISION_USERNAME = "WikiBot"
+REVISION_COMMENT = "Automated import"
+
+# Files read ahead per worker by read_page_files_concurrently()
+READ_AHEAD_PER_WORKER = 4
+
+# File extension for each supported compression format
+COMPRESSION_EXTENSIONS = {
+    "none": ".xml",
+    "gzip": ".xml.gz",
+    "bz2": ".xml.bz2",
+}
+
+DUMP_HEADER = (
+    '<?xml version="1.0" encoding="utf-8"?>\n'
+    f'<mediawiki xmlns="{EXPORT_NAMESPACE}" '
+    'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+    f'xsi:schemaLocation="{EXPORT_NAMESPACE} {EXPORT_SCHEMA}" '
+    f'version="{EXPORT_VERSION}" xml:lang="en">\n'
+    '  <siteinfo>\n'
+    f'    <sitename>{SITE_NAME}</sitename>\n'
+    '  </siteinfo>\n'
+)
+DUMP_FOOTER = '</mediawiki>\n'
+DUMP_OVERHEAD_BYTES = len(DUMP_HEADER.encode('utf-8')) + len(DUMP_FOOTER.encode('utf-8'))
+
+
+def open_dump_file(output_file):
+    """Open an import file for binary writing, compressing by file extension."""
+    if output_file.endswith(".gz"):
+        return gzip.open(output_file, 'wb')
+    if output_file.endswith(".bz2"):
+        return bz2.open(output_file, 'wb')
+    return open(output_file, 'wb')
+
+
+def escape(text):
+    """Escape &, < and > for XML character data.
+
+    Same output as xml.sax.saxutils.escape, which would pull in urllib.request
+    and its dependencies on import.
+    """
+    return text.replace("&", "&amp;").replace(">", "&gt;").replace("<", "&lt;")
+
+
+def render_page(title, content):
+    """Render one <page> element as a string."""
+    content_bytes = len(content.encode('utf-8'))
+    return (
+        '  <page>\n'
+        f'    <title>{escape(title)}</title>\n'
+        '    <ns>0</ns>\n'
+        '    <revision>\n'
+        f'      <timestamp>{REVISION_TIMESTAMP}</timestamp>\n'
+        '      <contributor>\n'
+        f'        <username>{REVISION_USERNAME}</username>\n'
+        '      </contributor>\n'
+        f'      <comment>{REVISION_COMMENT}</comment>\n'
+        '      <model>wikitext</model>\n'
+        '      <format>text/x-wiki</format>\n'
+        f'      <text xml:space="preserve" bytes="{content_bytes}">{escape(content)}</text>\n'
+        '    </revision>\n'
+        '  </page>\n'
+    )
+
+
+class MediaWikiDumpWriter:
+    """Writes a MediaWiki XML import file page by page.
+
+    Use as a context manager; the closing </mediawiki> tag is written on exit.
+    bytes_written counts uncompressed XML, even for .gz and .bz2 output.
+    """
+
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.page_count = 0
+        self.bytes_written = 0
+        self._file = open_dump_file(output_file)
+        self._write(DUMP_HEADER)
+
+    def _write(self, text):
+        """Encode and write text, tracking the number of bytes written."""
+        data = text.encode('utf-8')
+        self._file.write(data)
+        self.bytes_written += len(data)
+
+    def write_page(self, title, content):
+        """Write one page and return the number of bytes it added to the file."""
+        return self.write_encoded_page(render_page(title, content).encode('utf-8'))
+
+    def write_encoded_page(self, data):
+        """Write a page already rendered and UTF-8 encoded; return its size in bytes."""
+        self._file.write(data)
+        self.bytes_written += len(data)
+        self.page_count += 1
+        return len(data)
+
+    def close(self):
+        """Write the closing tag and close the file."""
+        if self._file is None:
+            return
+        try:
+            self._write(DUMP_FOOTER)
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+def write_mediawiki_import(pages, output_file):
+    """Write an iterable of (title, content) pages to a MediaWiki XML import file.
+
+    Pages are consumed lazily, so a generator that reads each file on demand
+    keeps only one page in memory at a time.
+
+    Returns:
+        int: Number of pages written
+    """
+    with MediaWikiDumpWriter(output_file) as writer:
+        for title, content in pages:
+            writer.write_page(title, content)
+    return writer.page_count
+
+
+def _read_page_file(file_path):
+    """Read one page file."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def read_page_files(page_files, error_callback=None):
+    """Yield (title, content) for each (title, file_path) pair, reading files on demand.
+
+    Files that cannot be read are reported through error_callback and skipped.
+    """
+    for title, file_path in page_files:
+        try:
+            content = _read_page_file(file_path)
+        except (OSError, UnicodeDecodeError) as e:
+            if error_callback:
+                error_callback(title, e)
+            continue
+        yield title, content
+
+
+def read_page_files_concurrently(page_files, max_workers=4, error_callback=None):
+    """Like read_page_files(), but reads ahead on a thread pool.
+
+    Pages are still yielded in order. At most max_workers * READ_AHEAD_PER_WORKER
+    files are read ahead, so memory use stays bounded.
+    """
+    files = iter(page_files)
+    window = max(1, max_workers) * READ_AHEAD_PER_WORKER
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        pending = deque(
+            (title, executor.submit(_read_page_file, file_path))
+            for title, file_path in itertools.islice(files, window)
+        )
+        while pending:
+            title, future = pending.popleft()
+            for next_title, next_path in itertools.islice(files, 1):
+                pending.append((next_title, executor.submit(_read_page_file, next_path)))
+            try:
+                content = future.result()
+            except (OSError, UnicodeDecodeError) as e:
+                if error_callback:
+                    error_callback(title, e)
+                continue
+            yield title, content
+
+
+def write_batched_imports(pages, batch_path, max_bytes, max_pages=0, oversize_callback=None):
+    """Pack pages into as few import files as possible within a byte budget.
+
+    Each file is filled until the next page would push it past max_bytes (or
+    past max_pages pages, when max_pages is non-zero). A single page larger than
+    the budget is written to a file of its own and reported through
+    oversize_callback.
+
+    Args:
+        pages: Iterable of (title, content), consumed lazily
+        batch_path: Callable mapping a 1-based batch number to an output path
+        max_bytes: Uncompressed byte budget per file, including the XML header and footer
+        max_pages: Optional page cap per file; 0 for no cap
+        oversize_callback: Called with (title, page_bytes) for pages over budget
+
+    Returns:
+        list: (output_file, page_count, bytes_written) for each file written
+    """
+    batches = []
+    writer = None
+
+    def close_writer():
+        writer.close()
+        batches.append((writer.output_file, writer.page_count, writer.bytes_written))
+
+    try:
+        for title, content in pages:
+            data = render_page(title, content).encode('utf-8')
+            if writer is not None:
+                over_budget = writer.bytes_written + len(data) + len(DUMP_FOOTER) > max_bytes
+                at_page_cap = max_pages and writer.page_count >= max_pages
+                if over_budget or at_page_cap:
+                    close_writer()
+                    writer = None
+            if writer is None:
+                writer = MediaWikiDumpWriter(batch_path(len(batches) + 1))
+            if len(data) + DUMP_OVERHEAD_BYTES > max_bytes and oversize_callback:
+                oversize_callback(title, len(data))
+            writer.write_encoded_page(data)
+    finally:
+        if writer is not None:
+            close_writer()
+
+    return batches
@@ -0,0 +1,411 @@
+"""Direct upload of generated pages through the MediaWiki action API.
+
+MediaWikiClient logs in with a bot password, fetches a CSRF token and edits
+pages over persistent HTTP connections, one per worker thread. Transient
+failures (connection errors, HTTP 429/5xx, maxlag, readonly) are retried with
+exponential backoff.
+
+upload_pages() compares each page's SHA-1 with the wiki's current revision and
+only edits pages that differ. Finished pages are recorded in a progress file,
+so an interrupted upload resumes where it stopped. The progress file only
+serves to resume: clear it once an upload finishes without failures, so the
+next upload compares every page with the wiki again.
+
+Only the standard library is used, so the uploader works in the frozen build
+and can be pointed at a local stand-in HTTP server for testing.
+"""
+
+import hashlib
+import http.client
+import http.cookiejar
+import json
+import os
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+USER_AGENT = "MoriaWikiGenerator (https://github.com/jbowensii/lotr-rtm-items-to-wiki)"
+REQUEST_TIMEOUT = 60
+
+# Titles per revision query; the API limit for normal accounts
+QUERY_BATCH_SIZE = 50
+
+DEFAULT_UPLOAD_WORKERS = 4
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 1.0
+EDIT_SUMMARY = "Automated update from game data"
+
+# API error codes worth retrying after a pause
+RETRYABLE_API_ERRORS = {"maxlag", "readonly", "ratelimited", "internal_api_error_DBQueryError"}
+
+
+class MediaWikiAPIError(Exception):
+    """An error response from the MediaWiki API."""
+
+    def __init__(self, code, info):
+        super().__init__(f"{code}: {info}")
+        self.code = code
+        self.info = info
+
+
+class TransientError(Exception):
+    """A failure that may succeed if the request is retried."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def normalize_wikitext(content):
+    """Normalize wikitext the way MediaWiki does on save (LF line ends, no trailing whitespace)."""
+    return content.replace('\r\n', '\n').rstrip()
+
+
+def wikitext_sha1(content):
+    """Return the SHA-1 hex digest MediaWiki reports for a revision with this content."""
+    return hashlib.sha1(normalize_wikitext(content).encode('utf-8')).hexdigest()
+
+
+class MediaWikiClient:
+    """Minimal MediaWiki action API client with per-thread persistent connections."""
+
+    def __init__(self, api_url, timeout=REQUEST_TIMEOUT):
+        self.api_url = api_url
+        self.timeout = timeout
+        parsed = urllib.parse.urlsplit(api_url)
+        self._scheme = parsed.scheme
+        self._host = parsed.netloc
+        self._path = parsed.path or "/"
+        self._cookies = http.cookiejar.CookieJar()
+        self._local = threading.local()
+        self._connections = []  # Every thread's connection, for close()
+        self._connections_lock = threading.Lock()
+        self._token_lock = threading.Lock()
+        self.csrf_token = None
+
+    def _connection(self):
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+            conn = conn_class(self._host, timeout=self.timeout)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _drop_connection(self):
+        """Close this thread's connection so the next request reconnects."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+            with self._connections_lock:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+
+    def close(self):
+        """Close the connections of every thread that used this client."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def _send(self, params, post):
+        """Send one API request and return the decoded JSON response."""
+        params = dict(params, format="json", formatversion="2")
+        body = urllib.parse.urlencode(params).encode('utf-8')
+        url = self.api_url if post else f"{self.api_url}?{body.decode('ascii')}"
+
+        # The cookie jar works on urllib Request objects, so build one to carry cookies
+        request = urllib.request.Request(url, data=body if post else None, method="POST" if post else "GET")
+        request.add_header("User-Agent", USER_AGENT)
+        request.add_header("Accept-Encoding", "identity")
+        if post:
+            request.add_header("Content-Type", "application/x-www-form-urlencoded")
+        self._cookies.add_cookie_header(request)
+
+        path = self._path if post else f"{self._path}?{body.decode('ascii')}"
+        conn = self._connection()
+        try:
+            conn.request(request.get_method(), path, body=request.data, headers=dict(request.header_items()))
+            response = conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            self._drop_connection()
+            raise TransientError(f"Connection error: {e}")
+
+        self._cookies.extract_cookies(response, request)
+
+        if response.status == 429 or response.status >= 500:
+            retry_after = response.getheader("Retry-After")
+            raise TransientError(
+                f"HTTP {response.status}",
+                float(retry_after) if retry_after and retry_after.isdigit() else None
+            )
+        if response.status != 200:
+            raise MediaWikiAPIError(f"http{response.status}", response.reason)
+
+        try:
+            result = json.loads(data.decode('utf-8'))
+        except ValueError:
+            raise MediaWikiAPIError("badresponse", "Response was not JSON")
+
+        if "error" in result:
+            code = result["error"].get("code", "unknown")
+            info = result["error"].get("info", "")
+            if code in RETRYABLE_API_ERRORS:
+                raise TransientError(f"{code}: {info}")
+            raise MediaWikiAPIError(code, info)
+        return result
+
+    def request(self, params, post=False):
+        """Send an API request, retrying transient failures with exponential backoff."""
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                return self._send(params, post)
+            except TransientError as e:
+                if attempt == MAX_RETRIES:
+                    raise MediaWikiAPIError("retries_exhausted", str(e))
+                delay = e.retry_after if e.retry_after is not None else BACKOFF_BASE_SECONDS * (2 ** attempt)
+                time.sleep(delay)
+
+    def login(self, username, password):
+        """Log in with a bot password (Special:BotPasswords) and fetch a CSRF token."""
+        result = self.request({"action": "query", "meta": "tokens", "type": "login"})
+        login_token = result["query"]["tokens"]["logintoken"]
+
+        result = self.request({
+            "action": "login",
+            "lgname": username,
+            "lgpassword": password,
+            "lgtoken": login_token,
+        }, post=True)
+        login = result.get("login", {})
+        if login.get("result") != "Success":
+            raise MediaWikiAPIError("loginfailed", login.get("reason", login.get("result", "Login failed")))
+
+        self.refresh_csrf_token()
+
+    def refresh_csrf_token(self):
+        """Fetch a new CSRF token for edits."""
+        result = self.request({"action": "query", "meta": "tokens", "type": "csrf"})
+        with self._token_lock:
+            self.csrf_token = result["query"]["tokens"]["csrftoken"]
+        return self.csrf_token
+
+    def get_page_hashes(self, titles):
+        """Return {title: (exists, sha1 of the current revision)} for each title.
+
+        sha1 is None for a missing page, and also for an existing page whose
+        revision hash is hidden (e.g. a suppressed revision).
+        """
+        hashes = {}
+        for start in range(0, len(titles), QUERY_BATCH_SIZE):
+            batch = titles[start:start + QUERY_BATCH_SIZE]
+            result = self.request({
+                "action": "query",
+                "prop": "revisions",
+                "rvprop": "sha1",
+                "titles": "|".join(batch),
+            }, post=True)
+            query = result.get("query", {})
+
+            # Map normalized titles (e.g. first letter capitalized) back to ours
+            original = {title: title for title in batch}
+            for entry in query.get("normalized", []):
+                original[entry["to"]] = entry["from"]
+
+            for page in query.get("pages", []):
+                title = original.get(page.get("title"), page.get("title"))
+                exists = 'missing' not in page
+                revisions = page.get("revisions") or []
+                hashes[title] = (exists, revisions[0].get("sha1") if exists and revisions else None)
+        return hashes
+
+    def edit_page(self, title, content, summary=EDIT_SUMMARY, exists=None):
+        """Save a page, refreshing the CSRF token once if it has expired.
+
+        With exists set, the edit uses nocreate (True) or createonly (False) so a
+        page deleted or created since the hash check is not silently overwritten.
+        """
+        text = normalize_wikitext(content)
+        params = {
+            "action": "edit",
+            "title": title,
+            "text": text,
+            "summary": summary,
+            "bot": "1",
+            "md5": hashlib.md5(text.encode('utf-8')).hexdigest(),
+        }
+        if exists is True:
+            params["nocreate"] = "1"
+        elif exists is False:
+            params["createonly"] = "1"
+
+        for attempt in range(2):
+            params["token"] = self.csrf_token
+            try:
+                result = self.request(params, post=True)
+            except MediaWikiAPIError as e:
+                if e.code == "badtoken" and attempt == 0:
+                    self.refresh_csrf_token()
+                    continue
+                raise
+            edit = result.get("edit", {})
+            if edit.get("result") != "Success":
+                raise MediaWikiAPIError("editfailed", json.dumps(edit))
+            return edit
+
+
+class UploadProgress:
+    """Resumable record of pages already uploaded to one wiki, keyed by title."""
+
+    def __init__(self, progress_path, api_url):
+        self.progress_path = progress_path
+        self.api_url = api_url
+        self.pages = {}  # {title: sha1}
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Load progress for this wiki; progress recorded for another wiki is ignored."""
+        self.pages = {}
+        try:
+            with open(self.progress_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("api_url") == self.api_url:
+            self.pages = dict(data.get("pages", {}))
+        return True
+
+    def save(self):
+        """Write the progress file atomically."""
+        with self._lock:
+            data = {"api_url": self.api_url, "pages": dict(self.pages)}
+        temp_path = self.progress_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.progress_path)
+
+    def clear(self):
+        """Forget all progress and delete the progress file, e.g. once an upload has finished."""
+        with self._lock:
+            self.pages = {}
+        try:
+            os.remove(self.progress_path)
+        except FileNotFoundError:
+            pass
+
+    def is_done(self, title, sha1):
+        """Check if this exact content was already uploaded."""
+        with self._lock:
+            return self.pages.get(title) == sha1
+
+    def record(self, title, sha1):
+        """Record a page as uploaded."""
+        with self._lock:
+            self.pages[title] = sha1
+
+
+def upload_pages(client, pages, progress, max_workers=DEFAULT_UPLOAD_WORKERS, summary=EDIT_SUMMARY,
+                 log_callback=None, progress_callback=None, synced_callback=None, cancel_token=None):
+    """Upload (title, content) pages, skipping those whose content is already on the wiki.
+
+    Pages are handled in batches of QUERY_BATCH_SIZE: one revision query finds
+    the pages that differ, which are then edited on up to max_workers threads.
+    The progress file is saved after every batch.
+
+    Args:
+        client: Logged-in MediaWikiClient
+        pages: Iterable of (title, content)
+        progress: UploadProgress for the target wiki
+        progress_callback: Called with (pages_done) after every batch
+        synced_callback: Called with (title, content) for every page that now
+            matches the wiki, whether uploaded or already up to date
+        cancel_token: Once cancelled, edits that have not started are skipped
+            and no further batches are read; the progress file keeps what
+            was uploaded, so the next upload resumes from there
+
+    Returns:
+        dict: uploaded, unchanged and resumed counts, a list of failures and
+        whether the upload was cancelled
+    """
+    def log(message):
+        if log_callback:
+            log_callback(message)
+
+    results = {"uploaded": 0, "unchanged": 0, "resumed": 0, "failed": [], "cancelled": False}
+    results_lock = threading.Lock()
+    pages_done = 0
+
+    def synced(title, content):
+        if synced_callback:
+            synced_callback(title, content)
+
+    def cancelled():
+        return cancel_token is not None and cancel_token.cancelled
+
+    def upload_one(title, content, sha1, exists):
+        if cancelled():
+            return
+        try:
+            client.edit_page(title, content, summary, exists)
+        except MediaWikiAPIError as e:
+            log(f"Failed to upload {title}: {e}")
+            with results_lock:
+                results["failed"].append({"title": title, "error": str(e)})
+            return
+        progress.record(title, sha1)
+        with results_lock:
+            results["uploaded"] += 1
+        synced(title, content)
+
+    def process_batch(batch, executor):
+        nonlocal pages_done
+        pending = []
+        for title, content in batch:
+            sha1 = wikitext_sha1(content)
+            if progress.is_done(title, sha1):
+                results["resumed"] += 1
+                synced(title, content)
+            else:
+                pending.append((title, content, sha1))
+
+        if pending:
+            remote = client.get_page_hashes([title for title, _, _ in pending])
+            futures = []
+            for title, content, sha1 in pending:
+                exists, remote_sha1 = remote.get(title, (False, None))
+                if remote_sha1 == sha1:
+                    progress.record(title, sha1)
+                    results["unchanged"] += 1
+                    synced(title, content)
+                    continue
+                futures.append(executor.submit(upload_one, title, content, sha1, exists))
+            for future in futures:
+                future.result()
+
+        progress.save()
+        pages_done += len(batch)
+        if progress_callback:
+            progress_callback(pages_done)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        batch = []
+        for page in pages:
+            batch.append(page)
+            if len(batch) >= QUERY_BATCH_SIZE:
+                if cancelled():
+                    break
+                process_batch(batch, executor)
+                batch = []
+        if batch and not cancelled():
+            process_batch(batch, executor)
+
+    results["cancelled"] = cancelled()
+    return results
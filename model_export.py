@@ -0,0 +1,252 @@
+"""Optional export of the generators' per-entity models to one JSONL or SQLite file.
+
+The generators build a model dict for every entity before rendering its wiki
+page. When the MORIA_MODEL_EXPORT environment variable names an export file,
+each generator also streams those models into it:
+
+    models.jsonl   one {"category", "name", "model"} object per line
+    models.sqlite  table models(category, name, model) with model as JSON text
+
+Models are spooled to a temporary file while the generator runs and merged into
+the shared export when it finishes, replacing that category's previous rows.
+The merge holds a lock file, so generators running in parallel processes can
+share one export.
+"""
+
+import json
+import os
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+
+
+MODEL_EXPORT_ENV = "MORIA_MODEL_EXPORT"
+
+# Export file name for each supported format
+EXPORT_FILE_NAMES = {
+    "jsonl": "models.jsonl",
+    "sqlite": "models.sqlite",
+}
+
+LOCK_TIMEOUT_SECONDS = 60
+
+
+def _json_default(value):
+    """Serialize values json does not handle natively (sets become sorted lists)."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def _process_alive(pid):
+    """Return True if a process with this id is still running."""
+    if pid == os.getpid():
+        return True
+    if os.name == 'nt':
+        import ctypes  # os.kill(pid, 0) would terminate the process on Windows
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return kernel32.GetLastError() == 5  # Access denied: it exists
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return True
+            return exit_code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_lock_owner(lock_path):
+    """Return the owner written into a lock file, "" if not written yet, or None if there is no lock."""
+    try:
+        with open(lock_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+    except OSError:
+        return ""
+
+
+def _lock_is_stale(lock_path, owner):
+    """True if the lock's owner process is gone.
+
+    A lock whose owner has not written its id yet is stale only once it is
+    older than LOCK_TIMEOUT_SECONDS (its owner died between creating and
+    writing it). A live owner keeps its lock however long its merge takes.
+    """
+    try:
+        pid = int(owner.split()[0])
+    except (ValueError, IndexError):
+        pid = None
+    if pid is not None:
+        return not _process_alive(pid)
+    try:
+        return time.time() - os.path.getmtime(lock_path) > LOCK_TIMEOUT_SECONDS
+    except FileNotFoundError:
+        return False
+
+
+def _remove_lock(lock_path, owner):
+    """Remove the lock file if it still holds owner.
+
+    The lock is first renamed aside, which atomically takes whichever lock
+    file is there, and only deleted if it is owner's. A lock another process
+    acquired in the meantime is linked back into place.
+    """
+    aside_path = f"{lock_path}.{uuid.uuid4().hex}"
+    try:
+        os.rename(lock_path, aside_path)
+    except FileNotFoundError:
+        return
+    try:
+        if _read_lock_owner(aside_path) != owner:
+            try:
+                os.link(aside_path, lock_path)
+            except FileExistsError:
+                pass  # A waiter saw no lock and took it; that lock is held now
+    finally:
+        os.remove(aside_path)
+
+
+@contextmanager
+def _export_lock(export_path):
+    """Hold an exclusive lock file next to the export while merging into it.
+
+    The lock holds the owner's process id. A waiter breaks the lock only when
+    that process is gone (a terminated or crashed generator).
+    """
+    lock_path = export_path + ".lock"
+    owner = f"{os.getpid()} {uuid.uuid4().hex}"
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            current = _read_lock_owner(lock_path)
+            if current is not None and _lock_is_stale(lock_path, current):
+                _remove_lock(lock_path, current)
+            else:
+                time.sleep(0.05)
+            continue
+        try:
+            os.write(fd, owner.encode('utf-8'))
+        finally:
+            os.close(fd)
+        break
+    try:
+        yield
+    finally:
+        _remove_lock(lock_path, owner)
+
+
+class ModelExporter:
+    """Streams one generator's models into the shared export file."""
+
+    def __init__(self, category, export_path):
+        self.category = category
+        self.export_path = export_path
+        self.count = 0
+        export_dir = os.path.dirname(os.path.abspath(export_path))
+        os.makedirs(export_dir, exist_ok=True)
+        self._spool = tempfile.TemporaryFile(mode='w+', encoding='utf-8', dir=export_dir)
+
+    def add(self, name, model):
+        """Add one entity's model."""
+        record = {"category": self.category, "name": name, "model": model}
+        self._spool.write(json.dumps(record, ensure_ascii=False, default=_json_default) + "\n")
+        self.count += 1
+
+    def close(self):
+        """Merge the spooled models into the export, replacing this category's rows."""
+        if self._spool is None:
+            return
+        try:
+            self._spool.seek(0)
+            with _export_lock(self.export_path):
+                if self.export_path.endswith(".jsonl"):
+                    self._merge_jsonl()
+                else:
+                    self._merge_sqlite()
+        finally:
+            self._spool.close()
+            self._spool = None
+
+    def _merge_jsonl(self):
+        """Rewrite the JSONL export with other categories' lines plus the spool."""
+        temp_path = f"{self.export_path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as out:
+            if os.path.exists(self.export_path):
+                with open(self.export_path, 'r', encoding='utf-8') as existing:
+                    for line in existing:
+                        try:
+                            if json.loads(line).get("category") == self.category:
+                                continue
+                        except ValueError:
+                            continue
+                        out.write(line)
+            for line in self._spool:
+                out.write(line)
+        os.replace(temp_path, self.export_path)
+
+    def _merge_sqlite(self):
+        """Replace this category's rows in the SQLite export in one transaction."""
+        import sqlite3  # Only needed for SQLite exports
+
+        conn = sqlite3.connect(self.export_path, timeout=LOCK_TIMEOUT_SECONDS)
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS models ("
+                    "category TEXT NOT NULL, name TEXT NOT NULL, model TEXT NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS models_category_name ON models (category, name)")
+                conn.execute("DELETE FROM models WHERE category = ?", (self.category,))
+                conn.executemany(
+                    "INSERT INTO models (category, name, model) VALUES (?, ?, ?)",
+                    (self._row(line) for line in self._spool)
+                )
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row(line):
+        """Convert a spooled JSON line to a (category, name, model JSON) row."""
+        record = json.loads(line)
+        return record["category"], record["name"], json.dumps(record["model"], ensure_ascii=False)
+
+
+class NullExporter:
+    """Stand-in used when model export is disabled."""
+
+    count = 0
+
+    def add(self, name, model):
+        pass
+
+    def close(self):
+        pass
+
+
+def open_model_exporter(category):
+    """Return an exporter for the file named by MORIA_MODEL_EXPORT, or a no-op one."""
+    export_path = os.environ.get(MODEL_EXPORT_ENV)
+    if not export_path:
+        return NullExporter()
+    return ModelExporter(category, export_path)
+
+
+def export_models(category, models, name_key="DisplayName"):
+    """Export a list of model dicts in one call; does nothing if export is disabled."""
+    exporter = open_model_exporter(category)
+    for model in models:
+        exporter.add(model.get(name_key, ""), model)
+    exporter.close()
@@ -0,0 +1,382 @@
+"""
+moria-wiki: command-line driver for the Moria Wiki Generator.
+
+Runs the same import, generator, verification and packaging code as the GUI,
+without a display, for scheduled jobs and build machines:
+
+    python moria_wiki.py import --game "C:\\Games\\ReturnToMoria"
+    python moria_wiki.py generate items weapons
+    python moria_wiki.py generate all --jobs 4
+    python moria_wiki.py build
+    python moria_wiki.py explain weapons "Steel Sword"
+    python moria_wiki.py crossref
+    python moria_wiki.py verify
+    python moria_wiki.py package --changed-only
+
+--output and --source replace the %APPDATA%\\MoriaWikiGenerator folders for the
+run (import always writes to <output>\\datajson, so it does not take --source);
+settings not given on the command line are read from the GUI's config.xml.
+With --json every log line, progress update and the final report is written to
+stdout as one JSON object per line.
+
+Exit codes: 0 on success, 1 if anything failed, 2 for usage errors and 3 when
+cancelled with Ctrl+C.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+import build_graph
+import cancellation
+import generator_runner
+import input_ledger
+import model_export
+import selection_store
+import wiki_packager
+import wiki_paths
+from page_ledger import PageLedger
+
+# Default import file budget when config.xml has none, as in the GUI
+DEFAULT_PACKAGE_MAX_KB = 1900
+
+CONFIG_FILE_NAME = "config.xml"
+SELECTION_STATES_FILE = "selection_states.xml"
+PAGE_LEDGER_FILE = "page_ledger.xml"
+
+
+def read_config():
+    """Return the GUI's saved settings as {name: text}, or {} if there are none."""
+    config_path = os.path.join(wiki_paths.get_config_dir(), CONFIG_FILE_NAME)
+    try:
+        root = ET.parse(config_path).getroot()
+    except (OSError, ET.ParseError):
+        return {}
+    return {element.tag: element.text or "" for element in root}
+
+
+def config_int(config, name, default):
+    """Return an integer setting, or default if it is missing or invalid."""
+    try:
+        return int(config.get(name, ""))
+    except ValueError:
+        return default
+
+
+class Reporter:
+    """Writes log lines, progress and the final report as text or JSON Lines."""
+
+    def __init__(self, json_output):
+        self.json_output = json_output
+        self._lock = threading.Lock()
+
+    def emit(self, event):
+        """Write one event dict."""
+        with self._lock:
+            if self.json_output:
+                print(json.dumps(event), flush=True)
+            elif event["event"] == "log":
+                print(event["message"], flush=True)
+            elif event["event"] == "report":
+                print(f"\n{event['command']}: {'ok' if event['success'] else 'failed'} "
+                      f"in {event['seconds']:.1f}s", flush=True)
+
+    def log(self, message, tag=None):
+        """log_callback for the runner and generators."""
+        self.emit({"event": "log", "message": message, "tag": tag})
+
+    def status(self, text):
+        """status_callback: shown only in JSON output."""
+        self.emit({"event": "status", "text": text})
+
+    def progress(self, text, done, total):
+        """progress_callback: shown only in JSON output."""
+        self.emit({"event": "progress", "text": text, "done": done, "total": total})
+
+
+# =============================================================================
+# COMMANDS - Each returns (success, report fields)
+# =============================================================================
+
+def command_import(args, config, reporter, cancel_token):
+    """Import the game files with retoc and UAssetGUI."""
+    game_path = args.game or config.get("game_install_path", "")
+    utilities_path = (args.utilities or config.get("utilities_path", "")
+                      or os.path.join(wiki_paths.get_config_dir(), "utilities"))
+    success, metrics = generator_runner.import_game_files(
+        game_path, wiki_paths.get_datajson_dir(), wiki_paths.get_output_dir(), utilities_path,
+        reporter.log, cancel_token, pipeline_generators=args.pipeline,
+        status_callback=reporter.status, progress_callback=reporter.progress,
+    )
+    return success, {"import": metrics.to_dict()}
+
+
+def _generate(gen_types, jobs, config, reporter, cancel_token):
+    """Run generators through the dependency scheduler."""
+    if getattr(sys, 'frozen', False):
+        workers = 1  # Embedded generators share this process's stdout
+    elif jobs:
+        workers = jobs
+    else:
+        workers = config_int(config, "generator_workers", 0) or os.cpu_count() or 1
+
+    results = generator_runner.run_generator_batch(
+        gen_types, wiki_paths.get_datajson_dir(), wiki_paths.get_output_dir(), reporter.log, workers,
+        cancel_token=cancel_token, status_callback=reporter.status, event_callback=reporter.emit,
+    )
+    success = bool(results) and all(results.get(gen_type) for gen_type in gen_types)
+    return success, {"generators": results}
+
+
+def command_generate(args, config, reporter, cancel_token):
+    """Generate one, several or all categories."""
+    names = generator_runner.generator_names()
+    if "all" in args.generators:
+        gen_types = list(names)
+    else:
+        gen_types = list(dict.fromkeys(args.generators))
+    return _generate(gen_types, args.jobs, config, reporter, cancel_token)
+
+
+def command_build(args, config, reporter, cancel_token):
+    """Run only the generators whose inputs changed since the last build."""
+    gen_types = list(generator_runner.generator_names())
+    state = build_graph.BuildState()
+    plan = build_graph.plan_build(gen_types, state)
+    if not plan:
+        reporter.log("Everything is up to date", "success")
+        return True, {"plan": {}}
+
+    for gen_type, reasons in plan.items():
+        shown = reasons[:5] + ([f"{len(reasons) - 5} more"] if len(reasons) > 5 else [])
+        reporter.log(f"{gen_type}: {'; '.join(shown)}", "info")
+    if args.dry_run:
+        return True, {"plan": plan}
+
+    success, fields = _generate(list(plan), args.jobs, config, reporter, cancel_token)
+    results = fields["generators"]
+    state.record(gen_type for gen_type in gen_types if gen_type not in plan or results.get(gen_type))
+    state.save()
+    fields["plan"] = plan
+    return success, fields
+
+
+def command_explain(args, config, reporter, cancel_token):
+    """Show the input files and table keys a page was last built from."""
+    inputs = build_graph.page_inputs(args.generator, args.page)
+    if inputs is None:
+        reporter.log(f"No build record of {args.generator} page '{args.page}'", "error")
+        return False, {}
+
+    reporter.log(f"{args.page} ({args.generator}) read these entries:")
+    for table, read in inputs["reads"].items():
+        keys = "every entry" if read["keys"] == input_ledger.ALL_KEYS else ", ".join(map(str, read["keys"]))
+        source = f" from {read['source']}" if read["source"] else ""
+        reporter.log(f"  {table}{source}: {keys}")
+    if not inputs["reads"]:
+        reporter.log("  (none recorded)")
+    reporter.log(f"Like every {args.generator} page, its model is built from:")
+    for path in inputs["generator_files"]:
+        reporter.log(f"  {path}")
+    return True, {"inputs": inputs}
+
+
+def command_crossref(args, config, reporter, cancel_token):
+    """Run cross-reference over the generated pages."""
+    return _generate(["crossreference"], 1, config, reporter, cancel_token)
+
+
+def command_verify(args, config, reporter, cancel_token):
+    """Check the trader unlock sections of the generated pages."""
+    success = generator_runner.verify_trader_unlocks(wiki_paths.get_output_dir(), reporter.log)
+    return success, {}
+
+
+def command_package(args, config, reporter, cancel_token):
+    """Package selected (or all) pages of every category into MediaWiki import files."""
+    config_dir = wiki_paths.get_config_dir()
+    wiki_base = os.path.join(wiki_paths.get_output_dir(), "wiki")
+    dest = args.dest or os.path.join(os.path.expanduser("~"), "Downloads", "wiki import")
+    max_kb = args.max_kb or config_int(config, "package_max_bytes", DEFAULT_PACKAGE_MAX_KB * 1024) // 1024
+    max_pages = args.max_pages if args.max_pages is not None else config_int(config, "package_max_pages", 0)
+    compression = args.compression or config.get("package_compression", "none") or "none"
+    changed_only = args.changed_only or config.get("package_changed_only", "false").lower() == "true"
+
+    selections = selection_store.load_selection_states(os.path.join(config_dir, SELECTION_STATES_FILE))
+    categories = []
+    for gen_type in generator_runner.generator_names():
+        states = selections.get(gen_type, {})
+        wiki_dir = os.path.join(wiki_base, gen_type)
+        if args.all_pages and os.path.isdir(wiki_dir):
+            # Every page is selected; XCL and ARC still keep a page out
+            states = {
+                name[:-5]: dict(states.get(name[:-5], {'xcl': False, 'arc': False}), sel=True)
+                for name in os.listdir(wiki_dir) if name.endswith('.wiki')
+            }
+        page_files = wiki_packager.collect_selected_pages(wiki_dir, states)
+        if page_files:
+            categories.append((gen_type, page_files))
+
+    if not categories:
+        reporter.log("No pages selected for packaging (SEL column, excluding XCL and ARC)", "warning")
+        return False, {}
+
+    ledger = PageLedger(os.path.join(config_dir, PAGE_LEDGER_FILE))
+    ledger.load()
+    ledger.begin_package()
+    results = wiki_packager.package_categories(
+        categories, dest, max_kb * 1024, max_pages, ledger, changed_only,
+        args.jobs or wiki_packager.DEFAULT_PACKAGE_WORKERS, reporter.log, compression, cancel_token
+    )
+    ledger.save()
+
+    for result in results:
+        for file_info in result.get("files", []):
+            reporter.log(f"Created {file_info['file']} with {file_info['pages']} pages "
+                         f"({file_info['stored_bytes'] // 1024} KB)", "info")
+    summary_path = wiki_packager.write_summary(results, dest)
+    reporter.log(f"Packaging complete. Summary: {summary_path}", "success")
+    return not any("error" in result for result in results), {"packages": results, "summary": summary_path}
+
+
+# =============================================================================
+# ARGUMENTS AND ENTRY POINT
+# =============================================================================
+
+def build_parser():
+    """Build the argument parser with one subcommand per job."""
+    parser = argparse.ArgumentParser(
+        prog="moria-wiki", description="Generate and package the Return to Moria wiki without the GUI."
+    )
+    parser.add_argument("--output", help="output folder (holds wiki\\, export\\ and datajson\\); "
+                                         "default %%APPDATA%%\\MoriaWikiGenerator\\output")
+    parser.add_argument("--source", help="UAssetGUI JSON export to generate from; default <output>\\datajson")
+    parser.add_argument("--json", action="store_true", help="write progress and the report as JSON Lines")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("import", help="extract and convert the game files")
+    command.add_argument("--game", help="game installation folder (default from config.xml)")
+    command.add_argument("--utilities", help="folder holding retoc.exe and UAssetGUI.exe")
+    command.add_argument("--pipeline", action="store_true",
+                         help="run generators as soon as their data tables are converted")
+    command.set_defaults(handler=command_import)
+
+    command = commands.add_parser("generate", help="generate wiki pages")
+    command.add_argument("generators", nargs="+", metavar="GENERATOR",
+                         choices=list(generator_runner.generator_names()) + ["all"],
+                         help="generator types to run, or 'all' (includes cross-reference)")
+    command.add_argument("-j", "--jobs", type=int, default=0,
+                         help="generators run at once (default from config.xml, else one per CPU core)")
+    command.add_argument("--full", action="store_true",
+                         help="rewrite every page, not just those whose inputs changed")
+    command.set_defaults(handler=command_generate)
+
+    command = commands.add_parser("build", help="run only the generators whose inputs changed since the last build")
+    command.add_argument("-j", "--jobs", type=int, default=0,
+                         help="generators run at once (default from config.xml, else one per CPU core)")
+    command.add_argument("--dry-run", action="store_true", help="list what would run and why, without running it")
+    command.set_defaults(handler=command_build)
+
+    command = commands.add_parser("explain", help="show the inputs a page was last built from")
+    command.add_argument("generator", choices=[name for name in generator_runner.generator_names()
+                                               if name != "crossreference"])
+    command.add_argument("page", help="page title (the file name without .wiki)")
+    command.set_defaults(handler=command_explain)
+
+    command = commands.add_parser("crossref", help="add cross-reference links to the generated pages")
+    command.set_defaults(handler=command_crossref)
+
+    command = commands.add_parser("verify", help="check trader unlock sections")
+    command.set_defaults(handler=command_verify)
+
+    command = commands.add_parser("package", help="package pages into MediaWiki import files")
+    command.add_argument("--all-pages", action="store_true",
+                         help="package every generated page, not just those with SEL checked")
+    command.add_argument("--changed-only", action="store_true",
+                         help="skip pages unchanged since they were last imported")
+    command.add_argument("--max-kb", type=int, help="size budget per import file in KB")
+    command.add_argument("--max-pages", type=int, help="page cap per import file; 0 for no cap")
+    command.add_argument("--compression", choices=["none", "gzip", "bz2"])
+    command.add_argument("--dest", help="folder to write the import files to (default ~/Downloads/wiki import)")
+    command.add_argument("-j", "--jobs", type=int, default=0, help="categories packaged at once")
+    command.set_defaults(handler=command_package)
+
+    return parser
+
+
+def main(argv=None):
+    """Parse arguments, run the command and return the exit code."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "import" and args.source:
+        # Import always converts into <output>\datajson, which pipelined generators then read
+        parser.error("--source cannot be used with import; the tables are written to <output>\\datajson")
+
+    # Set before the generators start so their child processes inherit them
+    if args.output:
+        os.environ[wiki_paths.OUTPUT_DIR_ENV] = os.path.abspath(args.output)
+    if args.source:
+        os.environ[wiki_paths.DATAJSON_DIR_ENV] = os.path.abspath(args.source)
+
+    reporter = Reporter(args.json)
+    config = read_config()
+
+    # Export models as configured in the GUI, under this run's output folder
+    export_format = config.get("model_export_format", "none")
+    if export_format in model_export.EXPORT_FILE_NAMES:
+        os.environ.setdefault(model_export.MODEL_EXPORT_ENV, os.path.join(
+            wiki_paths.get_output_dir(), "export", model_export.EXPORT_FILE_NAMES[export_format]))
+
+    # Rewrite every page when asked to, or when the GUI has incremental generation off
+    if getattr(args, "full", False) or config.get("incremental_generation", "true").lower() == "false":
+        os.environ[input_ledger.FULL_REBUILD_ENV] = "1"
+    cancel_token = cancellation.CancellationToken()
+    cancellation.set_active_token(cancel_token)
+    outcome = {}
+
+    def run():
+        try:
+            outcome["success"], outcome["fields"] = args.handler(args, config, reporter, cancel_token)
+        except Exception as e:
+            reporter.log(f"Error: {e}", "error")
+            outcome["success"], outcome["fields"] = False, {}
+
+    start_time = time.perf_counter()
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    try:
+        while worker.is_alive():
+            try:
+                worker.join(0.2)
+            except KeyboardInterrupt:
+                if cancel_token.cancelled:
+                    raise  # Second Ctrl+C: stop without waiting
+                reporter.log("Cancellation requested (stopping after the current item)", "warning")
+                cancel_token.cancel()
+    finally:
+        cancellation.set_active_token(None)
+        cancel_token.close()
+
+    report = {
+        "event": "report",
+        "command": args.command,
+        "success": bool(outcome.get("success")) and not cancel_token.cancelled,
+        "cancelled": cancel_token.cancelled,
+        "seconds": round(time.perf_counter() - start_time, 3),
+        "output": wiki_paths.get_output_dir(),
+        "source": wiki_paths.get_datajson_dir(),
+    }
+    report.update(outcome.get("fields", {}))
+    reporter.emit(report)
+
+    if cancel_token.cancelled:
+        return cancellation.CANCELLED_EXIT_CODE
+    return 0 if report["success"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""Polling watch of the generated wiki output folders.
+
+OutputWatcher keeps an in-memory index of the .wiki files in every category
+folder under output/wiki, with each file's modification time and size. A
+background thread rescans the folders every few seconds and reports what was
+added, removed or modified since the previous scan, so the UI can apply those
+deltas instead of rebuilding its lists.
+
+Polling is used because the standard library has no portable change
+notification. On Windows os.scandir() returns each file's stat data with the
+directory listing, so a poll costs one directory read per category.
+"""
+
+import os
+import threading
+
+
+POLL_INTERVAL_SECONDS = 2.0
+
+
+def _scan_folder(folder):
+    """Return {title: (mtime_ns, size)} for the .wiki files in folder."""
+    files = {}
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.wiki'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # Deleted between listing and stat
+                files[entry.name[:-5]] = (stat.st_mtime_ns, stat.st_size)
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return files
+
+
+class OutputWatcher:
+    """Live index of the .wiki files in each category folder under wiki_root."""
+
+    def __init__(self, wiki_root, change_callback=None, interval=POLL_INTERVAL_SECONDS):
+        """
+        Args:
+            wiki_root: Folder holding one subfolder per generator category
+            change_callback: Called from the watcher thread with
+                (category, added, removed, modified) sets of titles
+            interval: Seconds between polls
+        """
+        self.wiki_root = wiki_root
+        self.change_callback = change_callback
+        self.interval = interval
+        self._index = {}  # {category: {title: (mtime_ns, size)}}
+        self._lock = threading.Lock()
+        # Serializes scans so an older listing never replaces a newer one
+        self._scan_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start polling on a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop polling after the current scan."""
+        self._stop.set()
+
+    def _run(self):
+        """Watcher thread: poll until stopped."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except OSError:
+                pass  # Output folder unavailable; try again next time
+
+    def folder(self, category):
+        """Return the folder watched for a category."""
+        return os.path.join(self.wiki_root, category)
+
+    def scan(self, category):
+        """Rescan one category folder.
+
+        Returns:
+            tuple: (added, removed, modified) sets of titles since the last scan
+        """
+        with self._scan_lock:
+            files = _scan_folder(self.folder(category))
+            with self._lock:
+                previous = self._index.get(category, {})
+                self._index[category] = files
+
+        added = files.keys() - previous.keys()
+        removed = previous.keys() - files.keys()
+        modified = {title for title in files.keys() & previous.keys() if files[title] != previous[title]}
+        return added, removed, modified
+
+    def poll(self):
+        """Rescan every category folder, reporting changes through change_callback.
+
+        The first scan of a category only records its baseline; changes are
+        reported from the next poll on.
+        """
+        categories = set()
+        if os.path.isdir(self.wiki_root):
+            with os.scandir(self.wiki_root) as entries:
+                categories.update(entry.name for entry in entries if entry.is_dir())
+        with self._lock:
+            known = set(self._index)
+        categories.update(known)
+
+        for category in sorted(categories):
+            added, removed, modified = self.scan(category)
+            if category in known and (added or removed or modified) and self.change_callback:
+                self.change_callback(category, added, removed, modified)
+
+    def files(self, category):
+        """Return {title: file_path} for a category, scanning it first if not yet indexed.
+
+        A scan made here is not reported through change_callback; the caller
+        gets the full listing instead.
+        """
+        with self._lock:
+            files = self._index.get(category)
+        if files is None:
+            self.scan(category)
+            with self._lock:
+                files = self._index[category]
+        folder = self.folder(category)
+        return {title: os.path.join(folder, f"{title}.wiki") for title in files}
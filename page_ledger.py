@@ -0,0 +1,132 @@
+"""Content-hash ledger of wiki pages already imported into the wiki.
+
+Every packaged page is staged as "pending" with the hash of its wikitext.
+Each package run calls begin_package() first, so only the latest package's
+pages are pending. Once its import files have been loaded into the wiki,
+mark_imported() moves the pending hashes into the imported set; a package
+that was never imported is simply packaged again next time. Packaging in
+"changed only" mode then skips pages whose content matches the imported
+hash, so a game patch only exports the pages it actually changed.
+
+The ledger is stored as XML in the configuration directory:
+
+    <PageLedger version="1">
+      <imported>
+        <page title="Iron Sword" hash="..."/>
+      </imported>
+      <pending>
+        <page title="Iron Sword" hash="..."/>
+      </pending>
+    </PageLedger>
+"""
+
+import hashlib
+import os
+import threading
+import xml.etree.ElementTree as ET
+
+
+LEDGER_FORMAT_VERSION = "1"
+
+
+def content_hash(content):
+    """Return the SHA-1 hex digest of a page's wikitext."""
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+class PageLedger:
+    """Tracks the content hash of every imported and pending page by title."""
+
+    def __init__(self, ledger_path):
+        self.ledger_path = ledger_path
+        self.imported = {}  # {title: hash}
+        self.pending = {}  # {title: hash}
+        # Categories may be packaged concurrently, all staging into one ledger
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Load the ledger from disk. A missing or corrupt file leaves it empty."""
+        self.imported = {}
+        self.pending = {}
+        if not os.path.exists(self.ledger_path):
+            return False
+
+        try:
+            root = ET.parse(self.ledger_path).getroot()
+        except ET.ParseError:
+            return False
+
+        for section, pages in (("imported", self.imported), ("pending", self.pending)):
+            section_elem = root.find(section)
+            if section_elem is None:
+                continue
+            for page_elem in section_elem.findall("page"):
+                title = page_elem.get("title")
+                digest = page_elem.get("hash")
+                if title and digest:
+                    pages[title] = digest
+        return True
+
+    def save(self):
+        """Write the ledger to disk atomically."""
+        from xml.dom import minidom  # Deferred; only needed when saving
+
+        root = ET.Element("PageLedger")
+        root.set("version", LEDGER_FORMAT_VERSION)
+        for section, pages in (("imported", self.imported), ("pending", self.pending)):
+            section_elem = ET.SubElement(root, section)
+            for title in sorted(pages):
+                page_elem = ET.SubElement(section_elem, "page")
+                page_elem.set("title", title)
+                page_elem.set("hash", pages[title])
+
+        # Pretty print the XML, dropping the declaration line minidom adds
+        xml_str = minidom.parseString(ET.tostring(root)).toprettyxml(indent="  ")
+        xml_str = '\n'.join(xml_str.split('\n')[1:])
+
+        temp_path = self.ledger_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write(xml_str)
+        os.replace(temp_path, self.ledger_path)
+
+    def is_unchanged(self, title, digest):
+        """Check if a page's content matches what was last imported."""
+        return self.imported.get(title) == digest
+
+    def begin_package(self):
+        """Start a new package run; pages staged by earlier runs are no longer pending."""
+        with self._lock:
+            self.pending = {}
+
+    def track(self, pages, changed_only=False, skipped_callback=None):
+        """Stage each (title, content) page as pending and yield it on.
+
+        With changed_only, pages identical to their imported version are not
+        yielded and are reported through skipped_callback instead.
+        """
+        for title, content in pages:
+            digest = content_hash(content)
+            if changed_only and self.is_unchanged(title, digest):
+                if skipped_callback:
+                    skipped_callback(title)
+                continue
+            with self._lock:
+                self.pending[title] = digest
+            yield title, content
+
+    def record_imported(self, title, content):
+        """Record a single page as imported, e.g. after a direct API upload."""
+        digest = content_hash(content)
+        with self._lock:
+            self.imported[title] = digest
+            if self.pending.get(title) == digest:
+                del self.pending[title]
+
+    def mark_imported(self):
+        """Record the latest package's pages as imported and return how many there were."""
+        with self._lock:
+            count = len(self.pending)
+            self.imported.update(self.pending)
+            self.pending = {}
+        return count
@@ -0,0 +1,146 @@
+"""In-memory full-text search over generated wiki pages.
+
+PageSearchIndex keeps, per generator category, an inverted index from each word
+in a page's title and wikitext to the pages containing it. A query is looked up
+by its longest word (matched as a word prefix, so results appear while the
+word is still being typed), and the candidates are then checked for the whole
+query as a case-insensitive substring. Queries such as "Nogrod" or
+"{{LI|Durin's Folk" therefore behave like a plain text search, with matches
+starting at the beginning of a word.
+
+refresh_category() re-reads only the files whose modification time changed, so
+the index can be kept current after every generator run. Updates and searches
+may run on different threads.
+"""
+
+import bisect
+import os
+import re
+import threading
+
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def _words(text):
+    """Return the set of lowercase words in text."""
+    return set(WORD_PATTERN.findall(text.lower()))
+
+
+class _CategoryIndex:
+    """Pages and postings of one generator category."""
+
+    def __init__(self):
+        self.pages = {}  # {title: (mtime_ns, lowercase title + wikitext)}
+        self.postings = {}  # {word: set of titles}
+        self._sorted_words = None  # Rebuilt on demand for prefix lookups
+
+    def add(self, title, text, mtime_ns):
+        self.remove(title)
+        text = f"{title}\n{text}".lower()
+        self.pages[title] = (mtime_ns, text)
+        for word in _words(text):
+            self.postings.setdefault(word, set()).add(title)
+        self._sorted_words = None
+
+    def remove(self, title):
+        page = self.pages.pop(title, None)
+        if page is None:
+            return
+        for word in _words(page[1]):
+            titles = self.postings.get(word)
+            if titles is not None:
+                titles.discard(title)
+                if not titles:
+                    del self.postings[word]
+        self._sorted_words = None
+
+    def titles_with_prefix(self, prefix):
+        """Return the titles containing a word that starts with prefix."""
+        if self._sorted_words is None:
+            self._sorted_words = sorted(self.postings)
+        words = self._sorted_words
+        titles = set()
+        for i in range(bisect.bisect_left(words, prefix), len(words)):
+            if not words[i].startswith(prefix):
+                break
+            titles.update(self.postings[words[i]])
+        return titles
+
+
+class PageSearchIndex:
+    """Inverted index over the .wiki pages of every generator category."""
+
+    def __init__(self):
+        self._categories = {}  # {category: _CategoryIndex}
+        self._lock = threading.Lock()
+        # Serializes refreshes so two threads never re-read the same directory at once
+        self._refresh_lock = threading.Lock()
+
+    def add_page(self, category, title, content, mtime_ns=0):
+        """Index (or re-index) one page."""
+        with self._lock:
+            self._categories.setdefault(category, _CategoryIndex()).add(title, content, mtime_ns)
+
+    def remove_page(self, category, title):
+        """Remove one page from the index."""
+        with self._lock:
+            index = self._categories.get(category)
+            if index is not None:
+                index.remove(title)
+
+    def refresh_category(self, category, wiki_dir):
+        """Bring a category up to date with the .wiki files in wiki_dir.
+
+        New and modified files are read and indexed; pages whose file is gone
+        are dropped.
+
+        Returns:
+            int: Number of pages added, updated or removed
+        """
+        with self._refresh_lock:
+            with self._lock:
+                index = self._categories.setdefault(category, _CategoryIndex())
+                known = {title: page[0] for title, page in index.pages.items()}
+
+            found = set()
+            changes = 0
+            if os.path.isdir(wiki_dir):
+                with os.scandir(wiki_dir) as entries:
+                    for entry in entries:
+                        if not entry.name.endswith('.wiki'):
+                            continue
+                        title = entry.name[:-5]
+                        found.add(title)
+                        try:
+                            mtime_ns = entry.stat().st_mtime_ns
+                            if known.get(title) == mtime_ns:
+                                continue
+                            with open(entry.path, 'r', encoding='utf-8') as f:
+                                content = f.read()
+                        except (OSError, UnicodeDecodeError):
+                            continue
+                        self.add_page(category, title, content, mtime_ns)
+                        changes += 1
+
+            for title in known.keys() - found:
+                self.remove_page(category, title)
+                changes += 1
+            return changes
+
+    def search(self, query, category):
+        """Return the set of titles in category whose title or wikitext contains query."""
+        query = query.strip().lower()
+        with self._lock:
+            index = self._categories.get(category)
+            if index is None:
+                return set()
+            if not query:
+                return set(index.pages)
+
+            words = WORD_PATTERN.findall(query)
+            if words:
+                candidates = index.titles_with_prefix(max(words, key=len))
+            else:
+                candidates = index.pages.keys()
+            return {title for title in candidates if query in index.pages[title][1]}
@@ -0,0 +1,81 @@
+"""LRU cache of page contents shown in the Contents pane.
+
+Entries are keyed by file path and validated against the file's modification
+time and size, so a page regenerated by a generator run is read again. The
+cache is bounded by both entry count and total characters, and is safe to use
+from the Tk thread and background prefetch threads at once.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_MAX_CHARS = 8 * 1024 * 1024
+
+
+def _file_signature(file_path):
+    """Return (mtime_ns, size) for a file."""
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class PreviewCache:
+    """Recently viewed page contents, least recently used evicted first."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_chars=DEFAULT_MAX_CHARS):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries = OrderedDict()  # {file_path: (signature, content)}
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def get(self, file_path):
+        """Return the cached content if the file is unchanged, else None."""
+        try:
+            signature = _file_signature(file_path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is None or entry[0] != signature:
+                return None
+            self._entries.move_to_end(file_path)
+            return entry[1]
+
+    def load(self, file_path):
+        """Return the file's content, reading and caching it if needed.
+
+        Raises:
+            OSError, UnicodeDecodeError: If the file cannot be read
+        """
+        content = self.get(file_path)
+        if content is not None:
+            return content
+
+        signature = _file_signature(file_path)
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        self._store(file_path, signature, content)
+        return content
+
+    def _store(self, file_path, signature, content):
+        """Add an entry and evict the least recently used ones over the limits."""
+        with self._lock:
+            old = self._entries.pop(file_path, None)
+            if old is not None:
+                self._chars -= len(old[1])
+            if len(content) > self.max_chars:
+                return  # Too large to keep; it is still returned to the caller
+            self._entries[file_path] = (signature, content)
+            self._chars += len(content)
+            while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
@@ -0,0 +1,130 @@
+"""Persistence of the selection list's XCL/ARC/SEL checkbox states.
+
+States are stored as XML in the configuration directory:
+
+    <SelectionStates version="0.9">
+      <generator type="items">
+        <item name="Iron Sword" xcl="0" arc="0" sel="1"/>
+      </generator>
+    </SelectionStates>
+
+SelectionStateWriter writes snapshots on a background thread. Snapshots
+submitted while a write is in progress replace each other, so a burst of
+changes costs one write of the latest state.
+"""
+
+import os
+import threading
+import xml.etree.ElementTree as ET
+
+
+def load_selection_states(states_file):
+    """Load {gen_type: {name: {'xcl', 'arc', 'sel'}}} from the XML file.
+
+    A missing file gives an empty dict; a corrupt one raises ET.ParseError.
+    """
+    if not os.path.exists(states_file):
+        return {}
+
+    root = ET.parse(states_file).getroot()
+    states = {}
+    for gen_elem in root.findall("generator"):
+        gen_type = gen_elem.get("type")
+        if gen_type:
+            states[gen_type] = {}
+            for item_elem in gen_elem.findall("item"):
+                item_name = item_elem.get("name")
+                # Load checkbox states (xcl, arc, sel as booleans)
+                xcl = item_elem.get("xcl", "0") == "1"
+                arc = item_elem.get("arc", "0") == "1"
+                sel = item_elem.get("sel", "0") == "1"
+                if item_name:
+                    states[gen_type][item_name] = {'xcl': xcl, 'arc': arc, 'sel': sel}
+    return states
+
+
+def snapshot_selection_states(states):
+    """Copy the states so they can be written while the original keeps changing."""
+    return {gen_type: {name: dict(state) for name, state in items.items()}
+            for gen_type, items in states.items()}
+
+
+def write_selection_states(states_file, states, version):
+    """Write the states to the XML file atomically."""
+    from xml.dom import minidom  # Deferred; only needed when saving
+
+    root = ET.Element("SelectionStates")
+    root.set("version", version)
+
+    for gen_type, items in states.items():
+        gen_elem = ET.SubElement(root, "generator")
+        gen_elem.set("type", gen_type)
+
+        for item_name, state in items.items():
+            item_elem = ET.SubElement(gen_elem, "item")
+            item_elem.set("name", item_name)
+            # Save checkbox states as 0/1
+            item_elem.set("xcl", "1" if state.get('xcl', False) else "0")
+            item_elem.set("arc", "1" if state.get('arc', False) else "0")
+            item_elem.set("sel", "1" if state.get('sel', False) else "0")
+
+    # Pretty print the XML, dropping the declaration line minidom adds
+    xml_str = minidom.parseString(ET.tostring(root)).toprettyxml(indent="  ")
+    xml_str = '\n'.join(xml_str.split('\n')[1:])
+
+    temp_path = states_file + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write(xml_str)
+    os.replace(temp_path, states_file)
+
+
+class SelectionStateWriter:
+    """Writes submitted state snapshots to disk on a background thread."""
+
+    def __init__(self, states_file, version, error_callback=None):
+        self.states_file = states_file
+        self.version = version
+        self.error_callback = error_callback
+        self._pending = None
+        self._writing = False
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def submit(self, states):
+        """Queue a snapshot for writing, replacing any snapshot not yet written."""
+        with self._condition:
+            self._pending = states
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """Wait until every submitted snapshot has been written.
+
+        Returns:
+            bool: False if the timeout expired first
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._pending is None and not self._writing, timeout
+            )
+
+    def _run(self):
+        """Writer thread: write the latest snapshot whenever one is queued."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None)
+                states = self._pending
+                self._pending = None
+                self._writing = True
+            try:
+                write_selection_states(self.states_file, states, self.version)
+            except Exception as e:
+                if self.error_callback:
+                    self.error_callback(e)
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
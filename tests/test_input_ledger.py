@@ -0,0 +1,56 @@
+"""Incremental runs of an InputLedger must write the same pages as a full run."""
+
+import os
+
+import input_ledger
+import wiki_paths
+from input_ledger import InputLedger
+
+
+def run_generator(output_dir, models):
+    """Write one page per (title, text) model the way the generators do."""
+    ledger = InputLedger("test", __file__)
+    for title, text in models:
+        filepath = os.path.join(output_dir, title + ".wiki")
+        if ledger.is_current(title, {"text": text}, filepath):
+            continue
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(text)
+        ledger.record()
+    ledger.save()
+    return ledger
+
+
+def read_page(output_dir, title):
+    with open(os.path.join(output_dir, title + ".wiki"), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_duplicate_titles_match_full_run(tmp_path, monkeypatch):
+    monkeypatch.setenv(wiki_paths.OUTPUT_DIR_ENV, str(tmp_path))
+    pages = tmp_path / "pages"
+    pages.mkdir()
+    models = [("Page", "A"), ("Other", "C"), ("Page", "B")]
+
+    monkeypatch.setenv(input_ledger.FULL_REBUILD_ENV, "1")
+    run_generator(str(pages), models)
+    assert read_page(str(pages), "Page") == "B"
+
+    monkeypatch.delenv(input_ledger.FULL_REBUILD_ENV)
+    for _ in range(2):
+        ledger = run_generator(str(pages), models)
+        assert read_page(str(pages), "Page") == "B"
+        assert read_page(str(pages), "Other") == "C"
+        assert ledger.pages["Page"]["model"] == input_ledger.digest({"text": "B"})
+        assert ledger.unchanged >= 1  # "Other" is left alone
+
+
+def test_unchanged_pages_are_skipped(tmp_path, monkeypatch):
+    monkeypatch.setenv(wiki_paths.OUTPUT_DIR_ENV, str(tmp_path))
+    monkeypatch.delenv(input_ledger.FULL_REBUILD_ENV, raising=False)
+    models = [("One", "1"), ("Two", "2")]
+
+    assert run_generator(str(tmp_path), models).written == 2
+    ledger = run_generator(str(tmp_path), [("One", "1"), ("Two", "changed")])
+    assert (ledger.written, ledger.unchanged) == (1, 1)
+    assert read_page(str(tmp_path), "Two") == "changed"
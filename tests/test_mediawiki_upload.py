@@ -0,0 +1,220 @@
+"""Upload against a local stand-in for the MediaWiki action API."""
+
+import hashlib
+import json
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import cancellation
+import mediawiki_upload
+from mediawiki_upload import MediaWikiClient, UploadProgress, upload_pages, wikitext_sha1
+
+
+class FakeWiki:
+    """State of the stand-in wiki and the requests it received."""
+
+    def __init__(self):
+        self.pages = {}  # {title: text}
+        self.hidden_sha1 = set()  # Existing pages whose revision hash is suppressed
+        self.csrf_tokens = 0
+        self.expire_next_token = False
+        self.rate_limit_edits = 0  # Edits answered with 429 before one succeeds
+        self.edits = []  # (title, params)
+        self.lock = threading.Lock()
+
+    def handle(self, params, cookie):
+        action = params.get("action")
+        if action == "query" and params.get("meta") == "tokens":
+            if params["type"] == "login":
+                return {"query": {"tokens": {"logintoken": "login-token"}}}, {"Set-Cookie": "session=s1"}
+            if cookie != "session=s1":
+                return {"error": {"code": "notloggedin", "info": ""}}, {}
+            self.csrf_tokens += 1
+            return {"query": {"tokens": {"csrftoken": f"csrf-{self.csrf_tokens}"}}}, {}
+        if action == "login":
+            ok = params.get("lgtoken") == "login-token" and params.get("lgpassword") == "secret"
+            return {"login": {"result": "Success" if ok else "Failed"}}, {}
+        if action == "query" and params.get("prop") == "revisions":
+            pages = []
+            for title in params["titles"].split("|"):
+                if title not in self.pages:
+                    pages.append({"title": title, "missing": True})
+                elif title in self.hidden_sha1:
+                    pages.append({"title": title, "revisions": [{"sha1hidden": True}]})
+                else:
+                    sha1 = hashlib.sha1(self.pages[title].encode('utf-8')).hexdigest()
+                    pages.append({"title": title, "revisions": [{"sha1": sha1}]})
+            return {"query": {"pages": pages}}, {}
+        if action == "edit":
+            return self.edit(params), {}
+        return {"error": {"code": "badrequest", "info": action}}, {}
+
+    def edit(self, params):
+        with self.lock:
+            if self.rate_limit_edits:
+                self.rate_limit_edits -= 1
+                return 429
+            if self.expire_next_token:
+                self.expire_next_token = False
+                return {"error": {"code": "badtoken", "info": "Invalid CSRF token."}}
+            if params.get("token") != f"csrf-{self.csrf_tokens}":
+                return {"error": {"code": "badtoken", "info": "Invalid CSRF token."}}
+            title = params["title"]
+            if params.get("createonly") and title in self.pages:
+                return {"error": {"code": "articleexists", "info": ""}}
+            if params.get("nocreate") and title not in self.pages:
+                return {"error": {"code": "missingtitle", "info": ""}}
+            self.pages[title] = params["text"]
+            self.edits.append((title, params))
+            return {"edit": {"result": "Success", "title": title}}
+
+
+@pytest.fixture
+def wiki():
+    state = FakeWiki()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, like the client expects
+
+        def do_GET(self):
+            self.respond(urllib.parse.urlsplit(self.path).query)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.respond(self.rfile.read(length).decode('utf-8'))
+
+        def respond(self, query):
+            params = dict(urllib.parse.parse_qsl(query))
+            result, headers = state.handle(params, self.headers.get("Cookie"))
+            if result == 429:
+                body, status, headers = b"Too many requests", 429, {"Retry-After": "0"}
+            else:
+                body, status = json.dumps(result).encode('utf-8'), 200
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.api_url = f"http://127.0.0.1:{server.server_address[1]}/w/api.php"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(wiki):
+    client = MediaWikiClient(wiki.api_url, timeout=5)
+    client.login("Bot@upload", "secret")
+    yield client
+    client.close()
+
+
+def test_login_fetches_csrf_token(wiki, client):
+    assert client.csrf_token == "csrf-1"
+    with pytest.raises(mediawiki_upload.MediaWikiAPIError):
+        MediaWikiClient(wiki.api_url, timeout=5).login("Bot@upload", "wrong")
+
+
+def test_unchanged_pages_are_skipped_by_sha1(wiki, client, tmp_path):
+    wiki.pages = {"Same": "Same text", "Old": "Old text"}
+    progress = UploadProgress(str(tmp_path / "progress.json"), wiki.api_url)
+    pages = [("Same", "Same text\r\n"), ("Old", "New text"), ("New", "Created")]
+
+    results = upload_pages(client, pages, progress, max_workers=2)
+
+    assert (results["uploaded"], results["unchanged"], results["failed"]) == (2, 1, [])
+    assert wiki.pages == {"Same": "Same text", "Old": "New text", "New": "Created"}
+    edited = {title: params for title, params in wiki.edits}
+    assert "nocreate" in edited["Old"] and "createonly" in edited["New"]
+
+
+def test_existing_page_with_hidden_sha1_is_edited_not_created(wiki, client, tmp_path):
+    wiki.pages = {"Hidden": "Suppressed"}
+    wiki.hidden_sha1 = {"Hidden"}
+    progress = UploadProgress(str(tmp_path / "progress.json"), wiki.api_url)
+
+    results = upload_pages(client, [("Hidden", "Replacement")], progress)
+
+    assert (results["uploaded"], results["failed"]) == (1, [])
+    assert "nocreate" in wiki.edits[0][1]
+
+
+def test_badtoken_refreshes_csrf_token(wiki, client, tmp_path):
+    wiki.expire_next_token = True
+    progress = UploadProgress(str(tmp_path / "progress.json"), wiki.api_url)
+
+    results = upload_pages(client, [("Page", "Text")], progress)
+
+    assert (results["uploaded"], results["failed"]) == (1, [])
+    assert client.csrf_token == "csrf-2"
+
+
+def test_rate_limit_waits_for_retry_after(wiki, client, tmp_path):
+    wiki.rate_limit_edits = 2
+    progress = UploadProgress(str(tmp_path / "progress.json"), wiki.api_url)
+
+    results = upload_pages(client, [("Page", "Text")], progress)
+
+    assert (results["uploaded"], results["failed"]) == (1, [])
+    assert wiki.rate_limit_edits == 0
+
+
+def test_resume_skips_pages_in_progress_file(wiki, client, tmp_path):
+    progress_path = str(tmp_path / "progress.json")
+    progress = UploadProgress(progress_path, wiki.api_url)
+    progress.record("Done", wikitext_sha1("Done text"))
+    progress.save()
+
+    resumed = UploadProgress(progress_path, wiki.api_url)
+    assert resumed.load()
+    results = upload_pages(client, [("Done", "Done text"), ("Todo", "Todo text")], resumed)
+
+    assert (results["resumed"], results["uploaded"]) == (1, 1)
+    assert [title for title, _ in wiki.edits] == ["Todo"]
+
+    # Progress recorded for another wiki is not used
+    other = UploadProgress(progress_path, "http://other.example/api.php")
+    other.load()
+    assert not other.is_done("Done", wikitext_sha1("Done text"))
+
+
+def test_close_closes_every_thread_connection(wiki, client, tmp_path):
+    progress = UploadProgress(str(tmp_path / "progress.json"), wiki.api_url)
+    upload_pages(client, [(f"Page {i}", f"Text {i}") for i in range(8)], progress, max_workers=4)
+    connections = list(client._connections)
+    assert len(connections) > 1
+
+    client.close()
+
+    assert client._connections == []
+    assert all(conn.sock is None for conn in connections)
+
+
+def test_cancel_stops_before_the_next_batch(wiki, client, tmp_path, monkeypatch):
+    monkeypatch.setattr(mediawiki_upload, "QUERY_BATCH_SIZE", 2)
+    token = cancellation.CancellationToken()
+    progress = UploadProgress(str(tmp_path / "progress.json"), wiki.api_url)
+
+    def cancel_after_first_batch(pages_done):
+        token.cancel()
+
+    pages = [(f"Page {i}", f"Text {i}") for i in range(6)]
+    try:
+        results = upload_pages(client, pages, progress, progress_callback=cancel_after_first_batch,
+                               cancel_token=token)
+    finally:
+        token.close()
+
+    assert results["cancelled"] and results["uploaded"] == 2
+    assert sorted(wiki.pages) == ["Page 0", "Page 1"]
@@ -0,0 +1,44 @@
+"""Packaging pages into numbered import files."""
+
+import os
+
+import wiki_packager
+
+
+def write_pages(folder, count):
+    """Write count small .wiki pages and return their (title, file_path) pairs."""
+    page_files = []
+    for i in range(count):
+        path = os.path.join(folder, f"Page {i}.wiki")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"Text of page {i}\n" * 20)
+        page_files.append((f"Page {i}", path))
+    return page_files
+
+
+def test_earlier_import_files_are_replaced(tmp_path):
+    page_files = write_pages(str(tmp_path), 6)
+    output_dir = tmp_path / "import"
+    output_dir.mkdir()
+    (output_dir / "tools_import_01.xml").write_text("other category")
+
+    wiki_packager.package_pages(page_files, str(output_dir), "items", max_bytes=1024 * 1024, max_pages=2)
+    result = wiki_packager.package_pages(page_files[:2], str(output_dir), "items", max_bytes=1024 * 1024,
+                                         max_pages=2, compression="gzip")
+
+    assert [file_info["file"] for file_info in result["files"]] == ["items_import_01.xml.gz"]
+    assert sorted(os.listdir(output_dir)) == ["items_import_01.xml.gz", "tools_import_01.xml"]
+
+
+def test_progress_counts_pages_that_fail_to_read(tmp_path):
+    page_files = write_pages(str(tmp_path), 3)
+    page_files.insert(1, ("Missing", str(tmp_path / "Missing.wiki")))
+    progress = []
+    errors = []
+
+    result = wiki_packager.package_pages(page_files, str(tmp_path), "items", max_bytes=1024 * 1024,
+                                         log_callback=errors.append,
+                                         progress_callback=lambda done, total: progress.append((done, total)))
+
+    assert result["pages"] == 3 and len(errors) == 1
+    assert progress[-1] == (4, 4)
@@ -6,78 +6,41 @@ This application embeds all wiki generator functionality and does not require
 external script files. Configuration and data are stored in %APPDATA%\\MoriaWikiGenerator.
 """
 
+import time
+
+# Taken before the other imports so the startup time reported includes them
+STARTUP_TIME = time.perf_counter()
+
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext, filedialog
+from tkinter import ttk, messagebox, scrolledtext, filedialog, simpledialog
 import threading
-import subprocess
-import shutil
+from concurrent.futures import ThreadPoolExecutor
 import os
 import sys
 import json
+import queue
 import re
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
-
-
-# =============================================================================
-# EMBEDDED GENERATOR FUNCTIONS
-# =============================================================================
 
-def get_generator_function(gen_type):
-    """Get the generator function for the given type."""
-    generators = {
-        "items": generate_items_wiki,
-        "consumables": generate_consumables_wiki,
-        "constructions": generate_constructions_wiki,
-        "weapons": generate_weapons_wiki,
-        "armor": generate_armor_wiki,
-        "tools": generate_tools_wiki,
-        "ores": generate_ores_wiki,
-        "brews": generate_brews_wiki,
-        "runes": generate_runes_wiki,
-        "storage": generate_storage_wiki,
-        "tradegoods": generate_tradegoods_wiki,
-        "crossreference": generate_crossreference_wiki,
-    }
-    return generators.get(gen_type)
-
-
-def verify_trader_unlocks(output_path, log_callback):
-    """Verify that all trader items have correct unlock sections."""
-    log_callback("Verifying trader unlock sections...")
-
-    # List of items that should have trader unlocks
-    trader_items = [
-        "Northern Wool", "Shell", "Coastal Marble", "Elven Silk",
-        "Elanor Seed", "Niphredil Seed", "Fireclay Brick", "Sea Wax",
-        "Ithildin Ingot", "Pumpkin Seed", "Sweetroot Seed",
-        "Salt-cured Fish", "Saffron", "Southern Oil", "Whale Tallow",
-        "Thanazutsam", "Pumice", "Volcanic Glass", "Red Sandstone",
-        "Drakhbarzin", "Crimson Fire Brazier", "White Tree Replica",
-        "Hanging Cookware"
-    ]
-
-    found_count = 0
-    missing_count = 0
-
-    # Search through output directories
-    for root, dirs, files in os.walk(output_path):
-        for filename in files:
-            if filename.endswith('.wiki'):
-                item_name = filename[:-5]  # Remove .wiki extension
-                if item_name in trader_items or item_name.rstrip() in trader_items:
-                    filepath = os.path.join(root, filename)
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    if "== Unlock ==" in content and "Trader" in content:
-                        found_count += 1
-                        log_callback(f"  OK: {item_name}")
-                    else:
-                        missing_count += 1
-                        log_callback(f"  MISSING: {item_name}")
-
-    log_callback(f"\nResults: {found_count} found, {missing_count} missing")
-    return missing_count == 0
+# subprocess, shutil, minidom and mediawiki_upload (http.client, urllib) are
+# imported where they are used, keeping them off the startup path
+import cancellation
+import datajson_cache
+import generator_metrics
+import input_ledger
+import mediawiki_export
+import model_export
+import selection_store
+import wiki_packager
+from output_watcher import OutputWatcher
+from page_ledger import PageLedger
+from page_search import PageSearchIndex
+from preview_cache import PreviewCache
+from generator_runner import (
+    GENERATOR_HISTORY_FILE, GENERATORS, PROGRESS_UPDATE_INTERVAL,
+    get_generator_function, import_game_files, run_generator_batch, verify_trader_unlocks,
+)
+from wiki_paths import get_config_dir
 
 
 # =============================================================================
@@ -136,8 +99,7 @@ MATERIAL_KEY_MAP = {
 
 def load_string_table(filepath):
     """Load a single string table file and return a key->value dictionary."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = datajson_cache.load_json(filepath)
 
     string_map = {}
     exports = data.get("Exports", [])
@@ -173,8 +135,7 @@ def load_all_string_tables(strings_dir, log_callback=None):
 
 def load_data_table(filepath):
     """Load a data table JSON file and return the list of entries."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = datajson_cache.load_json(filepath)
 
     entries = []
     exports = data.get("Exports", [])
@@ -192,8 +153,7 @@ def load_recipe_data(filepath):
     if not os.path.exists(filepath):
         return recipes
 
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = datajson_cache.load_json(filepath)
 
     exports = data.get("Exports", [])
     for export in exports:
@@ -275,177 +235,6 @@ def load_unlock_overrides(override_file):
     return campaign_overrides, sandbox_overrides
 
 
-# =============================================================================
-# STANDALONE SCRIPT RUNNER
-# =============================================================================
-
-def _get_script_dir():
-    """Get the directory containing the standalone generator scripts."""
-    if getattr(sys, 'frozen', False):
-        # Running as compiled executable - check PyInstaller's temp directory first
-        # For onefile builds, files are extracted to _MEIPASS
-        base_path = getattr(sys, '_MEIPASS', os.path.dirname(sys.executable))
-        # Scripts are in the 'generators' subdirectory within the bundle
-        script_dir = os.path.join(base_path, 'generators')
-        if not os.path.exists(script_dir):
-            # Fallback to executable directory (for onedir builds or if placed alongside exe)
-            script_dir = os.path.dirname(sys.executable)
-    else:
-        # Running as script
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-    return script_dir
-
-
-def _run_standalone_script(script_name, log_callback):
-    """Run a standalone generator script and capture its output."""
-    # Check if running as frozen executable
-    if getattr(sys, 'frozen', False):
-        # When frozen, import and run the generator module directly
-        return _run_embedded_generator(script_name, log_callback)
-
-    # Running as normal Python script - use subprocess
-    script_dir = _get_script_dir()
-    script_path = os.path.join(script_dir, script_name)
-
-    if not os.path.exists(script_path):
-        log_callback(f"Error: Script not found: {script_path}")
-        return False
-
-    log_callback(f"Running {script_name}...")
-
-    try:
-        # Run the script and capture output in real-time
-        process = subprocess.Popen(
-            [sys.executable, script_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            cwd=script_dir,
-            bufsize=1
-        )
-
-        # Read output line by line
-        for line in process.stdout:
-            log_callback(line.rstrip())
-
-        process.wait()
-
-        if process.returncode == 0:
-            log_callback(f"  {script_name} completed successfully")
-            return True
-        else:
-            log_callback(f"  {script_name} failed with return code {process.returncode}")
-            return False
-
-    except Exception as e:
-        log_callback(f"Error running {script_name}: {str(e)}")
-        return False
-
-
-def _run_embedded_generator(script_name, log_callback):
-    """Import and run an embedded generator module when running as frozen executable."""
-    import importlib
-    import io
-    from contextlib import redirect_stdout
-
-    # Convert script name to module name (e.g., "generate_armor_wiki.py" -> "generate_armor_wiki")
-    module_name = script_name.replace('.py', '')
-
-    log_callback(f"Running {script_name} (embedded)...")
-
-    try:
-        # Import the embedded module
-        module = importlib.import_module(module_name)
-
-        # Capture stdout to display in log
-        output_buffer = io.StringIO()
-
-        # Run the module's main function with captured output
-        with redirect_stdout(output_buffer):
-            if hasattr(module, 'main'):
-                module.main()
-            else:
-                log_callback(f"Warning: {module_name} has no main() function")
-                return False
-
-        # Log the captured output
-        output = output_buffer.getvalue()
-        for line in output.splitlines():
-            log_callback(line)
-
-        log_callback(f"  {script_name} completed successfully")
-        return True
-
-    except Exception as e:
-        log_callback(f"Error running {script_name}: {str(e)}")
-        import traceback
-        log_callback(traceback.format_exc())
-        return False
-
-
-# =============================================================================
-# GENERATOR FUNCTIONS - Call standalone scripts
-# =============================================================================
-
-def generate_items_wiki(source_path, output_path, log_callback):
-    """Generate wiki pages for items using standalone script."""
-    return _run_standalone_script("generate_items_wiki.py", log_callback)
-
-
-def generate_consumables_wiki(source_path, output_path, log_callback):
-    """Generate wiki pages for consumables using standalone script."""
-    return _run_standalone_script("generate_consumables_wiki.py", log_callback)
-
-
-def generate_constructions_wiki(source_path, output_path, log_callback):
-    """Generate wiki pages for constructions using standalone script."""
-    return _run_standalone_script("generate_constructions_wiki.py", log_callback)
-
-
-def generate_weapons_wiki(source_path, output_path, log_callback):
-    """Generate wiki pages for weapons using standalone script."""
-    return _run_standalone_script("generate_weapons_wiki.py", log_callback)
-
-
-def generate_armor_wiki(source_path, output_path, log_callback):
-    """Generate wiki pages for armor using standalone script."""
-    return _run_standalone_script("generate_armor_wiki.py", log_callback)
-
-
-def generate_tools_wiki(source_path, output_path, log_callback):
-    """Generate wiki pages for tools using standalone script."""
-    return _run_standalone_script("generate_tools_wiki.py", log_callback)
-
-
-def generate_ores_wiki(source_path, output_path, log_callback):
-    """Generate wiki pages for ores using standalone script."""
-    return _run_standalone_script("generate_ore_wiki.py", log_callback)
-
-
-def generate_brews_wiki(source_path, output_path, log_callback):
-    """Generate wiki pages for brews using standalone script."""
-    return _run_standalone_script("generate_brews_wiki.py", log_callback)
-
-
-def generate_runes_wiki(source_path, output_path, log_callback):
-    """Generate wiki pages for runes using standalone script."""
-    return _run_standalone_script("generate_runes_wiki.py", log_callback)
-
-
-def generate_storage_wiki(source_path, output_path, log_callback):
-    """Generate wiki pages for storage using standalone script."""
-    return _run_standalone_script("generate_storage_wiki.py", log_callback)
-
-
-def generate_tradegoods_wiki(source_path, output_path, log_callback):
-    """Generate wiki pages for trade goods using standalone script."""
-    return _run_standalone_script("generate_tradegoods_wiki.py", log_callback)
-
-
-def generate_crossreference_wiki(source_path, output_path, log_callback):
-    """Generate cross-reference data for wiki pages using standalone script."""
-    return _run_standalone_script("generate_crossreference_wiki.py", log_callback)
-
 # Application constants
 APP_TITLE = "Moria Wiki Generator"
 APP_VERSION = "0.9"
@@ -453,9 +242,41 @@ WINDOW_WIDTH = 900
 WINDOW_HEIGHT = 700
 
 # Configuration constants
-CONFIG_DIR_NAME = "MoriaWikiGenerator"
 CONFIG_FILE_NAME = "config.xml"
 SELECTION_STATES_FILE = "selection_states.xml"
+PAGE_LEDGER_FILE = "page_ledger.xml"
+UPLOAD_PROGRESS_FILE = "upload_progress.json"
+ICON_CACHE_DIR_NAME = "icon_cache"
+
+# Selection list rows inserted per Tk event loop pass while rendering a category
+SELECTION_RENDER_CHUNK = 500
+
+# Contents pane: pages longer than PREVIEW_CHUNK_CHARS are inserted in chunks,
+# and PREVIEW_PREFETCH_ROWS rows either side of the selection are read ahead
+PREVIEW_CHUNK_CHARS = 64 * 1024
+PREVIEW_PREFETCH_ROWS = 2
+
+# Checkbox changes within this many milliseconds are saved together
+SELECTION_SAVE_DELAY_MS = 500
+
+# Output log: queued lines are inserted in batches every LOG_PUMP_INTERVAL_MS,
+# and only the last LOG_MAX_LINES lines are kept in the window
+LOG_PUMP_INTERVAL_MS = 50
+LOG_PUMP_BATCH_LINES = 2000
+LOG_MAX_LINES = 5000
+LOG_FILE_NAME = "output.log"
+
+# Run Stats tab: earlier runs listed under each generator, and how much slower
+# (in percent) than the median of its previous RUN_STATS_BASELINE_RUNS runs a
+# run must be to be highlighted
+RUN_STATS_HISTORY_ROWS = 20
+RUN_STATS_BASELINE_RUNS = 5
+RUN_STATS_SLOWER_PERCENT = 20
+
+# Packaging limits for MediaWiki XML import files. The default stays under the
+# common 2 MB PHP upload_max_filesize used by Special:Import.
+DEFAULT_PACKAGE_MAX_BYTES = 1900 * 1024
+MIN_PACKAGE_MAX_BYTES = 64 * 1024
 
 # Known game installation paths
 GAME_PATHS = {
@@ -492,20 +313,16 @@ def get_default_utilities_path():
     return os.path.join(get_config_dir(), "utilities")
 
 
-def get_config_dir():
-    """Get the configuration directory path in %APPDATA%."""
-    appdata = os.environ.get("APPDATA")
-    if not appdata:
-        # Fallback for non-Windows systems
-        appdata = os.path.expanduser("~")
-    return os.path.join(appdata, CONFIG_DIR_NAME)
-
-
 def get_config_path():
     """Get the full path to the configuration file."""
     return os.path.join(get_config_dir(), CONFIG_FILE_NAME)
 
 
+def get_wiki_import_dir():
+    """Get the directory packaged MediaWiki import files are written to."""
+    return os.path.join(os.path.expanduser("~"), "Downloads", "wiki import")
+
+
 class Configuration:
     """Handles loading and saving application configuration as XML."""
 
@@ -516,6 +333,17 @@ class Configuration:
         "game_install_type": "",  # Steam, Epic, or Custom
         "game_install_path": "",
         "theme_mode": "auto",  # auto, light, or dark
+        "pipeline_generators": "false",  # Run generators during import as their inputs arrive
+        "generator_workers": "0",  # Generators Run All runs at once; 0 for one per CPU core
+        "incremental_generation": "true",  # Only rewrite pages whose inputs changed since the last run
+        "log_file": "false",  # Also append the full output log to output.log
+        "package_max_bytes": str(DEFAULT_PACKAGE_MAX_BYTES),  # Byte budget per import file
+        "package_max_pages": "0",  # Optional page cap per import file; 0 for no cap
+        "package_changed_only": "false",  # Only package pages changed since the last import
+        "package_compression": "none",  # none, gzip, or bz2
+        "model_export_format": "none",  # none, jsonl, or sqlite
+        "wiki_api_url": "",  # MediaWiki api.php URL for direct uploads
+        "wiki_username": "",  # Bot password username (User@BotName)
         "first_run_complete": "false",
         "window_width": str(WINDOW_WIDTH),
         "window_height": str(WINDOW_HEIGHT),
@@ -567,6 +395,7 @@ class Configuration:
             element.text = value
 
         # Pretty print the XML
+        from xml.dom import minidom
         xml_str = minidom.parseString(ET.tostring(root)).toprettyxml(indent="  ")
         # Remove the XML declaration line that minidom adds
         lines = xml_str.split('\n')
@@ -622,6 +451,112 @@ class Configuration:
         path = self.config.get("utilities_path", "")
         return path if path else get_default_utilities_path()
 
+    def is_pipeline_enabled(self):
+        """Check if generators should run while the game file import is in progress."""
+        return self.config.get("pipeline_generators", "false").lower() == "true"
+
+    def get_generator_workers(self):
+        """Get how many generators Run All may run at once.
+
+        The frozen build runs generators inside its own process, where they
+        share stdout, so it always runs them one at a time.
+        """
+        if getattr(sys, 'frozen', False):
+            return 1
+        try:
+            workers = int(self.config.get("generator_workers", "0"))
+        except ValueError:
+            workers = 0
+        return workers if workers > 0 else (os.cpu_count() or 1)
+
+    def is_incremental_enabled(self):
+        """Check if generators should skip pages whose inputs are unchanged."""
+        return self.config.get("incremental_generation", "true").lower() == "true"
+
+    def is_log_file_enabled(self):
+        """Check if the full output log should also be written to a file."""
+        return self.config.get("log_file", "false").lower() == "true"
+
+    def get_package_limits(self):
+        """Get (max_bytes, max_pages) for packaged import files.
+
+        Invalid values fall back to the defaults; a page cap of 0 means no cap.
+        """
+        try:
+            max_bytes = int(self.config.get("package_max_bytes", ""))
+        except ValueError:
+            max_bytes = DEFAULT_PACKAGE_MAX_BYTES
+        try:
+            max_pages = int(self.config.get("package_max_pages", ""))
+        except ValueError:
+            max_pages = 0
+        return max(max_bytes, MIN_PACKAGE_MAX_BYTES), max(max_pages, 0)
+
+    def get_package_compression(self):
+        """Get the compression format for packaged import files."""
+        compression = self.config.get("package_compression", "none")
+        return compression if compression in mediawiki_export.COMPRESSION_EXTENSIONS else "none"
+
+    def get_model_export_path(self):
+        """Get the model export file path, or None if model export is disabled."""
+        export_format = self.config.get("model_export_format", "none")
+        if export_format not in model_export.EXPORT_FILE_NAMES:
+            return None
+        return os.path.join(get_default_output_path(), "export", model_export.EXPORT_FILE_NAMES[export_format])
+
+    def is_package_changed_only(self):
+        """Check if packaging should skip pages unchanged since the last import."""
+        return self.config.get("package_changed_only", "false").lower() == "true"
+
+
+def load_scaled_icon(icon_path, target_size):
+    """Load an icon shrunk to about target_size pixels, from a pre-scaled cache if possible.
+
+    Tk can only shrink an image by a whole factor after decoding it at full
+    size, so the shrunk copy is saved in the config directory and loaded
+    directly on later starts.
+    """
+    name = os.path.splitext(os.path.basename(icon_path))[0]
+    cache_path = os.path.join(
+        get_config_dir(), ICON_CACHE_DIR_NAME, f"{name}_{target_size}_{os.path.getsize(icon_path)}.png"
+    )
+    if os.path.exists(cache_path):
+        try:
+            return tk.PhotoImage(file=cache_path)
+        except tk.TclError:
+            pass  # Unreadable cache file; rebuild it below
+
+    image = tk.PhotoImage(file=icon_path)
+    factor = max(1, min(image.width(), image.height()) // target_size)
+    if factor > 1:
+        image = image.subsample(factor, factor)
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            image.write(cache_path, format="png")
+        except (OSError, tk.TclError):
+            pass
+    return image
+
+
+def apply_model_export_setting(config):
+    """Point the generators at the configured model export file through the environment.
+
+    Generators run as subprocesses inherit os.environ, as do embedded ones.
+    """
+    export_path = config.get_model_export_path()
+    if export_path:
+        os.environ[model_export.MODEL_EXPORT_ENV] = export_path
+    else:
+        os.environ.pop(model_export.MODEL_EXPORT_ENV, None)
+
+
+def apply_incremental_setting(config):
+    """Ask the generators for a full rebuild through the environment when incremental generation is off."""
+    if config.is_incremental_enabled():
+        os.environ.pop(input_ledger.FULL_REBUILD_ENV, None)
+    else:
+        os.environ[input_ledger.FULL_REBUILD_ENV] = "1"
+
 
 class SetupWizard:
     """First-run setup wizard dialog."""
@@ -706,6 +641,11 @@ class SetupWizard:
         notebook.add(ui_frame, text="UI")
         self._create_ui_tab(ui_frame)
 
+        # Wiki tab
+        wiki_frame = ttk.Frame(notebook, padding="10")
+        notebook.add(wiki_frame, text="Wiki")
+        self._create_wiki_tab(wiki_frame)
+
         # Info label
         info_label = ttk.Label(
             main_frame,
@@ -971,6 +911,129 @@ class SetupWizard:
             foreground="gray"
         ).grid(row=2, column=0, sticky="w", pady=(10, 0))
 
+        # Import settings
+        import_frame = ttk.LabelFrame(parent, text="Import", padding="10")
+        import_frame.pack(fill="x", pady=(0, 15))
+
+        self.pipeline_var = tk.BooleanVar(value=self.config.is_pipeline_enabled())
+        ttk.Checkbutton(
+            import_frame,
+            text="Run generators during import as soon as their data tables are converted",
+            variable=self.pipeline_var
+        ).grid(row=0, column=0, sticky="w")
+
+        # Generator settings
+        run_all_frame = ttk.LabelFrame(parent, text="Generators", padding="10")
+        run_all_frame.pack(fill="x", pady=(0, 15))
+
+        self.generator_workers_var = tk.StringVar(value=self.config.get("generator_workers", "0"))
+        ttk.Label(run_all_frame, text="Generators Run All runs at once (0 = one per CPU core):").grid(row=0, column=0, sticky="w", pady=2)
+        ttk.Entry(run_all_frame, textvariable=self.generator_workers_var, width=10).grid(row=0, column=1, sticky="w", padx=(10, 0), pady=2)
+
+        self.incremental_var = tk.BooleanVar(value=self.config.is_incremental_enabled())
+        ttk.Checkbutton(
+            run_all_frame,
+            text="Only rewrite pages whose game data changed since the last run",
+            variable=self.incremental_var
+        ).grid(row=1, column=0, columnspan=2, sticky="w", pady=(5, 0))
+
+        # Output log settings
+        log_frame = ttk.LabelFrame(parent, text="Output Log", padding="10")
+        log_frame.pack(fill="x", pady=(0, 15))
+
+        self.log_file_var = tk.BooleanVar(value=self.config.is_log_file_enabled())
+        ttk.Checkbutton(
+            log_frame,
+            text=f"Also write the full log to {LOG_FILE_NAME} in the settings folder",
+            variable=self.log_file_var
+        ).grid(row=0, column=0, sticky="w")
+
+        ttk.Label(
+            log_frame,
+            text=f"The output window keeps only the last {LOG_MAX_LINES:,} lines.",
+            font=("Segoe UI", 8),
+            foreground="gray"
+        ).grid(row=1, column=0, sticky="w", pady=(5, 0))
+
+    def _create_wiki_tab(self, parent):
+        """Create the wiki export settings tab content."""
+        # Packaging settings
+        package_frame = ttk.LabelFrame(parent, text="Packaging", padding="10")
+        package_frame.pack(fill="x", pady=(0, 15))
+
+        max_bytes, max_pages = self.config.get_package_limits()
+        self.package_kb_var = tk.StringVar(value=str(max_bytes // 1024))
+        self.package_pages_var = tk.StringVar(value=str(max_pages))
+
+        ttk.Label(package_frame, text="Max import file size (KB):").grid(row=0, column=0, sticky="w", pady=2)
+        ttk.Entry(package_frame, textvariable=self.package_kb_var, width=10).grid(row=0, column=1, sticky="w", padx=(10, 0), pady=2)
+        ttk.Label(package_frame, text="Max pages per file (0 = no limit):").grid(row=1, column=0, sticky="w", pady=2)
+        ttk.Entry(package_frame, textvariable=self.package_pages_var, width=10).grid(row=1, column=1, sticky="w", padx=(10, 0), pady=2)
+
+        # Compression options
+        self.package_compression_var = tk.StringVar(value=self.config.get_package_compression())
+        ttk.Label(package_frame, text="Compression:").grid(row=2, column=0, sticky="w", pady=2)
+        compression_frame = ttk.Frame(package_frame)
+        compression_frame.grid(row=2, column=1, sticky="w", padx=(10, 0), pady=2)
+        for text, value in [("None (.xml)", "none"), ("gzip (.xml.gz)", "gzip"), ("bzip2 (.xml.bz2)", "bz2")]:
+            ttk.Radiobutton(
+                compression_frame,
+                text=text,
+                variable=self.package_compression_var,
+                value=value
+            ).pack(side="left", padx=(0, 10))
+
+        ttk.Label(
+            package_frame,
+            text="Compressed files are for importDump.php; the size limit applies to the uncompressed XML.",
+            font=("Segoe UI", 8),
+            foreground="gray"
+        ).grid(row=3, column=0, columnspan=2, sticky="w", pady=(10, 0))
+
+        # Structured data export settings
+        data_export_frame = ttk.LabelFrame(parent, text="Data Export", padding="10")
+        data_export_frame.pack(fill="x", pady=(0, 15))
+
+        self.model_export_var = tk.StringVar(value=self.config.get("model_export_format", "none"))
+        ttk.Label(data_export_frame, text="Generator models:").grid(row=0, column=0, sticky="w", pady=2)
+        model_export_options = ttk.Frame(data_export_frame)
+        model_export_options.grid(row=0, column=1, sticky="w", padx=(10, 0), pady=2)
+        for text, value in [("Off", "none"), ("JSONL", "jsonl"), ("SQLite", "sqlite")]:
+            ttk.Radiobutton(
+                model_export_options,
+                text=text,
+                variable=self.model_export_var,
+                value=value
+            ).pack(side="left", padx=(0, 10))
+
+        ttk.Label(
+            data_export_frame,
+            text="Generators also write every entity's data to output\\export\\models.jsonl or models.sqlite.",
+            font=("Segoe UI", 8),
+            foreground="gray"
+        ).grid(row=1, column=0, columnspan=2, sticky="w", pady=(10, 0))
+
+        # Upload settings
+        upload_frame = ttk.LabelFrame(parent, text="Upload", padding="10")
+        upload_frame.pack(fill="x", pady=(0, 15))
+        upload_frame.columnconfigure(1, weight=1)
+
+        self.wiki_api_url_var = tk.StringVar(value=self.config.get("wiki_api_url", ""))
+        self.wiki_username_var = tk.StringVar(value=self.config.get("wiki_username", ""))
+
+        ttk.Label(upload_frame, text="API URL:").grid(row=0, column=0, sticky="w", pady=2)
+        ttk.Entry(upload_frame, textvariable=self.wiki_api_url_var).grid(row=0, column=1, sticky="ew", padx=(10, 0), pady=2)
+        ttk.Label(upload_frame, text="Bot username:").grid(row=1, column=0, sticky="w", pady=2)
+        ttk.Entry(upload_frame, textvariable=self.wiki_username_var, width=30).grid(row=1, column=1, sticky="w", padx=(10, 0), pady=2)
+
+        ttk.Label(
+            upload_frame,
+            text="e.g. https://wiki.example.com/w/api.php with a Special:BotPasswords login.\n"
+                 "The password is asked for on each upload and never saved.",
+            font=("Segoe UI", 8),
+            foreground="gray"
+        ).grid(row=2, column=0, columnspan=2, sticky="w", pady=(10, 0))
+
     def _on_game_type_changed(self):
         """Handle game type selection change."""
         game_type = self.game_type_var.get()
@@ -1072,6 +1135,23 @@ class SetupWizard:
         if not utilities_path:
             errors.append("Utilities directory is required")
 
+        # Validate packaging limits
+        package_kb = self.package_kb_var.get().strip()
+        package_pages = self.package_pages_var.get().strip()
+
+        if not package_kb.isdigit() or int(package_kb) * 1024 < MIN_PACKAGE_MAX_BYTES:
+            errors.append(f"Max import file size must be a whole number of at least {MIN_PACKAGE_MAX_BYTES // 1024} KB")
+
+        if not package_pages.isdigit():
+            errors.append("Max pages per file must be a whole number (0 for no limit)")
+
+        if not self.generator_workers_var.get().strip().isdigit():
+            errors.append("Generators to run at once must be a whole number (0 for one per CPU core)")
+
+        wiki_api_url = self.wiki_api_url_var.get().strip()
+        if wiki_api_url and not wiki_api_url.startswith(("http://", "https://")):
+            errors.append("Wiki API URL must start with http:// or https://")
+
         if errors:
             messagebox.showerror(
                 "Validation Error",
@@ -1106,6 +1186,16 @@ class SetupWizard:
         self.config.set("output_path", self.output_path_var.get().strip())
         self.config.set("utilities_path", self.utilities_path_var.get().strip())
         self.config.set("theme_mode", self.theme_mode_var.get())
+        self.config.set("pipeline_generators", "true" if self.pipeline_var.get() else "false")
+        self.config.set("log_file", "true" if self.log_file_var.get() else "false")
+        self.config.set("generator_workers", int(self.generator_workers_var.get().strip()))
+        self.config.set("incremental_generation", "true" if self.incremental_var.get() else "false")
+        self.config.set("package_max_bytes", int(self.package_kb_var.get().strip()) * 1024)
+        self.config.set("package_max_pages", int(self.package_pages_var.get().strip()))
+        self.config.set("package_compression", self.package_compression_var.get())
+        self.config.set("model_export_format", self.model_export_var.get())
+        self.config.set("wiki_api_url", self.wiki_api_url_var.get().strip())
+        self.config.set("wiki_username", self.wiki_username_var.get().strip())
 
         if self.is_first_run:
             self.config.mark_first_run_complete()
@@ -1161,10 +1251,28 @@ class WikiGeneratorApp:
 
         # Track running processes
         self.running_process = None
+        self.cancel_token = None  # CancellationToken of the running job
+
+        # Log lines queued by log() from any thread, drained by _pump_log_queue
+        self.log_queue = queue.SimpleQueue()
+        self.log_file = None
 
         # Set up the UI
         self.setup_ui()
 
+        self.apply_log_file_setting()
+        self.root.after(LOG_PUMP_INTERVAL_MS, self._pump_log_queue)
+
+    def on_first_paint(self):
+        """Report the startup time, then start the work deferred until the window is shown."""
+        startup_ms = (time.perf_counter() - STARTUP_TIME) * 1000
+        self.log(f"Started in {startup_ms:.0f} ms", "info")
+
+        self.page_ledger.load()
+        self._refresh_search_index()
+        self.output_watcher.start()
+        self.refresh_run_stats()
+
     def _on_close(self):
         """Handle window close - save geometry and exit."""
         # Save window geometry
@@ -1173,6 +1281,15 @@ class WikiGeneratorApp:
         self.config.set("window_x", self.root.winfo_x())
         self.config.set("window_y", self.root.winfo_y())
         self.config.save()
+
+        self.output_watcher.stop()
+
+        # Don't lose checkbox changes still waiting to be saved
+        self.flush_selection_states()
+
+        self._flush_log_queue()
+        if self.log_file is not None:
+            self.log_file.close()
         self.root.destroy()
 
     def setup_ui(self):
@@ -1218,19 +1335,11 @@ class WikiGeneratorApp:
         title_frame = ttk.Frame(header_frame)
         title_frame.grid(row=0, column=0, sticky="w")
 
-        # Load and display application icon
+        # Load and display application icon, scaled to about 64x64
         icons_dir = os.path.join(os.path.dirname(__file__), "icons")
         app_icon_path = os.path.join(icons_dir, "Application Icon.png")
         if os.path.exists(app_icon_path):
-            self.app_icon_image = tk.PhotoImage(file=app_icon_path)
-            # Subsample to get approximately 64x64 (the icon is larger)
-            # PhotoImage subsample reduces by factor, so we check the size
-            width = self.app_icon_image.width()
-            height = self.app_icon_image.height()
-            # Target size is 64 pixels
-            factor = max(1, min(width, height) // 64)
-            if factor > 1:
-                self.app_icon_image = self.app_icon_image.subsample(factor, factor)
+            self.app_icon_image = load_scaled_icon(app_icon_path, 64)
             icon_label = ttk.Label(title_frame, image=self.app_icon_image)
             icon_label.pack(side="left", padx=(0, 10))
 
@@ -1342,17 +1451,22 @@ class WikiGeneratorApp:
             img = tk.PhotoImage(width=size, height=size)
             # Create red X on transparent background
             red = "#cc3333"
-            dark_red = "#991111"
             line_width = 8
-            for i in range(size):
-                for j in range(size):
+            margin = 8
+            # Fill each row's runs of red pixels with one put call per run,
+            # rather than one call per pixel
+            for j in range(margin + 1, size - margin):
+                run_start = None
+                for i in range(margin + 1, size - margin + 1):
                     # Check if pixel is on one of the diagonal lines
                     on_diag1 = abs(i - j) < line_width
                     on_diag2 = abs(i - (size - 1 - j)) < line_width
-                    # Add margin from edges
-                    margin = 8
-                    if (on_diag1 or on_diag2) and margin < i < size - margin and margin < j < size - margin:
-                        img.put(red, (i, j))
+                    if (on_diag1 or on_diag2) and i < size - margin:
+                        if run_start is None:
+                            run_start = i
+                    elif run_start is not None:
+                        img.put(red, to=(run_start, j, i, j + 1))
+                        run_start = None
             self.button_images["Cancel"] = img
             return img
 
@@ -1420,19 +1534,7 @@ class WikiGeneratorApp:
         row += 1
 
         # Define generators with their function names (alphabetical order, Cross-Reference moved out)
-        self.generators = [
-            ("Armor", "armor"),
-            ("Brews", "brews"),
-            ("Constructions", "constructions"),
-            ("Consumables", "consumables"),
-            ("Items", "items"),
-            ("Ores", "ores"),
-            ("Runes", "runes"),
-            ("Storage", "storage"),
-            ("Tools", "tools"),
-            ("Trade Goods", "tradegoods"),
-            ("Weapons", "weapons"),
-        ]
+        self.generators = list(GENERATORS)
 
         # Create generator buttons in a 2-column grid
         self.generator_buttons = {}
@@ -1522,7 +1624,7 @@ class WikiGeneratorApp:
         selection_container = ttk.Frame(parent)
         selection_container.grid(row=1, column=1, sticky="nsew", padx=(0, 10))
         selection_container.columnconfigure(0, weight=1)
-        selection_container.rowconfigure(2, weight=1)  # Row 2 is the scrollable area (was row 3)
+        selection_container.rowconfigure(3, weight=1)  # Row 3 is the scrollable area
 
         # Header frame with title and Package button
         title_frame = ttk.Frame(selection_container)
@@ -1581,9 +1683,22 @@ class WikiGeneratorApp:
         )
         self.package_btn.grid(row=0, column=3, sticky="e", padx=(10, 0))
 
+        # Search box - filters the list to pages whose title or wikitext matches
+        search_frame = ttk.Frame(selection_container)
+        search_frame.grid(row=1, column=0, sticky="ew", pady=(0, 5))
+        search_frame.columnconfigure(1, weight=1)
+
+        ttk.Label(search_frame, text="Search:").grid(row=0, column=0, sticky="w")
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self._apply_selection_search())
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        search_entry.grid(row=0, column=1, sticky="ew", padx=(5, 0))
+        search_entry.bind("<Escape>", lambda e: self.search_var.set(""))
+        self._add_tooltip(search_entry, "Filter by page title or wikitext - Esc to clear")
+
         # Fixed column header row (XCL, ARC, SEL, FILE NAME) - using tk.Label for reliable white text
         header_frame = ttk.Frame(selection_container)
-        header_frame.grid(row=1, column=0, sticky="ew")
+        header_frame.grid(row=2, column=0, sticky="ew")
 
         # Track current sort column and direction
         self.sort_column = "filename"  # Default sort by filename
@@ -1624,7 +1739,7 @@ class WikiGeneratorApp:
 
         # Selection list using Treeview for native styling and scrolling
         list_frame = ttk.Frame(selection_container)
-        list_frame.grid(row=2, column=0, sticky="nsew")
+        list_frame.grid(row=3, column=0, sticky="nsew")
         list_frame.columnconfigure(0, weight=1)
         list_frame.rowconfigure(0, weight=1)
 
@@ -1650,18 +1765,86 @@ class WikiGeneratorApp:
         selection_scroll.grid(row=0, column=1, sticky="ns")
         self.selection_tree.configure(yscrollcommand=selection_scroll.set)
 
+        # Export bar below the list
+        export_frame = ttk.Frame(selection_container)
+        export_frame.grid(row=4, column=0, sticky="ew", pady=(5, 0))
+
+        # Package All button - packages the SEL-checked pages of every category
+        self.package_all_btn = ttk.Button(
+            export_frame,
+            text="Package All",
+            command=self.package_all,
+            width=12
+        )
+        self.package_all_btn.pack(side="left")
+        self._add_tooltip(self.package_all_btn, "Package selected pages from every generator category")
+
+        # Changed-only toggle for delta packaging
+        self.package_changed_only_var = tk.BooleanVar(value=self.config.is_package_changed_only())
+        changed_only_check = ttk.Checkbutton(
+            export_frame,
+            text="Changed only",
+            variable=self.package_changed_only_var,
+            command=self._on_changed_only_toggled
+        )
+        changed_only_check.pack(side="left", padx=(10, 0))
+        self._add_tooltip(changed_only_check, "Only package pages that changed since the last import")
+
+        # Upload button - pushes selected pages straight to the wiki API
+        self.upload_btn = ttk.Button(
+            export_frame,
+            text="Upload",
+            command=self.upload_selected,
+            width=10
+        )
+        self.upload_btn.pack(side="right")
+        self._add_tooltip(self.upload_btn, "Upload selected pages to the wiki through its API")
+
+        # Mark Imported button - records packaged pages in the page ledger
+        self.mark_imported_btn = ttk.Button(
+            export_frame,
+            text="Imported",
+            command=self.mark_package_imported,
+            width=10
+        )
+        self.mark_imported_btn.pack(side="right", padx=(0, 10))
+        self._add_tooltip(self.mark_imported_btn, "Mark the pages of the last package as imported into the wiki")
+
         # Bind selection event
         self.selection_tree.bind("<<TreeviewSelect>>", self._on_tree_select)
         self.selection_tree.bind("<Button-1>", self._on_tree_click)
 
-        # Store checkbox variables and current generator type
-        self.checkbox_vars = {}  # {item_name: {'xcl': BooleanVar, 'arc': BooleanVar, 'sel': BooleanVar}}
+        # Selection list model; checkbox states live in selection_states
         self.current_gen_type = None
         self.selection_items = {}  # Maps display name to file path
+        self.selection_rows = []  # Display names in list order
+        self.selection_filter = None  # Names matching the search box, or None for all
+        self.selection_display_rows = []  # selection_rows passing the filter, as rendered
         self.tree_item_map = {}  # Maps tree item id to display name
+        self.selection_item_ids = {}  # Maps display name to tree item id
+        self._selection_render_id = 0  # Bumped to cancel an in-progress render
 
-        # Load selection states from config
+        # Load selection states from config; changes are saved in the background
         self.selection_states = self.load_selection_states()
+        self._selection_save_id = None
+        self.selection_writer = selection_store.SelectionStateWriter(
+            os.path.join(get_config_dir(), SELECTION_STATES_FILE),
+            APP_VERSION,
+            lambda e: self.log(f"Error saving selection states: {e}", "error")
+        )
+
+        # Ledger of page hashes already imported into the wiki; loaded after first paint
+        self.page_ledger = PageLedger(os.path.join(get_config_dir(), PAGE_LEDGER_FILE))
+
+        # Full-text search index over every category, built in the background after first paint
+        self.search_index = PageSearchIndex()
+
+        # Live index of the generated .wiki files; changes found by its polling
+        # thread are applied to the list as deltas
+        self.output_watcher = OutputWatcher(
+            os.path.join(get_default_output_path(), "wiki"),
+            lambda *change: self.root.after(0, self._on_output_changed, *change)
+        )
 
     def _on_tree_select(self, event):
         """Handle tree selection - show file contents."""
@@ -1689,8 +1872,8 @@ class WikiGeneratorApp:
                 if col_idx in col_map:
                     col_name = col_map[col_idx]
                     # Toggle the checkbox state
-                    current_val = self.checkbox_vars[display_name][col_name].get()
-                    self.checkbox_vars[display_name][col_name].set(not current_val)
+                    state = self._get_item_state(display_name)
+                    state[col_name] = not state[col_name]
 
                     # Update tree display
                     self._update_tree_item(item_id, display_name)
@@ -1698,70 +1881,52 @@ class WikiGeneratorApp:
                     # Save state
                     self.on_checkbox_changed(display_name, col_name)
 
+    def _get_item_state(self, item_name):
+        """Get the mutable checkbox state dict for an item in the current category."""
+        states = self.selection_states.setdefault(self.current_gen_type, {})
+        return states.setdefault(item_name, {'xcl': False, 'arc': False, 'sel': False})
+
+    @staticmethod
+    def _tree_row_values(display_name, state):
+        """Build the Treeview values for one row from its checkbox state."""
+        xcl = "☑" if state.get('xcl', False) else "☐"
+        arc = "☑" if state.get('arc', False) else "☐"
+        sel = "☑" if state.get('sel', False) else "☐"
+        return (xcl, arc, sel, display_name)
+
     def _update_tree_item(self, item_id, display_name):
         """Update the tree item display based on checkbox states."""
-        xcl = "☑" if self.checkbox_vars[display_name]['xcl'].get() else "☐"
-        arc = "☑" if self.checkbox_vars[display_name]['arc'].get() else "☐"
-        sel = "☑" if self.checkbox_vars[display_name]['sel'].get() else "☐"
-        self.selection_tree.item(item_id, values=(xcl, arc, sel, display_name))
+        self.selection_tree.item(item_id, values=self._tree_row_values(display_name, self._get_item_state(display_name)))
 
     def load_selection_states(self):
         """Load selection states from XML config file."""
         states_file = os.path.join(get_config_dir(), SELECTION_STATES_FILE)
-        if os.path.exists(states_file):
-            try:
-                tree = ET.parse(states_file)
-                root = tree.getroot()
-                states = {}
-
-                for gen_elem in root.findall("generator"):
-                    gen_type = gen_elem.get("type")
-                    if gen_type:
-                        states[gen_type] = {}
-                        for item_elem in gen_elem.findall("item"):
-                            item_name = item_elem.get("name")
-                            # Load checkbox states (xcl, arc, sel as booleans)
-                            xcl = item_elem.get("xcl", "0") == "1"
-                            arc = item_elem.get("arc", "0") == "1"
-                            sel = item_elem.get("sel", "0") == "1"
-                            if item_name:
-                                states[gen_type][item_name] = {'xcl': xcl, 'arc': arc, 'sel': sel}
-
-                return states
-            except Exception as e:
-                print(f"Error loading selection states: {e}")
+        try:
+            return selection_store.load_selection_states(states_file)
+        except Exception as e:
+            print(f"Error loading selection states: {e}")
         return {}
 
     def save_selection_states(self):
-        """Save selection states to XML config file."""
-        states_file = os.path.join(get_config_dir(), SELECTION_STATES_FILE)
-        try:
-            root = ET.Element("SelectionStates")
-            root.set("version", APP_VERSION)
-
-            for gen_type, items in self.selection_states.items():
-                gen_elem = ET.SubElement(root, "generator")
-                gen_elem.set("type", gen_type)
-
-                for item_name, state in items.items():
-                    item_elem = ET.SubElement(gen_elem, "item")
-                    item_elem.set("name", item_name)
-                    # Save checkbox states as 0/1
-                    item_elem.set("xcl", "1" if state.get('xcl', False) else "0")
-                    item_elem.set("arc", "1" if state.get('arc', False) else "0")
-                    item_elem.set("sel", "1" if state.get('sel', False) else "0")
-
-            # Pretty print the XML
-            xml_str = minidom.parseString(ET.tostring(root)).toprettyxml(indent="  ")
-            # Remove the XML declaration line that minidom adds
-            lines = xml_str.split('\n')
-            xml_str = '\n'.join(lines[1:])
-
-            with open(states_file, 'w', encoding='utf-8') as f:
-                f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-                f.write(xml_str)
-        except Exception as e:
-            self.log(f"Error saving selection states: {str(e)}", "error")
+        """Schedule a save of the selection states.
+
+        Changes are coalesced for SELECTION_SAVE_DELAY_MS, then a snapshot is
+        written to the XML config file on a background thread.
+        """
+        if self._selection_save_id is None:
+            self._selection_save_id = self.root.after(SELECTION_SAVE_DELAY_MS, self._write_selection_states)
+
+    def _write_selection_states(self):
+        """Hand a snapshot of the selection states to the background writer."""
+        self._selection_save_id = None
+        self.selection_writer.submit(selection_store.snapshot_selection_states(self.selection_states))
+
+    def flush_selection_states(self):
+        """Write any pending selection state changes and wait for the write to finish."""
+        if self._selection_save_id is not None:
+            self.root.after_cancel(self._selection_save_id)
+            self._write_selection_states()
+        self.selection_writer.flush(timeout=10)
 
     def sort_selection(self, column):
         """Sort the selection list by the specified column."""
@@ -1772,41 +1937,186 @@ class WikiGeneratorApp:
             self.sort_column = column
             self.sort_ascending = True
 
-        # Re-populate with the new sort order
+        if not self.current_gen_type:
+            return
+
+        self._sort_selection_rows()
+
+        if len(self.tree_item_map) < len(self.selection_display_rows):
+            # Still rendering - restart the render in the new order
+            self._start_selection_render()
+        else:
+            self._reorder_rendered_rows()
+
+    def _reorder_rendered_rows(self):
+        """Put the rendered Treeview rows in selection_rows order with a single Tcl call."""
+        self.selection_display_rows = self._filtered_selection_rows()
+        self.selection_tree.set_children(
+            "", *(self.selection_item_ids[name] for name in self.selection_display_rows)
+        )
+
+    def _sort_selection_rows(self):
+        """Sort selection_rows by the current sort column and direction."""
+        states = self.selection_states.get(self.current_gen_type, {})
+        if self.sort_column == "filename":
+            key = str.lower
+        else:
+            column = self.sort_column
+            key = lambda name: (0 if states.get(name, {}).get(column, False) else 1, name.lower())
+        self.selection_rows.sort(key=key, reverse=not self.sort_ascending)
+
+    def _filtered_selection_rows(self):
+        """Return selection_rows limited to the names matching the search box."""
+        if self.selection_filter is None:
+            return list(self.selection_rows)
+        return [name for name in self.selection_rows if name in self.selection_filter]
+
+    def _start_selection_render(self):
+        """Clear the Treeview and render the filtered selection_rows incrementally."""
+        self._selection_render_id += 1
+        self.selection_display_rows = self._filtered_selection_rows()
+        children = self.selection_tree.get_children()
+        if children:
+            self.selection_tree.delete(*children)
+        self.tree_item_map.clear()
+        self.selection_item_ids.clear()
+        self._render_selection_rows(self._selection_render_id, 0)
+
+    def _render_selection_rows(self, render_id, start):
+        """Insert the next chunk of rows, then yield to the event loop for the rest."""
+        if render_id != self._selection_render_id:
+            return  # A newer render (category switch or re-sort) replaced this one
+
+        states = self.selection_states.get(self.current_gen_type, {})
+        rows = self.selection_display_rows
+        end = min(start + SELECTION_RENDER_CHUNK, len(rows))
+        for display_name in rows[start:end]:
+            values = self._tree_row_values(display_name, states.get(display_name, {}))
+            item_id = self.selection_tree.insert("", "end", values=values)
+            self.tree_item_map[item_id] = display_name
+            self.selection_item_ids[display_name] = item_id
+
+        if end < len(rows):
+            self.root.after(1, self._render_selection_rows, render_id, end)
+
+    def _on_output_changed(self, category, added, removed, modified):
+        """Apply .wiki files added, removed or modified behind the UI to the open views."""
+        self._refresh_search_index([category])
+
+        if category != self.current_gen_type:
+            return
+
+        # The list may have been rebuilt from the watcher's index since this change was posted
+        added = {name for name in added if name not in self.selection_items}
+        removed = {name for name in removed if name in self.selection_items}
+
+        # Re-show the previewed page if it was regenerated
+        selection = self.selection_tree.selection()
+        shown = self.tree_item_map.get(selection[0]) if selection else None
+        if shown in modified:
+            self.load_file_contents(self.selection_items[shown])
+
+        # Whether every filtered row is already in the Treeview
+        rendered = len(self.tree_item_map) >= len(self.selection_display_rows)
+
+        if removed:
+            for name in removed:
+                self.selection_items.pop(name, None)
+                item_id = self.selection_item_ids.pop(name, None)
+                if item_id is not None:
+                    del self.tree_item_map[item_id]
+                    self.selection_tree.delete(item_id)
+            self.selection_rows = [name for name in self.selection_rows if name not in removed]
+            self.selection_display_rows = [name for name in self.selection_display_rows if name not in removed]
+
+        if added:
+            states = self.selection_states.setdefault(category, {})
+            folder = self.output_watcher.folder(category)
+            new_items_count = 0
+            for name in added:
+                self.selection_items[name] = os.path.join(folder, f"{name}.wiki")
+                if name not in states:
+                    states[name] = {'xcl': False, 'arc': False, 'sel': False}
+                    new_items_count += 1
+            self.selection_rows.extend(added)
+            self._sort_selection_rows()
+            if new_items_count > 0:
+                self.save_selection_states()
+
+        if not rendered:
+            # The pending chunks index the old row list; render the new one from the start
+            if added or removed:
+                self._start_selection_render()
+            return
+
+        if added:
+            # Insert the new rows that pass the search filter, then put them in place
+            for name in added:
+                if self.selection_filter is None or name in self.selection_filter:
+                    item_id = self.selection_tree.insert("", "end", values=self._tree_row_values(name, states[name]))
+                    self.tree_item_map[item_id] = name
+                    self.selection_item_ids[name] = item_id
+            self._reorder_rendered_rows()
+
+    def _refresh_search_index(self, categories=None):
+        """Update the search index in the background for the given categories (default all)."""
+        def worker():
+            wiki_root = os.path.join(get_default_output_path(), "wiki")
+            names = categories
+            if names is None:
+                if not os.path.isdir(wiki_root):
+                    return
+                names = [entry.name for entry in os.scandir(wiki_root) if entry.is_dir()]
+            for category in names:
+                try:
+                    changes = self.search_index.refresh_category(category, os.path.join(wiki_root, category))
+                except OSError as e:
+                    self.log(f"Error indexing {category} for search: {e}", "error")
+                    continue
+                if changes:
+                    self.root.after(0, self._on_search_index_updated, category)
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+
+    def _on_search_index_updated(self, category):
+        """Re-run the current search once the category's index has caught up."""
+        if category == self.current_gen_type and self.search_var.get().strip():
+            self._apply_selection_search()
+
+    def _apply_selection_search(self):
+        """Filter the selection list to pages matching the search box."""
+        query = self.search_var.get().strip()
+        if query and self.current_gen_type:
+            self.selection_filter = self.search_index.search(query, self.current_gen_type)
+        else:
+            self.selection_filter = None
         if self.current_gen_type:
-            self.populate_selection_tree(self.current_gen_type)
+            self._start_selection_render()
 
     def toggle_all_column(self, column):
-        """Toggle all checkboxes in a column (XCL, ARC, or SEL)."""
-        if not self.checkbox_vars:
+        """Toggle all checkboxes in a column (XCL, ARC, or SEL).
+
+        While the list is filtered by a search, only the matching rows are toggled.
+        """
+        rows = self.selection_display_rows
+        if not rows:
             return
 
         # Count how many are currently checked
-        checked_count = sum(1 for vars in self.checkbox_vars.values() if vars[column].get())
-        total_count = len(self.checkbox_vars)
+        checked_count = sum(1 for item_name in rows if self._get_item_state(item_name)[column])
+        total_count = len(rows)
 
         # If more than half are checked, turn all off; otherwise turn all on
         new_state = checked_count < (total_count / 2)
 
-        # Update all checkboxes in this column
-        for item_name, vars in self.checkbox_vars.items():
-            vars[column].set(new_state)
-            # Update the treeview display
-            for item_id in self.selection_tree.get_children():
-                if self.selection_tree.item(item_id, "values")[3] == item_name:
-                    values = list(self.selection_tree.item(item_id, "values"))
-                    col_index = {"xcl": 0, "arc": 1, "sel": 2}[column]
-                    values[col_index] = "☑" if new_state else "☐"
-                    self.selection_tree.item(item_id, values=values)
-                    break
-
-            # Update selection states
-            if self.current_gen_type:
-                if self.current_gen_type not in self.selection_states:
-                    self.selection_states[self.current_gen_type] = {}
-                if item_name not in self.selection_states[self.current_gen_type]:
-                    self.selection_states[self.current_gen_type][item_name] = {'xcl': False, 'arc': False, 'sel': False}
-                self.selection_states[self.current_gen_type][item_name][column] = new_state
+        # Update every row's state in one pass; rows still waiting to be
+        # rendered have no item id yet and pick up the new state when inserted
+        for item_name in rows:
+            self._get_item_state(item_name)[column] = new_state
+            item_id = self.selection_item_ids.get(item_name)
+            if item_id is not None:
+                self._update_tree_item(item_id, item_name)
 
         # Save changes
         self.save_selection_states()
@@ -1816,129 +2126,308 @@ class WikiGeneratorApp:
         self.log(f"Toggled all {column.upper()} checkboxes to {state_text}", "info")
 
     def on_checkbox_changed(self, item_name, checkbox_type):
-        """Handle checkbox state change and save to config."""
+        """Handle checkbox state change and save to config.
+
+        The state itself is already updated in selection_states by the caller.
+        """
         if self.current_gen_type:
-            if self.current_gen_type not in self.selection_states:
-                self.selection_states[self.current_gen_type] = {}
-            if item_name not in self.selection_states[self.current_gen_type]:
-                self.selection_states[self.current_gen_type][item_name] = {'xcl': False, 'arc': False, 'sel': False}
-            # Update the specific checkbox state
-            self.selection_states[self.current_gen_type][item_name][checkbox_type] = self.checkbox_vars[item_name][checkbox_type].get()
             self.save_selection_states()
 
     def package_selected(self):
-        """Package selected items into MediaWiki XML import files."""
-        # Get items with SEL checkbox checked
-        selected_items = [name for name, vars in self.checkbox_vars.items() if vars['sel'].get()]
+        """Package the current category's selected items into MediaWiki XML import files.
 
-        if not selected_items:
-            self.log("No items selected for packaging (SEL column)", "warning")
+        Pages are packaged if SEL is checked and neither XCL nor ARC is. The
+        job runs on a worker thread from a snapshot of selection_states.
+        """
+        if not self.current_gen_type:
+            self.log("No generator category loaded for packaging", "warning")
             return
 
-        self.log(f"Packaging {len(selected_items)} selected items...", "info")
-
-        # Get user's Downloads directory
-        downloads_dir = os.path.join(os.path.expanduser("~"), "Downloads")
-        wiki_import_dir = os.path.join(downloads_dir, "wiki import")
-
-        # Create output directory if it doesn't exist
-        os.makedirs(wiki_import_dir, exist_ok=True)
-
-        # Load all pages
-        pages = []
-        for item_name in sorted(selected_items):
-            if item_name in self.selection_items:
-                file_path = self.selection_items[item_name]
-                if os.path.exists(file_path):
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        pages.append((item_name, content))
-                    except Exception as e:
-                        self.log(f"Error reading {item_name}: {e}", "error")
-
-        if not pages:
-            self.log("No valid wiki files found for selected items", "error")
+        gen_type = self.current_gen_type
+        states = {name: dict(state) for name, state in self.selection_states.get(gen_type, {}).items()}
+        selected_count = sum(1 for state in states.values() if wiki_packager.is_packageable(state))
+
+        if not selected_count:
+            self.log("No items selected for packaging (SEL column, excluding XCL and ARC)", "warning")
             return
 
-        # Split into batches of 50 or less
-        MAX_PAGES_PER_FILE = 50
-        num_batches = (len(pages) + MAX_PAGES_PER_FILE - 1) // MAX_PAGES_PER_FILE
+        self.log(f"Packaging {selected_count} selected items...", "info")
 
-        # Generate a prefix based on the current generator type
-        gen_prefix = self.current_gen_type if self.current_gen_type else "wiki"
+        self.set_running_state(True)
+        self.status_var.set("Packaging...")
 
-        for batch_num in range(num_batches):
-            start_idx = batch_num * MAX_PAGES_PER_FILE
-            end_idx = min(start_idx + MAX_PAGES_PER_FILE, len(pages))
-            batch_pages = pages[start_idx:end_idx]
+        thread = threading.Thread(
+            target=self._package_selected,
+            args=(gen_type, states, self.package_changed_only_var.get()),
+            daemon=True
+        )
+        thread.start()
 
-            # Create output filename
-            output_file = os.path.join(wiki_import_dir, f'{gen_prefix}_import_{batch_num + 1:02d}.xml')
+    def _package_selected(self, gen_type, states, changed_only):
+        """Read and package one category's pages, reporting progress to the UI."""
+        try:
+            wiki_dir = os.path.join(get_default_output_path(), "wiki", gen_type)
+            wiki_import_dir = get_wiki_import_dir()
+            os.makedirs(wiki_import_dir, exist_ok=True)
 
-            try:
-                self._create_mediawiki_import(batch_pages, output_file)
-                self.log(f"Created {os.path.basename(output_file)} with {len(batch_pages)} pages", "info")
-            except Exception as e:
-                self.log(f"Error creating import file: {e}", "error")
+            page_files = wiki_packager.collect_selected_pages(wiki_dir, states)
+            if not page_files:
+                self.log("No valid wiki files found for selected items", "error")
+                return
 
-        self.log(f"Packaging complete! Created {num_batches} file(s) in: {wiki_import_dir}", "success")
+            max_bytes, max_pages = self.config.get_package_limits()
+            last_progress_post = 0.0
 
-    def _create_mediawiki_import(self, pages, output_file):
-        """Create a MediaWiki XML import file with the given pages."""
-        # Create root mediawiki element
-        mediawiki = ET.Element('mediawiki')
-        mediawiki.set('xmlns', 'http://www.mediawiki.org/xml/export-0.11/')
-        mediawiki.set('xmlns:xsi', 'http://www.w3.org/2001/XMLSchema-instance')
-        mediawiki.set('xsi:schemaLocation', 'http://www.mediawiki.org/xml/export-0.11/ http://www.mediawiki.org/xml/export-0.11.xsd')
-        mediawiki.set('version', '0.11')
-        mediawiki.set('xml:lang', 'en')
+            def log_callback(message):
+                self.log(message)
+
+            def progress_callback(pages_done, total_pages):
+                nonlocal last_progress_post
+                now = time.perf_counter()
+                if now - last_progress_post >= PROGRESS_UPDATE_INTERVAL or pages_done == total_pages:
+                    last_progress_post = now
+                    self.root.after(0, self.show_progress,
+                                    f"Packaging {pages_done}/{total_pages} pages...", pages_done, total_pages)
+
+            self.page_ledger.begin_package()
+            result = wiki_packager.package_pages(
+                page_files, wiki_import_dir, gen_type, max_bytes, max_pages,
+                self.page_ledger, changed_only, log_callback, self.config.get_package_compression(),
+                progress_callback=progress_callback, cancel_token=self.cancel_token
+            )
+
+            for file_info in result["files"]:
+                self.log(f"Created {file_info['file']} with {file_info['pages']} pages "
+                         f"({file_info['stored_bytes'] // 1024} KB)", "info")
+
+            if changed_only:
+                self.log(f"Skipped {result['skipped']} unchanged pages", "info")
 
-        # Add siteinfo
-        siteinfo = ET.SubElement(mediawiki, 'siteinfo')
-        sitename = ET.SubElement(siteinfo, 'sitename')
-        sitename.text = 'Wiki'
+            if result["cancelled"]:
+                self.log(f"Packaging cancelled after {result['pages']} pages", "warning")
+                return
+
+            if not result["files"]:
+                self.log("No changed pages to package", "warning")
+                return
 
-        # Add each page
-        for page_title, page_content in pages:
-            page = ET.SubElement(mediawiki, 'page')
+            self.log(f"Packaging complete! Created {len(result['files'])} file(s) in: {wiki_import_dir}", "success")
+            self.log("Click Imported once the files are loaded into the wiki", "info")
 
-            title = ET.SubElement(page, 'title')
-            title.text = page_title
+        except Exception as e:
+            self.log(f"Error creating import file: {e}", "error")
 
-            ns = ET.SubElement(page, 'ns')
-            ns.text = '0'
+        finally:
+            self.root.after(0, self._save_page_ledger)
+            self.root.after(0, self.set_running_state, False)
+            self.root.after(0, lambda: self.status_var.set("Ready"))
 
-            revision = ET.SubElement(page, 'revision')
+    def package_all(self):
+        """Package the SEL-checked pages of every generator category in one pass."""
+        # Snapshot the selections on the Tk thread; the worker only reads the copy
+        gen_types = [gen_type for _, gen_type in self.generators] + ["crossreference"]
+        selections = {
+            gen_type: {name: dict(state) for name, state in self.selection_states.get(gen_type, {}).items()}
+            for gen_type in gen_types
+        }
+        selected_count = sum(
+            1 for states in selections.values() for state in states.values() if wiki_packager.is_packageable(state)
+        )
+        if not selected_count:
+            self.log("No items selected for packaging in any category (SEL column, excluding XCL and ARC)", "warning")
+            return
 
-            timestamp = ET.SubElement(revision, 'timestamp')
-            timestamp.text = '2024-01-01T00:00:00Z'
+        self.log("\n" + "="*60, "info")
+        self.log(f"Packaging {selected_count} selected items across all categories...", "info")
+        self.log("="*60, "info")
 
-            contributor = ET.SubElement(revision, 'contributor')
-            username = ET.SubElement(contributor, 'username')
-            username.text = 'WikiBot'
+        self.set_running_state(True)
+        self.status_var.set("Packaging all categories...")
 
-            comment = ET.SubElement(revision, 'comment')
-            comment.text = 'Automated import'
+        thread = threading.Thread(
+            target=self._package_all,
+            args=(selections, self.package_changed_only_var.get()),
+            daemon=True
+        )
+        thread.start()
 
-            model = ET.SubElement(revision, 'model')
-            model.text = 'wikitext'
+    def _package_all(self, selections, changed_only):
+        """Package every category on a worker pool and write a summary."""
+        try:
+            wiki_base = os.path.join(get_default_output_path(), "wiki")
+            wiki_import_dir = get_wiki_import_dir()
+            max_bytes, max_pages = self.config.get_package_limits()
 
-            format_elem = ET.SubElement(revision, 'format')
-            format_elem.text = 'text/x-wiki'
+            categories = []
+            for gen_type, states in selections.items():
+                page_files = wiki_packager.collect_selected_pages(os.path.join(wiki_base, gen_type), states)
+                if page_files:
+                    categories.append((gen_type, page_files))
 
-            text = ET.SubElement(revision, 'text')
-            text.set('xml:space', 'preserve')
-            text.set('bytes', str(len(page_content.encode('utf-8'))))
-            text.text = page_content
+            def log_callback(message):
+                self.log(message)
 
-        # Write to file with pretty formatting
-        rough_string = ET.tostring(mediawiki, encoding='unicode')
-        reparsed = minidom.parseString(rough_string)
-        xml_str = reparsed.toprettyxml(indent="  ")
+            self.page_ledger.begin_package()
+            results = wiki_packager.package_categories(
+                categories, wiki_import_dir, max_bytes, max_pages,
+                self.page_ledger, changed_only, log_callback=log_callback,
+                compression=self.config.get_package_compression(), cancel_token=self.cancel_token
+            )
+            summary_path = wiki_packager.write_summary(results, wiki_import_dir)
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(xml_str)
+            for result in results:
+                if "error" in result:
+                    self.log(f"{result['category']}: failed - {result['error']}", "error")
+                    continue
+                self.log(
+                    f"{result['category']}: {result['pages']} pages in {len(result['files'])} file(s)"
+                    + (f", {result['skipped']} unchanged skipped" if changed_only else ""),
+                    "info"
+                )
+
+            total_files = sum(len(result["files"]) for result in results)
+            total_pages = sum(result["pages"] for result in results)
+            self.log(f"\n{'='*60}", "info")
+            if self.cancel_token.cancelled:
+                self.log(f"Packaging cancelled after {total_pages} pages in {total_files} file(s)", "warning")
+            else:
+                self.log(
+                    f"Packaging complete! {total_pages} pages in {total_files} file(s) in: {wiki_import_dir}",
+                    "success"
+                )
+            self.log(f"Summary written to {os.path.basename(summary_path)}", "info")
+
+        except Exception as e:
+            self.log(f"Error packaging categories: {str(e)}", "error")
+
+        finally:
+            self.root.after(0, self._save_page_ledger)
+            self.root.after(0, self.set_running_state, False)
+            self.root.after(0, lambda: self.status_var.set("Ready"))
+
+    def _on_changed_only_toggled(self):
+        """Persist the changed-only packaging mode."""
+        self.config.set("package_changed_only", "true" if self.package_changed_only_var.get() else "false")
+        self.config.save()
+
+    def _save_page_ledger(self):
+        """Save the page ledger, logging any error."""
+        try:
+            self.page_ledger.save()
+        except OSError as e:
+            self.log(f"Error saving page ledger: {e}", "error")
+
+    def mark_package_imported(self):
+        """Record the last package's pages as imported so unchanged pages are skipped next time."""
+        pending_count = len(self.page_ledger.pending)
+        if not pending_count:
+            self.log("No packaged pages are waiting to be marked as imported", "warning")
+            return
+
+        if not messagebox.askyesno(
+            "Mark Imported",
+            f"Record the {pending_count} pages of the last package as imported into the wiki?\n\n"
+            "Only do this after the import files have been loaded successfully.",
+            parent=self.root
+        ):
+            return
+
+        count = self.page_ledger.mark_imported()
+        self._save_page_ledger()
+        self.log(f"Marked {count} pages as imported", "success")
+
+    def upload_selected(self):
+        """Upload the selected items straight to the wiki through the MediaWiki API."""
+        api_url = self.config.get("wiki_api_url", "")
+        username = self.config.get("wiki_username", "")
+        if not api_url or not username:
+            self.log("Set the wiki API URL and bot username in Settings > Wiki before uploading", "warning")
+            return
+
+        states = self.selection_states.get(self.current_gen_type, {})
+        page_files = [
+            (name, self.selection_items[name])
+            for name in sorted(self.selection_items)
+            if wiki_packager.is_packageable(states.get(name, {}))
+        ]
+        if not page_files:
+            self.log("No items selected for upload (SEL column, excluding XCL and ARC)", "warning")
+            return
+
+        password = simpledialog.askstring(
+            "Wiki Login", f"Bot password for {username}:", show="*", parent=self.root
+        )
+        if not password:
+            return
+
+        self.log("\n" + "="*60, "info")
+        self.log(f"Uploading {len(page_files)} pages to {api_url}...", "info")
+        self.log("="*60, "info")
+
+        self.set_running_state(True)
+        self.status_var.set("Uploading to wiki...")
+
+        thread = threading.Thread(
+            target=self._upload_selected,
+            args=(api_url, username, password, page_files),
+            daemon=True
+        )
+        thread.start()
+
+    def _upload_selected(self, api_url, username, password, page_files):
+        """Log in and upload pages, recording each synced page in the page ledger."""
+        import mediawiki_upload
+
+        client = mediawiki_upload.MediaWikiClient(api_url)
+        try:
+            client.login(username, password)
+            self.log(f"Logged in as {username}", "info")
+
+            progress = mediawiki_upload.UploadProgress(
+                os.path.join(get_config_dir(), UPLOAD_PROGRESS_FILE), api_url
+            )
+            progress.load()
+
+            def log_callback(message):
+                self.log(message)
+
+            def on_read_error(title, error):
+                log_callback(f"Error reading {title}: {error}")
+
+            def progress_callback(pages_done):
+                self.root.after(0, lambda: self.status_var.set(
+                    f"Uploading to wiki... {pages_done}/{len(page_files)}"))
+
+            pages = mediawiki_export.read_page_files(page_files, on_read_error)
+            results = mediawiki_upload.upload_pages(
+                client, pages, progress,
+                log_callback=log_callback,
+                progress_callback=progress_callback,
+                synced_callback=self.page_ledger.record_imported,
+                cancel_token=self.cancel_token
+            )
+
+            self.log(f"\n{'='*60}", "info")
+            self.log(
+                f"Upload {'cancelled' if results['cancelled'] else 'complete'}: "
+                f"{results['uploaded']} uploaded, {results['unchanged']} already up to date, "
+                f"{results['resumed']} done in an earlier run, {len(results['failed'])} failed",
+                "success" if not results['failed'] and not results['cancelled'] else "warning"
+            )
+            if not results['failed'] and not results['cancelled']:
+                # Nothing left to resume; the next upload checks every page against the wiki
+                progress.clear()
+
+        except mediawiki_upload.MediaWikiAPIError as e:
+            self.log(f"Upload failed: {e}", "error")
+        except Exception as e:
+            self.log(f"Error uploading to wiki: {str(e)}", "error")
+
+        finally:
+            client.close()
+            self.root.after(0, self._save_page_ledger)
+            self.root.after(0, self.set_running_state, False)
+            self.root.after(0, lambda: self.status_var.set("Ready"))
 
     def create_contents_pane(self, parent):
         """Create the right Contents pane with Copy button using native styling."""
@@ -1995,10 +2484,17 @@ class WikiGeneratorApp:
         contents_scroll.grid(row=0, column=1, sticky="ns")
         self.contents_text.configure(yscrollcommand=contents_scroll.set)
 
+        # Recently viewed pages; cache misses and prefetches are read in the background
+        self.preview_cache = PreviewCache()
+        self.preview_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="preview")
+        self._preview_id = 0  # Bumped on every selection to drop stale loads
+        self._preview_content = None  # Full text of the displayed page
+
     def copy_contents(self):
         """Copy contents pane text to clipboard."""
         try:
-            content = self.contents_text.get(1.0, tk.END).strip()
+            # Use the full page text; a large page may still be filling the widget
+            content = (self._preview_content or self.contents_text.get(1.0, tk.END)).strip()
             if content:
                 self.root.clipboard_clear()
                 self.root.clipboard_append(content)
@@ -2012,31 +2508,88 @@ class WikiGeneratorApp:
         """Handle click on an item in the selection list."""
         if item_name in self.selection_items:
             self.load_file_contents(self.selection_items[item_name])
+            item_id = self.selection_item_ids.get(item_name)
+            if item_id is not None:
+                self._prefetch_neighbours(item_id)
 
     def load_file_contents(self, file_path):
-        """Load and display the contents of a file."""
+        """Load and display the contents of a file.
+
+        Cached pages are shown immediately; others are read on a background
+        thread and shown when ready, unless another page was selected meanwhile.
+        """
+        self._preview_id += 1
+        preview_id = self._preview_id
+
+        content = self.preview_cache.get(file_path)
+        if content is not None:
+            self._show_preview(preview_id, content)
+            return
+
+        def worker():
+            try:
+                content = self.preview_cache.load(file_path)
+            except FileNotFoundError:
+                return
+            except Exception as e:
+                content = f"Error loading file: {str(e)}"
+            self.root.after(0, self._show_preview, preview_id, content)
+
+        self.preview_executor.submit(worker)
+
+    def _show_preview(self, preview_id, content):
+        """Replace the Contents pane text, inserting large pages in chunks."""
+        if preview_id != self._preview_id:
+            return  # A newer selection replaced this one
+
+        self._preview_content = content
+        self.contents_text.configure(state="normal")
+        self.contents_text.delete(1.0, tk.END)
+        self.contents_text.insert(tk.END, content[:PREVIEW_CHUNK_CHARS])
+        self.contents_text.configure(state="disabled")
+
+        if len(content) > PREVIEW_CHUNK_CHARS:
+            self.root.after(1, self._insert_preview_chunk, preview_id, content, PREVIEW_CHUNK_CHARS)
+
+    def _insert_preview_chunk(self, preview_id, content, start):
+        """Append the next chunk of a large page, then yield to the event loop."""
+        if preview_id != self._preview_id:
+            return
+
+        end = start + PREVIEW_CHUNK_CHARS
+        self.contents_text.configure(state="normal")
+        self.contents_text.insert(tk.END, content[start:end])
+        self.contents_text.configure(state="disabled")
+
+        if end < len(content):
+            self.root.after(1, self._insert_preview_chunk, preview_id, content, end)
+
+    def _prefetch_neighbours(self, item_id):
+        """Read the pages in the rows around item_id into the preview cache."""
+        before = after = item_id
+        for _ in range(PREVIEW_PREFETCH_ROWS):
+            after = self.selection_tree.next(after) if after else ""
+            before = self.selection_tree.prev(before) if before else ""
+            for neighbour in (after, before):
+                name = self.tree_item_map.get(neighbour)
+                if name in self.selection_items:
+                    self.preview_executor.submit(self._prefetch_preview, self.selection_items[name])
+
+    def _prefetch_preview(self, file_path):
+        """Load one page into the preview cache, ignoring unreadable files."""
         try:
-            if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                self.contents_text.configure(state="normal")
-                self.contents_text.delete(1.0, tk.END)
-                self.contents_text.insert(tk.END, content)
-                self.contents_text.configure(state="disabled")
-        except Exception as e:
-            self.contents_text.configure(state="normal")
-            self.contents_text.delete(1.0, tk.END)
-            self.contents_text.insert(tk.END, f"Error loading file: {str(e)}")
-            self.contents_text.configure(state="disabled")
+            self.preview_cache.load(file_path)
+        except (OSError, UnicodeDecodeError):
+            pass
 
     def populate_selection_tree(self, gen_type):
-        """Populate the selection Treeview with checkboxes for generated wiki files."""
-        # Clear existing items
-        for item in self.selection_tree.get_children():
-            self.selection_tree.delete(item)
-        self.checkbox_vars.clear()
+        """Populate the selection Treeview with checkboxes for generated wiki files.
+
+        Rows are backed by plain Python state (selection_rows and selection_states)
+        and inserted in chunks, so large categories do not stall the UI.
+        """
         self.selection_items.clear()
-        self.tree_item_map.clear()
+        self.selection_rows = []
         self.current_gen_type = gen_type
 
         # Map generator types to display names
@@ -2076,82 +2629,48 @@ class WikiGeneratorApp:
         }
 
         if gen_type in output_dirs:
-            # Wiki files are in %APPDATA%\MoriaWikiGenerator\output\wiki\<gen_type>
-            output_path = os.path.join(get_default_output_path(), "wiki", output_dirs[gen_type])
-            if os.path.exists(output_path):
-                # Get saved states for this generator
-                saved_states = self.selection_states.get(gen_type, {})
-
-                # Get all wiki files
-                files = [f for f in os.listdir(output_path) if f.endswith('.wiki')]
-
-                # Build list of (filename, display_name, state_dict) for sorting
-                file_data = []
-                for filename in files:
-                    display_name = filename[:-5]  # Remove .wiki extension
-                    state = saved_states.get(display_name, {'xcl': False, 'arc': False, 'sel': False})
-                    file_data.append((filename, display_name, state))
-
-                # Apply sorting based on sort_column
-                if self.sort_column == "filename":
-                    file_data.sort(key=lambda x: x[1].lower(), reverse=not self.sort_ascending)
-                elif self.sort_column == "xcl":
-                    file_data.sort(key=lambda x: (0 if x[2].get('xcl', False) else 1, x[1].lower()), reverse=not self.sort_ascending)
-                elif self.sort_column == "arc":
-                    file_data.sort(key=lambda x: (0 if x[2].get('arc', False) else 1, x[1].lower()), reverse=not self.sort_ascending)
-                elif self.sort_column == "sel":
-                    file_data.sort(key=lambda x: (0 if x[2].get('sel', False) else 1, x[1].lower()), reverse=not self.sort_ascending)
-
+            # Wiki files are in %APPDATA%\MoriaWikiGenerator\output\wiki\<gen_type>,
+            # listed from the output watcher's index rather than rescanned
+            self.selection_items.update(self.output_watcher.files(output_dirs[gen_type]))
+            if self.selection_items:
                 # Ensure we have a dict for this generator type in selection_states
-                if gen_type not in self.selection_states:
-                    self.selection_states[gen_type] = {}
+                states = self.selection_states.setdefault(gen_type, {})
 
                 # Track new items added
                 new_items_count = 0
 
-                # Add items to treeview
-                for filename, display_name, state in file_data:
-                    file_path = os.path.join(output_path, filename)
-                    self.selection_items[display_name] = file_path
-
-                    # Create checkbox variables for each column
-                    xcl_var = tk.BooleanVar(value=state.get('xcl', False))
-                    arc_var = tk.BooleanVar(value=state.get('arc', False))
-                    sel_var = tk.BooleanVar(value=state.get('sel', False))
-                    self.checkbox_vars[display_name] = {'xcl': xcl_var, 'arc': arc_var, 'sel': sel_var}
-
-                    # Update selection_states: preserve existing, add new items with defaults
-                    if display_name not in self.selection_states[gen_type]:
-                        # New item - add with default unchecked states
-                        self.selection_states[gen_type][display_name] = {
-                            'xcl': False, 'arc': False, 'sel': False
-                        }
+                for display_name in self.selection_items:
+                    # New item - add with default unchecked states; existing items are kept
+                    if display_name not in states:
+                        states[display_name] = {'xcl': False, 'arc': False, 'sel': False}
                         new_items_count += 1
-                    # Existing items are already in selection_states, don't overwrite
-
-                    # Create checkbox display characters
-                    xcl = "☑" if xcl_var.get() else "☐"
-                    arc = "☑" if arc_var.get() else "☐"
-                    sel = "☑" if sel_var.get() else "☐"
 
-                    # Insert into treeview
-                    item_id = self.selection_tree.insert("", "end", values=(xcl, arc, sel, display_name))
-                    self.tree_item_map[item_id] = display_name
+                self.selection_rows = list(self.selection_items)
+                self._sort_selection_rows()
 
                 # Save selection states to persist new items
                 if new_items_count > 0:
                     self.save_selection_states()
 
+                # Pick up new or regenerated pages in the search index
+                self._refresh_search_index([gen_type])
+
+        self._apply_selection_search()
+
     def create_output_section(self, parent):
         """Create the output/log section spanning all columns at bottom using native styling."""
         output_frame = ttk.LabelFrame(parent, text="Output", padding="5")
         output_frame.grid(row=2, column=0, columnspan=3, sticky="ew", pady=(10, 0))
         output_frame.columnconfigure(0, weight=1)
 
+        # Log and Run Stats tabs
+        output_notebook = ttk.Notebook(output_frame)
+        output_notebook.grid(row=0, column=0, sticky="ew")
+
         # Text widget with scrollbar for output - use stored system colors
-        text_frame = ttk.Frame(output_frame)
-        text_frame.grid(row=0, column=0, sticky="ew")
+        text_frame = ttk.Frame(output_notebook)
         text_frame.columnconfigure(0, weight=1)
+        output_notebook.add(text_frame, text="Log")
 
         # Get colors from root (set by apply_theme)
         bg_color = getattr(self.root, 'tk_bg', 'SystemWindow')
@@ -2178,6 +2697,91 @@ class WikiGeneratorApp:
         self.output_text.tag_configure("error", foreground="#cc0000")
         self.output_text.tag_configure("warning", foreground="#cc6600")
 
+        stats_frame = ttk.Frame(output_notebook)
+        stats_frame.columnconfigure(0, weight=1)
+        output_notebook.add(stats_frame, text="Run Stats")
+        self.create_run_stats_table(stats_frame)
+
+    def create_run_stats_table(self, parent):
+        """Create the table of generator run timings.
+
+        Each generator's latest run is a top-level row; its earlier runs are
+        listed underneath when the row is expanded.
+        """
+        phase_columns = list(generator_metrics.PHASES)
+        columns = ["total"] + phase_columns + ["entities", "files", "unchanged", "rate", "change"]
+        self.run_stats_tree = ttk.Treeview(parent, columns=columns, show="tree headings", height=8)
+
+        self.run_stats_tree.heading("#0", text="Generator / Run")
+        self.run_stats_tree.column("#0", width=170, minwidth=120, stretch=True, anchor="w")
+        headings = {
+            "total": "Total", "entities": "Entities", "files": "Files", "unchanged": "Unchanged",
+            "rate": "Files/s", "change": "vs Median",
+        }
+        for column in columns:
+            self.run_stats_tree.heading(column, text=headings.get(column, column.capitalize()))
+            self.run_stats_tree.column(column, width=62, minwidth=50, stretch=False, anchor="e")
+        self.run_stats_tree.tag_configure("slower", foreground="#cc6600")
+        self.run_stats_tree.grid(row=0, column=0, sticky="ew")
+
+        stats_scroll = ttk.Scrollbar(parent, orient="vertical", command=self.run_stats_tree.yview)
+        stats_scroll.grid(row=0, column=1, sticky="ns")
+        self.run_stats_tree.configure(yscrollcommand=stats_scroll.set)
+
+    def refresh_run_stats(self):
+        """Reload the Run Stats table from the run history file."""
+        runs = generator_metrics.load_history(os.path.join(get_config_dir(), GENERATOR_HISTORY_FILE))
+        runs_by_generator = {}
+        for run in runs:
+            runs_by_generator.setdefault(run.get("generator", "?"), []).append(run)
+
+        # Keep expanded generators expanded across refreshes
+        expanded = {item for item in self.run_stats_tree.get_children() if self.run_stats_tree.item(item, "open")}
+        self.run_stats_tree.delete(*self.run_stats_tree.get_children())
+
+        names = {gen_type: name for name, gen_type in self.generators}
+        names["crossreference"] = "Cross-Reference"
+        for gen_type in sorted(runs_by_generator, key=lambda g: names.get(g, g)):
+            history = runs_by_generator[gen_type][-(RUN_STATS_HISTORY_ROWS + 1):]
+            latest = history[-1]
+            values, tags = self._run_stats_values(latest, history[:-1])
+            self.run_stats_tree.insert(
+                "", "end", iid=gen_type, text=f"{names.get(gen_type, gen_type)}  {self._run_time_text(latest)}",
+                values=values, tags=tags, open=gen_type in expanded
+            )
+            # Earlier runs, newest first, each compared with the runs before it
+            for index in range(len(history) - 2, -1, -1):
+                run = history[index]
+                values, tags = self._run_stats_values(run, history[:index])
+                self.run_stats_tree.insert(gen_type, "end", text=self._run_time_text(run), values=values, tags=tags)
+
+    def _run_time_text(self, run):
+        """Format a run's start time as e.g. '10-19 07:05'."""
+        return run.get("started_at", "")[5:16].replace("T", " ")
+
+    def _run_stats_values(self, run, earlier_runs):
+        """Return the table values and tags for a run, compared with earlier runs."""
+        phases = run.get("phases", {})
+        counts = run.get("counts", {})
+        total = run.get("total_seconds", 0)
+        values = [f"{total:.2f}"]
+        values += [f"{phases[name]:.2f}" if name in phases else "" for name in generator_metrics.PHASES]
+        values += [counts.get("entities", ""), counts.get("files", ""), counts.get("unchanged", ""),
+                   run.get("files_per_second", "")]
+
+        change = ""
+        tags = ()
+        earlier_totals = sorted(r.get("total_seconds", 0) for r in earlier_runs[-RUN_STATS_BASELINE_RUNS:])
+        if earlier_totals:
+            median = earlier_totals[len(earlier_totals) // 2]
+            if median > 0:
+                percent = (total - median) / median * 100
+                change = f"{percent:+.0f}%"
+                if percent >= RUN_STATS_SLOWER_PERCENT:
+                    tags = ("slower",)
+        values.append(change)
+        return values, tags
+
     def create_status_bar(self, parent):
         """Create the status bar at the bottom."""
         status_frame = ttk.Frame(parent)
@@ -2216,6 +2820,9 @@ class WikiGeneratorApp:
         """Show the settings dialog."""
         wizard = SetupWizard(self.root, self.config, is_first_run=False)
         if wizard.show():
+            apply_model_export_setting(self.config)
+            apply_incremental_setting(self.config)
+            self.apply_log_file_setting()
             self.log("Configuration updated successfully", "success")
             messagebox.showinfo(
                 "Settings Saved",
@@ -2224,17 +2831,77 @@ class WikiGeneratorApp:
             )
 
     def log(self, message, tag=None):
-        """Add a message to the output log."""
+        """Add a message to the output log. Safe to call from any thread.
+
+        Messages are queued and inserted in batches by _pump_log_queue.
+        """
+        self.log_queue.put((time.time(), message, tag))
+
+    def _pump_log_queue(self):
+        """Insert queued log lines on a fixed tick."""
+        self._flush_log_queue(LOG_PUMP_BATCH_LINES)
+        self.root.after(LOG_PUMP_INTERVAL_MS, self._pump_log_queue)
+
+    def _flush_log_queue(self, max_lines=None):
+        """Insert up to max_lines queued log lines with a single Text insert."""
+        lines = []
+        while max_lines is None or len(lines) < max_lines:
+            try:
+                lines.append(self.log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if not lines:
+            return
+
+        if self.log_file is not None:
+            try:
+                for timestamp, message, _ in lines:
+                    self.log_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))} {message}\n")
+                self.log_file.flush()
+            except OSError:
+                pass
+
+        # Merge consecutive lines with the same tag into one (text, tags) run
+        runs = []
+        for _, message, tag in lines:
+            tags = tag or ()
+            if runs and runs[-1][1] == tags:
+                runs[-1][0].append(message)
+            else:
+                runs.append(([message], tags))
+        insert_args = []
+        for messages, tags in runs:
+            insert_args.extend(("\n".join(messages) + "\n", tags))
+
         self.output_text.configure(state="normal")
-        if tag:
-            self.output_text.insert(tk.END, message + "\n", tag)
-        else:
-            self.output_text.insert(tk.END, message + "\n")
+        self.output_text.insert(tk.END, *insert_args)
+
+        # Drop the oldest lines beyond the scrollback cap
+        line_count = int(self.output_text.index("end-1c").split(".")[0])
+        if line_count > LOG_MAX_LINES:
+            self.output_text.delete("1.0", f"{line_count - LOG_MAX_LINES}.0")
+
         self.output_text.see(tk.END)
         self.output_text.configure(state="disabled")
 
+    def apply_log_file_setting(self):
+        """Open or close the full log file to match the settings."""
+        if self.config.is_log_file_enabled():
+            if self.log_file is None:
+                log_path = os.path.join(get_config_dir(), LOG_FILE_NAME)
+                try:
+                    self.log_file = open(log_path, 'a', encoding='utf-8')
+                except OSError as e:
+                    self.log(f"Could not open log file {log_path}: {e}", "warning")
+        elif self.log_file is not None:
+            self._flush_log_queue()
+            self.log_file.close()
+            self.log_file = None
+
     def clear_output(self):
         """Clear the output log."""
+        # Lines queued before the clear are written out (and to the log file) first
+        self._flush_log_queue()
         self.output_text.configure(state="normal")
         self.output_text.delete(1.0, tk.END)
         self.output_text.configure(state="disabled")
@@ -2243,6 +2910,17 @@ class WikiGeneratorApp:
         """Update UI state based on whether a process is running."""
         state = "disabled" if running else "normal"
 
+        # Each job gets a fresh token; generators and child processes check the active one
+        if running:
+            self.cancel_token = cancellation.CancellationToken()
+            cancellation.set_active_token(self.cancel_token)
+        elif self.cancel_token is not None:
+            cancellation.set_active_token(None)
+            self.cancel_token.close()
+            self.cancel_token = None
+            # Show the timings of the runs that just finished
+            self.refresh_run_stats()
+
         # Disable/enable generator buttons
         for widget in self.root.winfo_children():
             self._set_button_states(widget, state)
@@ -2256,6 +2934,7 @@ class WikiGeneratorApp:
             self.progress.start(10)
         else:
             self.progress.stop()
+            self.progress.configure(mode="indeterminate", value=0)
             self.progress.grid_remove()
 
     def _set_button_states(self, widget, state):
@@ -2353,17 +3032,15 @@ class WikiGeneratorApp:
         # Check if output directory has existing files
         if gen_type in output_dirs:
             # Wiki files are in %APPDATA%\MoriaWikiGenerator\output\wiki\<gen_type>
-            output_path = os.path.join(get_default_output_path(), "wiki", output_dirs[gen_type])
-            if os.path.exists(output_path):
-                wiki_files = [f for f in os.listdir(output_path) if f.endswith('.wiki')]
-                if wiki_files:
-                    # Prompt user whether to re-run or view existing
-                    result = self.show_generator_prompt(name, len(wiki_files))
-                    if not result:
-                        # User chose Files - show existing files in Selection pane
-                        self.populate_selection_tree(gen_type)
-                        self.log(f"Loaded {len(wiki_files)} existing {name} files", "info")
-                        return
+            wiki_files = self.output_watcher.files(output_dirs[gen_type])
+            if wiki_files:
+                # Prompt user whether to re-run or view existing
+                result = self.show_generator_prompt(name, len(wiki_files))
+                if not result:
+                    # User chose Files - show existing files in Selection pane
+                    self.populate_selection_tree(gen_type)
+                    self.log(f"Loaded {len(wiki_files)} existing {name} files", "info")
+                    return
 
         # User chose Yes or no existing files - run the generator
         self.log(f"\n{'='*60}", "info")
@@ -2393,28 +3070,27 @@ class WikiGeneratorApp:
             # Get the generator function
             generator_func = get_generator_function(gen_type)
             if generator_func is None:
-                self.root.after(0, self.log,
-                               f"Generator '{gen_type}' not yet implemented", "warning")
+                self.log(f"Generator '{gen_type}' not yet implemented", "warning")
                 return
 
             # Create a log callback that posts to the UI thread
             def log_callback(message):
-                self.root.after(0, self.log, message)
+                self.log(message)
 
             # Run the generator
             success = generator_func(source_path, output_path, log_callback)
 
             if success:
-                self.root.after(0, self.log,
-                               f"\n{name} completed successfully!", "success")
+                self.log(f"\n{name} completed successfully!", "success")
                 # Populate selection tree with generated files
                 self.root.after(0, self.populate_selection_tree, gen_type)
+            elif self.cancel_token.cancelled:
+                self.log(f"\n{name} cancelled", "warning")
             else:
-                self.root.after(0, self.log,
-                               f"\n{name} finished with errors", "error")
+                self.log(f"\n{name} finished with errors", "error")
 
         except Exception as e:
-            self.root.after(0, self.log, f"Error running {name}: {str(e)}", "error")
+            self.log(f"Error running {name}: {str(e)}", "error")
 
         finally:
             self.running_process = None
@@ -2422,7 +3098,7 @@ class WikiGeneratorApp:
             self.root.after(0, lambda: self.status_var.set("Ready"))
 
     def run_all_generators(self):
-        """Run all generators in sequence."""
+        """Run all generators, independent ones in parallel, then cross-reference."""
         self.log("\n" + "="*60, "info")
         self.log("Running ALL Generators...", "info")
         self.log("="*60, "info")
@@ -2437,50 +3113,18 @@ class WikiGeneratorApp:
         thread.start()
 
     def _run_all_generators(self):
-        """Execute all generators in sequence."""
-        success_count = 0
-        error_count = 0
-
-        source_path = self.config.get_source_path()
-        output_path = self.config.get_output_path()
-
-        for name, gen_type in self.generators:
-            self.root.after(0, lambda n=name: self.status_var.set(f"Running {n}..."))
-            self.root.after(0, self.log, f"\n--- {name} ---", "info")
-
-            try:
-                generator_func = get_generator_function(gen_type)
-                if generator_func is None:
-                    self.root.after(0, self.log,
-                                   f"Skipping {name}: not yet implemented", "warning")
-                    continue
-
-                def log_callback(message):
-                    self.root.after(0, self.log, message)
-
-                success = generator_func(source_path, output_path, log_callback)
-
-                if success:
-                    success_count += 1
-                else:
-                    error_count += 1
-                    self.root.after(0, self.log, f"{name} finished with errors", "error")
-
-            except Exception as e:
-                error_count += 1
-                self.root.after(0, self.log, f"Error running {name}: {str(e)}", "error")
-
-        # Summary
-        self.root.after(0, self.log, f"\n{'='*60}", "info")
-        self.root.after(
-            0, self.log,
-            f"Completed: {success_count} successful, {error_count} errors",
-            "success" if error_count == 0 else "warning"
-        )
-
-        self.running_process = None
-        self.root.after(0, self.set_running_state, False)
-        self.root.after(0, lambda: self.status_var.set("Ready"))
+        """Execute all generators through the dependency scheduler."""
+        try:
+            gen_types = [gen_type for _, gen_type in self.generators] + ["crossreference"]
+            run_generator_batch(
+                gen_types, self.config.get_source_path(), self.config.get_output_path(), self.log,
+                self.config.get_generator_workers(), cancel_token=self.cancel_token,
+                status_callback=lambda text: self.root.after(0, self.status_var.set, text)
+            )
+        finally:
+            self.running_process = None
+            self.root.after(0, self.set_running_state, False)
+            self.root.after(0, lambda: self.status_var.set("Ready"))
 
     def run_verification(self):
         """Run the trader unlock verification."""
@@ -2503,31 +3147,42 @@ class WikiGeneratorApp:
             output_path = self.config.get_output_path()
 
             def log_callback(message):
-                self.root.after(0, self.log, message)
+                self.log(message)
 
             success = verify_trader_unlocks(output_path, log_callback)
 
             if success:
-                self.root.after(0, self.log,
-                               "\nVerification completed successfully!", "success")
+                self.log("\nVerification completed successfully!", "success")
             else:
-                self.root.after(0, self.log,
-                               "\nVerification found issues", "warning")
+                self.log("\nVerification found issues", "warning")
 
         except Exception as e:
-            self.root.after(0, self.log, f"Error during verification: {str(e)}", "error")
+            self.log(f"Error during verification: {str(e)}", "error")
 
         finally:
             self.root.after(0, self.set_running_state, False)
             self.root.after(0, lambda: self.status_var.set("Ready"))
 
     def cancel_process(self):
-        """Cancel the currently running process."""
-        # Note: Thread-based execution cannot be easily cancelled
-        # This is kept for UI consistency
-        self.log("\nCancellation requested (processing will complete current item)", "warning")
+        """Cancel the currently running process.
+
+        Generators stop at the next entity, the import at the next file,
+        packaging at the next page, uploads after the edits in flight and
+        verification at the next folder; child processes that do not exit in
+        time are terminated.
+        """
+        if self.cancel_token is None or self.cancel_token.cancelled:
+            return
+        self.cancel_token.cancel()
+        self.log("\nCancellation requested (stopping after the current item)", "warning")
         self.status_var.set("Cancelling...")
 
+    def show_progress(self, text, done, total):
+        """Show determinate progress in the status bar."""
+        self.progress.stop()
+        self.progress.configure(mode="determinate", maximum=max(total, 1), value=done)
+        self.status_var.set(text)
+
     def run_import_game_files(self):
         """Run the game file import process (retoc + UAssetGUI)."""
         self.log("\n" + "="*60, "info")
@@ -2546,151 +3201,17 @@ class WikiGeneratorApp:
     def _run_import_game_files(self):
         """Execute the game file import process."""
         try:
-            # Get paths from config
-            game_path = self.config.get("game_install_path", "")
-            output_path = self.config.get_output_path()
-            utilities_path = self.config.get_utilities_path()
-
-            # Validate game path
-            if not game_path:
-                self.root.after(0, self.log, "Error: Game installation path not configured", "error")
-                return
-
-            # Build paths
-            paks_path = os.path.join(game_path, "Moria", "Content", "Paks")
-            retoc_output = os.path.join(output_path, "retoc")
-            datajson_output = os.path.join(output_path, "datajson")
-            retoc_exe = os.path.join(utilities_path, "retoc.exe")
-            uassetgui_exe = os.path.join(utilities_path, "UAssetGUI.exe")
-
-            # Validate paths
-            if not os.path.exists(paks_path):
-                self.root.after(0, self.log, f"Error: Game Paks folder not found: {paks_path}", "error")
-                return
-
-            if not os.path.exists(retoc_exe):
-                self.root.after(0, self.log, f"Error: retoc.exe not found: {retoc_exe}", "error")
-                return
-
-            if not os.path.exists(uassetgui_exe):
-                self.root.after(0, self.log, f"Error: UAssetGUI.exe not found: {uassetgui_exe}", "error")
-                return
-
-            # Create output directories
-            # Note: retoc needs to create its output directory itself, so remove if exists
-            if os.path.exists(retoc_output):
-                self.root.after(0, self.log, f"  Removing existing retoc output: {retoc_output}", "info")
-                shutil.rmtree(retoc_output)
-            os.makedirs(datajson_output, exist_ok=True)
-
-            # Step 1: Run retoc.exe
-            self.root.after(0, self.log, "\nStep 1: Extracting game files with retoc...", "info")
-            self.root.after(0, self.log, f"  Input: {paks_path}", "info")
-            self.root.after(0, self.log, f"  Output: {retoc_output}", "info")
-            self.root.after(0, lambda: self.status_var.set("Running retoc.exe..."))
-
-            # Ensure retoc output directory exists
-            os.makedirs(retoc_output, exist_ok=True)
-
-            # Build command as list (subprocess handles quoting automatically)
-            retoc_cmd = [retoc_exe, "to-legacy", "--version", "UE4_27", paks_path, retoc_output]
-
-            # Display command with quotes for clarity
-            display_cmd = f'"{retoc_exe}" to-legacy --version UE4_27 "{paks_path}" "{retoc_output}"'
-            self.root.after(0, self.log, f"  Command: {display_cmd}", "info")
-
-            try:
-                process = subprocess.Popen(
-                    retoc_cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
-                )
-
-                # Stream output
-                for line in process.stdout:
-                    line = line.rstrip()
-                    if line:
-                        self.root.after(0, self.log, f"  {line}")
-
-                process.wait()
-
-                if process.returncode != 0:
-                    self.root.after(0, self.log, f"Error: retoc.exe exited with code {process.returncode}", "error")
-                    return
-
-                self.root.after(0, self.log, "  retoc.exe completed successfully", "success")
-
-            except Exception as e:
-                self.root.after(0, self.log, f"Error running retoc.exe: {str(e)}", "error")
-                return
-
-            # Step 2: Run UAssetGUI to convert each .uasset file to JSON
-            # UAssetGUI syntax: UAssetGUI tojson <source> <destination> <engine version>
-            self.root.after(0, self.log, "\nStep 2: Converting to JSON with UAssetGUI...", "info")
-            self.root.after(0, self.log, f"  Input: {retoc_output}", "info")
-            self.root.after(0, self.log, f"  Output: {datajson_output}", "info")
-            self.root.after(0, lambda: self.status_var.set("Running UAssetGUI..."))
-
-            # Find all .uasset files in retoc output
-            uasset_files = []
-            for root_dir, dirs, files in os.walk(retoc_output):
-                for file in files:
-                    if file.endswith(".uasset"):
-                        uasset_files.append(os.path.join(root_dir, file))
-
-            self.root.after(0, self.log, f"  Found {len(uasset_files)} .uasset files to convert", "info")
-
-            converted_count = 0
-            error_count = 0
-
-            for uasset_file in uasset_files:
-                # Calculate relative path to preserve directory structure
-                rel_path = os.path.relpath(uasset_file, retoc_output)
-                json_file = os.path.join(datajson_output, rel_path.replace(".uasset", ".json"))
-
-                # Create output directory if needed
-                json_dir = os.path.dirname(json_file)
-                os.makedirs(json_dir, exist_ok=True)
-
-                # UAssetGUI command: tojson <source> <destination> <engine version>
-                uassetgui_cmd = [uassetgui_exe, "tojson", uasset_file, json_file, "VER_UE4_27"]
-
-                try:
-                    process = subprocess.Popen(
-                        uassetgui_cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,
-                        text=True,
-                        creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
-                    )
-                    process.wait()
-
-                    if process.returncode == 0:
-                        converted_count += 1
-                    else:
-                        error_count += 1
-
-                except Exception as e:
-                    error_count += 1
-
-                # Update progress periodically
-                if (converted_count + error_count) % 100 == 0:
-                    self.root.after(0, self.log,
-                        f"  Progress: {converted_count + error_count}/{len(uasset_files)} files processed")
-
-            self.root.after(0, self.log,
-                f"  Converted {converted_count} files, {error_count} errors", "success" if error_count == 0 else "warning")
-
-            # Success
-            self.root.after(0, self.log, "\n" + "="*60, "info")
-            self.root.after(0, self.log, "Game file import completed successfully!", "success")
-            self.root.after(0, self.log, f"JSON data available at: {datajson_output}", "success")
-
-        except Exception as e:
-            self.root.after(0, self.log, f"Error during import: {str(e)}", "error")
-
+            import_game_files(
+                self.config.get("game_install_path", ""),
+                self.config.get_source_path(),
+                self.config.get_output_path(),
+                self.config.get_utilities_path(),
+                self.log,
+                self.cancel_token,
+                pipeline_generators=self.config.is_pipeline_enabled(),
+                status_callback=lambda text: self.root.after(0, self.status_var.set, text),
+                progress_callback=lambda text, done, total: self.root.after(0, self.show_progress, text, done, total),
+            )
         finally:
             self.root.after(0, self.set_running_state, False)
             self.root.after(0, lambda: self.status_var.set("Ready"))
@@ -2834,9 +3355,16 @@ def main():
             root.destroy()
             return
 
+    # Let generators find the model export file, if enabled, and whether to rebuild every page
+    apply_model_export_setting(config)
+    apply_incremental_setting(config)
+
     # Show main application
     root.deiconify()
     app = WikiGeneratorApp(root, config)
+
+    # Idle callbacks run after Tk has drawn the window
+    root.after_idle(app.on_first_paint)
     root.mainloop()
 
 
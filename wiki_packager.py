@@ -0,0 +1,198 @@
+"""Packaging of generated wiki pages into MediaWiki XML import files.
+
+package_pages() streams one category's pages into size-limited import files.
+package_categories() packages several categories at once on a thread pool, so
+reading and escaping the pages of one category overlaps with writing another.
+Neither touches Tk; callers pass a log_callback that is safe to call from a
+worker thread.
+"""
+
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import mediawiki_export
+
+
+# Number of categories packaged at the same time by package_categories()
+DEFAULT_PACKAGE_WORKERS = 4
+
+# Threads reading page files ahead of the writer within one category
+DEFAULT_READ_WORKERS = 4
+
+SUMMARY_FILE_NAME = "package_summary.json"
+
+
+def import_file_path(output_dir, prefix, batch_num, compression="none"):
+    """Return the path of a numbered import file, e.g. items_import_01.xml.gz."""
+    extension = mediawiki_export.COMPRESSION_EXTENSIONS[compression]
+    return os.path.join(output_dir, f'{prefix}_import_{batch_num:02d}{extension}')
+
+
+def remove_import_files(output_dir, prefix):
+    """Delete a category's import files from an earlier run, in any compression.
+
+    Returns:
+        list: Names of the files removed
+    """
+    extensions = "|".join(re.escape(extension) for extension in mediawiki_export.COMPRESSION_EXTENSIONS.values())
+    pattern = re.compile(rf'{re.escape(prefix)}_import_\d+(?:{extensions})')
+    try:
+        names = sorted(name for name in os.listdir(output_dir) if pattern.fullmatch(name))
+    except OSError:
+        return []
+    for name in names:
+        os.remove(os.path.join(output_dir, name))
+    return names
+
+
+def is_packageable(state):
+    """Check if a page's selection state puts it in the package.
+
+    A page must be SEL-checked and neither excluded (XCL) nor archived (ARC).
+    """
+    return state.get('sel', False) and not state.get('xcl', False) and not state.get('arc', False)
+
+
+def collect_selected_pages(wiki_dir, states):
+    """Return sorted (title, file_path) pairs for packageable pages found in wiki_dir.
+
+    Args:
+        wiki_dir: Directory holding the category's .wiki files
+        states: {title: {'xcl': bool, 'arc': bool, 'sel': bool}}
+    """
+    page_files = []
+    for title in sorted(states):
+        if not is_packageable(states[title]):
+            continue
+        file_path = os.path.join(wiki_dir, f"{title}.wiki")
+        if os.path.exists(file_path):
+            page_files.append((title, file_path))
+    return page_files
+
+
+def package_pages(page_files, output_dir, prefix, max_bytes, max_pages=0,
+                  ledger=None, changed_only=False, log_callback=None, compression="none",
+                  progress_callback=None, read_workers=DEFAULT_READ_WORKERS, cancel_token=None):
+    """Stream (title, file_path) pairs into import files named <prefix>_import_NN.xml.
+
+    With compression set to "gzip" or "bz2" the files are compressed as they are
+    written and named .xml.gz or .xml.bz2. The category's import files from an
+    earlier run are deleted first, so the folder holds only this package.
+
+    Every packaged page is staged in the ledger, if one is given; with
+    changed_only, pages matching their last imported version are skipped.
+
+    Files are read read_workers at a time ahead of the writer, and
+    progress_callback, if given, is called with (pages_done, total_pages); a
+    page that could not be read counts as done. Once cancel_token is cancelled
+    no further pages are packaged; the import files already started are closed
+    so they stay valid.
+
+    Returns:
+        dict: category, page and skip counts, the files written and timing
+    """
+    def log(message):
+        if log_callback:
+            log_callback(message)
+
+    pages_done = 0
+
+    def count_page():
+        nonlocal pages_done
+        pages_done += 1
+        if progress_callback:
+            progress_callback(pages_done, len(page_files))
+
+    def on_read_error(title, error):
+        log(f"Error reading {title}: {error}")
+        count_page()  # A page that failed to read still counts towards the total
+
+    def on_oversize(title, page_bytes):
+        log(f"{title} is {page_bytes // 1024} KB, over the {max_bytes // 1024} KB "
+            "import file limit; it was packaged on its own")
+
+    skipped = []
+    start_time = time.perf_counter()
+    remove_import_files(output_dir, prefix)
+
+    def counted(pages):
+        for page in pages:
+            if cancel_token is not None and cancel_token.cancelled:
+                return
+            yield page
+            count_page()
+
+    pages = counted(mediawiki_export.read_page_files_concurrently(page_files, read_workers, on_read_error))
+    if ledger is not None:
+        pages = ledger.track(pages, changed_only, skipped.append)
+    batches = mediawiki_export.write_batched_imports(
+        pages,
+        lambda batch_num: import_file_path(output_dir, prefix, batch_num, compression),
+        max_bytes,
+        max_pages,
+        on_oversize
+    )
+
+    return {
+        "category": prefix,
+        "pages": sum(page_count for _, page_count, _ in batches),
+        "skipped": len(skipped),
+        "files": [
+            {
+                "file": os.path.basename(output_file),
+                "pages": page_count,
+                "bytes": file_bytes,
+                "stored_bytes": os.path.getsize(output_file),
+            }
+            for output_file, page_count, file_bytes in batches
+        ],
+        "seconds": round(time.perf_counter() - start_time, 3),
+        "cancelled": cancel_token is not None and cancel_token.cancelled,
+    }
+
+
+def package_categories(categories, output_dir, max_bytes, max_pages=0, ledger=None,
+                       changed_only=False, max_workers=DEFAULT_PACKAGE_WORKERS, log_callback=None,
+                       compression="none", cancel_token=None):
+    """Package several categories concurrently.
+
+    Args:
+        categories: List of (prefix, page_files) tuples
+        output_dir: Directory the import files are written to
+
+    Returns:
+        list: One package_pages() result per category, in the order given. A
+        category that failed has an "error" entry instead of files.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    def package_one(prefix, page_files):
+        try:
+            return package_pages(page_files, output_dir, prefix, max_bytes, max_pages,
+                                 ledger, changed_only, log_callback, compression, cancel_token=cancel_token)
+        except Exception as e:
+            if log_callback:
+                log_callback(f"Error packaging {prefix}: {e}")
+            return {"category": prefix, "pages": 0, "skipped": 0, "files": [], "error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [executor.submit(package_one, prefix, page_files) for prefix, page_files in categories]
+        return [future.result() for future in futures]
+
+
+def write_summary(results, output_dir):
+    """Write a JSON summary of a packaging run to output_dir and return its path."""
+    summary = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "total_pages": sum(result["pages"] for result in results),
+        "total_files": sum(len(result["files"]) for result in results),
+        "categories": results,
+    }
+    summary_path = os.path.join(output_dir, SUMMARY_FILE_NAME)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    return summary_path
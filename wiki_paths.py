@@ -0,0 +1,42 @@
+"""Folders the generators read their data from and write their pages to.
+
+By default everything lives in %APPDATA%\\MoriaWikiGenerator (the home folder
+on systems without APPDATA). Two environment variables, inherited by generator
+child processes, point the generators elsewhere; the moria-wiki command-line
+driver sets them from --output and --source:
+
+    MORIA_OUTPUT_DIR    output folder holding wiki\\, export\\ and datajson\\
+    MORIA_DATAJSON_DIR  UAssetGUI JSON export to read instead of <output>\\datajson
+"""
+
+import os
+
+
+CONFIG_DIR_NAME = "MoriaWikiGenerator"
+
+OUTPUT_DIR_ENV = "MORIA_OUTPUT_DIR"
+DATAJSON_DIR_ENV = "MORIA_DATAJSON_DIR"
+
+
+def get_config_dir():
+    """Get the configuration directory path in %APPDATA%."""
+    appdata = os.environ.get("APPDATA")
+    if not appdata:
+        # Fallback for non-Windows systems
+        appdata = os.path.expanduser("~")
+    return os.path.join(appdata, CONFIG_DIR_NAME)
+
+
+def get_output_dir():
+    """Get the output folder the generators write wiki pages under."""
+    return os.environ.get(OUTPUT_DIR_ENV) or os.path.join(get_config_dir(), "output")
+
+
+def get_datajson_dir():
+    """Get the folder holding the UAssetGUI JSON export of the game files."""
+    return os.environ.get(DATAJSON_DIR_ENV) or os.path.join(get_output_dir(), "datajson")
+
+
+def get_data_dir():
+    """Get the game data table folder inside the JSON export."""
+    return os.path.join(get_datajson_dir(), "Moria", "Content", "Tech", "Data")